@@ -15,6 +15,9 @@
 -----------
 1. וודאו ש-Polars מותקן: pip install polars
 2. הריצו את הסקריפט: python polars_guide.py
+   (עם --lazy: הנתונים נסרקים כ-LazyFrame ומחושבים ב-streaming)
+   (עם --shared: השאילתות של החלקים מורצות בביצוע משותף אחד עם collect_all,
+    במקום אחת-אחת)
 3. או ייבאו פונקציות ספציפיות למחברת שלכם
 
 דרישות:
@@ -26,8 +29,53 @@
 """
 
 import polars as pl
-from typing import Optional
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+import io
+import json
+import operator
 import sys
+import time
+import weakref
+
+# מטמון Parquet משותף לכל הפרקים (Polars/csv_cache.py)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from csv_cache import cached_read_csv, cached_scan_csv  # noqa: E402
+from streaming_stats import fused_stats  # noqa: E402
+
+
+# מסגרת נתונים שהפונקציות בקובץ מקבלות: DataFrame רגיל או LazyFrame (למשל מ-scan_csv)
+Frame = Union[pl.DataFrame, pl.LazyFrame]
+
+
+def _collect(frame: Frame) -> pl.DataFrame:
+    """
+    הפיכת Frame ל-DataFrame - LazyFrame מחושב במנוע ה-streaming
+    
+    Args:
+        frame: DataFrame או LazyFrame
+    
+    Returns:
+        pl.DataFrame: התוצאה המחושבת
+    """
+    if isinstance(frame, pl.LazyFrame):
+        return frame.collect(engine='streaming')
+    return frame
+
+
+def _count_rows(frame: Frame) -> int:
+    """
+    ספירת שורות בלי לטעון את כל הנתונים לזיכרון
+    
+    Args:
+        frame: DataFrame או LazyFrame
+    
+    Returns:
+        int: מספר השורות
+    """
+    if isinstance(frame, pl.LazyFrame):
+        return _collect(frame.select(pl.len())).item()
+    return frame.height
 
 
 # =============================================================================
@@ -74,15 +122,24 @@ def create_simple_dataframe():
     return df
 
 
-def load_titanic_data(filepath: str = '../data/titanic_dataset.csv'):
+def load_titanic_data(filepath: str = '../data/titanic_dataset.csv',
+                      lazy: bool = False,
+                      use_cache: bool = True,
+                      shrink: bool = False):
     """
     טעינת מערך נתוני Titanic מקובץ CSV
     
     Args:
         filepath: נתיב לקובץ CSV (ברירת מחדל: ../data/titanic_dataset.csv)
+        lazy: אם True - מחזיר LazyFrame (scan_csv) במקום לקרוא את כל הקובץ.
+              כל פונקציות הדוגמה בקובץ מקבלות גם LazyFrame ומחשבות אותו
+              במנוע ה-streaming, כך שקבצים גדולים מהזיכרון נתמכים
+        use_cache: קריאה דרך מטמון ה-Parquet (csv_cache) במקום פענוח ה-CSV מחדש
+        shrink: המרת העמודות לטיפוסים הצרים ביותר שמחזיקים את הנתונים
+                (ראו shrink_dtypes)
     
     Returns:
-        pl.DataFrame: מערך נתוני Titanic
+        pl.DataFrame | pl.LazyFrame: מערך נתוני Titanic
     
     Raises:
         FileNotFoundError: אם הקובץ לא נמצא
@@ -92,7 +149,19 @@ def load_titanic_data(filepath: str = '../data/titanic_dataset.csv'):
     print("="*70)
     
     try:
-        df = pl.read_csv(filepath)
+        if lazy:
+            lf = cached_scan_csv(filepath) if use_cache else pl.scan_csv(filepath)
+            if shrink:
+                lf = shrink_dtypes(lf)
+            schema = lf.collect_schema()
+            print(f"\n✓ נסרק בהצלחה (lazy)! ({len(schema)} עמודות, הנתונים לא נטענו)")
+            print("\n📊 5 שורות ראשונות:")
+            print(_collect(lf.head()))
+            return lf
+        
+        df = cached_read_csv(filepath) if use_cache else pl.read_csv(filepath)
+        if shrink:
+            df = shrink_dtypes(df)
         print(f"\n✓ נטען בהצלחה! ({df.height} שורות, {df.width} עמודות)")
         print("\n📊 5 שורות ראשונות:")
         print(df.head())
@@ -103,111 +172,642 @@ def load_titanic_data(filepath: str = '../data/titanic_dataset.csv'):
         return None
 
 
-def show_dataframe_properties(df: pl.DataFrame):
+def iter_titanic_batches(filepath: str = '../data/titanic_dataset.csv',
+                         rows_per_batch: Optional[int] = 50_000,
+                         bytes_per_batch: Optional[int] = None) -> Iterator[pl.DataFrame]:
     """
-    הצגת מאפייני DataFrame חשובים
+    קריאת קובץ CSV במנות (batches) בגודל חסום
+    
+    הקובץ נסרק ב-streaming ורק מנה אחת נמצאת בזיכרון בכל רגע.
+    אם ניתן bytes_per_batch, מספר השורות במנה מחושב לפי גודל שורה
+    ממוצע שנמדד על דגימה מתחילת הקובץ.
+    
+    Args:
+        filepath: נתיב לקובץ CSV
+        rows_per_batch: מספר שורות מקסימלי בכל מנה
+        bytes_per_batch: גודל מקסימלי (בבתים) של כל מנה - גובר על rows_per_batch
+    
+    Yields:
+        pl.DataFrame: מנה של שורות מהקובץ
+    """
+    lf = pl.scan_csv(filepath)
+    
+    if bytes_per_batch is not None:
+        sample = lf.head(1_000).collect()
+        row_size = max(1, sample.estimated_size() // max(1, sample.height))
+        rows_per_batch = max(1, bytes_per_batch // row_size)
+    
+    yield from lf.collect_batches(chunk_size=rows_per_batch)
+
+
+# טיפוסים שלמים מהצר לרחב, עם מספר הביטים של כל אחד
+_INT_BITS = {pl.Int8: 8, pl.Int16: 16, pl.Int32: 32, pl.Int64: 64}
+
+
+def recommend_dtypes(df: Frame, max_categories: int = 256,
+                     max_unique_ratio: float = 0.5) -> Dict[str, pl.DataType]:
+    """
+    המלצה על הטיפוס הצר ביותר שמחזיק בבטחה כל עמודה
+    
+    - מספרים שלמים: Int8/Int16/Int32 לפי הטווח בפועל (min/max)
+    - מחרוזות עם מעט ערכים שונים: Enum עם הערכים הקיימים
+    
+    כל הסטטיסטיקות מחושבות ב-select אחד, כך שגם LazyFrame נסרק פעם אחת
+    (ב-LazyFrame מספר הערכים השונים נספר בקירוב, בזיכרון קבוע).
+    נבדק גם שההמרה באמת חוסכת זיכרון (למשל עמודה שרובה null יכולה לתפוס
+    יותר מקום כ-Enum): ב-DataFrame לפי הגודל בפועל, וב-LazyFrame לפי
+    אומדן מאותן סטטיסטיקות (ראו _enum_size).
+    
+    Args:
+        df: DataFrame או LazyFrame
+        max_categories: מספר ערכים שונים מקסימלי להמרה ל-Enum
+        max_unique_ratio: יחס מקסימלי בין ערכים שונים למספר השורות
+    
+    Returns:
+        Dict[str, pl.DataType]: עמודה -> טיפוס מומלץ (רק עמודות שכדאי להמיר)
+    """
+    schema = df.collect_schema()
+    int_cols = [c for c, t in schema.items() if t in _INT_BITS]
+    str_cols = [c for c, t in schema.items() if t == pl.String]
+    
+    is_lazy = isinstance(df, pl.LazyFrame)
+    
+    def n_unique(c: str) -> pl.Expr:
+        values = pl.col(c).drop_nulls()
+        return (values.approx_n_unique() if is_lazy else values.n_unique()).alias(f'{c}__n_unique')
+    
+    stats = _collect(df.lazy().select(
+        pl.len().alias('__len'),
+        *[pl.col(c).min().alias(f'{c}__min') for c in int_cols],
+        *[pl.col(c).max().alias(f'{c}__max') for c in int_cols],
+        *[n_unique(c) for c in str_cols],
+        *[pl.col(c).str.len_bytes().sum().alias(f'{c}__bytes') for c in str_cols],
+        *[pl.col(c).null_count().alias(f'{c}__nulls') for c in str_cols],
+    )).row(0, named=True)
+    
+    recommended = {}
+    for c in int_cols:
+        low, high = stats[f'{c}__min'], stats[f'{c}__max']
+        if low is None:
+            continue
+        for int_type, bits in _INT_BITS.items():
+            if int_type == schema[c]:
+                break
+            if -(2 ** (bits - 1)) <= low and high < 2 ** (bits - 1):
+                recommended[c] = int_type
+                break
+    
+    n_rows = max(1, stats['__len'])
+    enum_cols = [
+        c for c in str_cols
+        if 0 < stats[f'{c}__n_unique'] <= max_categories
+        and stats[f'{c}__n_unique'] / n_rows <= max_unique_ratio
+    ]
+    if enum_cols:
+        uniques = _collect(df.lazy().select(
+            pl.col(c).drop_nulls().unique().sort().implode() for c in enum_cols
+        )).row(0, named=True)
+        for c in enum_cols:
+            if len(uniques[c]) > max_categories:
+                continue  # הספירה המקורבת הייתה נמוכה מדי
+            recommended[c] = pl.Enum(uniques[c])
+    
+    if isinstance(df, pl.DataFrame):
+        return {
+            c: t for c, t in recommended.items()
+            if df[c].cast(t).estimated_size() < df[c].estimated_size()
+        }
+    return {
+        c: t for c, t in recommended.items()
+        if not isinstance(t, pl.Enum)
+        or _enum_size(stats['__len'], t.categories.len(), stats[f'{c}__nulls'] > 0)
+        < stats[f'{c}__bytes']
+    }
+
+
+def _enum_size(n_rows: int, n_categories: int, has_nulls: bool) -> int:
+    """
+    אומדן הגודל של עמודת Enum (כמו estimated_size): קוד לכל שורה
+    ברוחב שתלוי במספר הקטגוריות, ועוד bitmap של null אם יש ערכים חסרים
+    """
+    width = 1 if n_categories <= 2 ** 8 else 2 if n_categories <= 2 ** 16 else 4
+    return n_rows * width + (-(-n_rows // 8) if has_nulls else 0)
+
+
+def shrink_dtypes(df: Frame, **kwargs) -> Frame:
+    """
+    המרת העמודות לטיפוסים שהומלצו ב-recommend_dtypes
+    
+    Args:
+        df: DataFrame או LazyFrame
+        **kwargs: פרמטרים ל-recommend_dtypes
+    
+    Returns:
+        DataFrame או LazyFrame (לפי הקלט) עם טיפוסים צרים יותר
+    """
+    return df.cast(recommend_dtypes(df, **kwargs))
+
+
+def _dtype_label(dtype: pl.DataType) -> str:
+    """שם קצר לטיפוס - Enum מוצג עם מספר הקטגוריות בלבד"""
+    if isinstance(dtype, pl.Enum):
+        return f"Enum({dtype.categories.len()} categories)"
+    return str(dtype)
+
+
+def memory_profile(df: pl.DataFrame, **kwargs) -> pl.DataFrame:
+    """
+    פרופיל זיכרון לכל עמודה: גודל נוכחי, טיפוס מומלץ וגודל אחרי המרה
     
     Args:
         df: DataFrame לבדיקה
+        **kwargs: פרמטרים ל-recommend_dtypes
+    
+    Returns:
+        pl.DataFrame: שורה לכל עמודה
+    """
+    recommended = recommend_dtypes(df, **kwargs)
+    rows = []
+    for name in df.columns:
+        column = df[name]
+        target = recommended.get(name)
+        rows.append({
+            'column': name,
+            'dtype': str(column.dtype),
+            'bytes': column.estimated_size(),
+            'recommended': _dtype_label(target) if target is not None else '',
+            'bytes_after': column.cast(target).estimated_size() if target is not None
+                           else column.estimated_size(),
+        })
+    return pl.DataFrame(rows)
+
+
+def show_dataframe_properties(df: Frame):
+    """
+    הצגת מאפייני DataFrame חשובים
+    
+    Args:
+        df: DataFrame או LazyFrame לבדיקה
     """
     print("\n" + "="*70)
     print("3️⃣  מאפייני DataFrame")
     print("="*70)
     
+    schema = df.collect_schema()
+    height = _count_rows(df)
+    
     print("\n🔹 Schema (מבנה הטבלה):")
-    print(df.schema)
+    print(schema)
     
     print("\n🔹 Columns (שמות עמודות):")
-    print(df.columns)
+    print(schema.names())
     
     print("\n🔹 Dtypes (טיפוסי נתונים):")
-    print(df.dtypes)
+    print(schema.dtypes())
     
-    print(f"\n🔹 Shape (צורה): {df.shape}")
-    print(f"   • שורות (height): {df.height}")
-    print(f"   • עמודות (width): {df.width}")
+    print(f"\n🔹 Shape (צורה): {(height, len(schema))}")
+    print(f"   • שורות (height): {height}")
+    print(f"   • עמודות (width): {len(schema)}")
     
     print("\n🔹 Describe (סטטיסטיקות):")
-    print(df.describe())
+    if isinstance(df, pl.LazyFrame):
+        # describe() על LazyFrame אוסף את כל הנתונים - כאן מעבר streaming אחד
+        print(fused_stats(df))
+    else:
+        print(df.describe())
+    
+    print("\n🔹 Memory (זיכרון לפי עמודה):")
+    if isinstance(df, pl.LazyFrame):
+        # ב-LazyFrame אין נתונים בזיכרון - מציגים רק את ההמלצות
+        for name, dtype in recommend_dtypes(df).items():
+            print(f"   • {name}: {schema[name]} → {_dtype_label(dtype)}")
+    else:
+        profile = memory_profile(df)
+        with pl.Config(tbl_rows=-1):
+            print(profile)
+        before, after = profile['bytes'].sum(), profile['bytes_after'].sum()
+        print(f"   • סה\"כ: {before / 1024:.1f} KB → {after / 1024:.1f} KB "
+              f"אחרי המרה ({100 * (1 - after / before):.0f}% חיסכון)")
+        print("   💡 טיפ: load_titanic_data(shrink=True) ממיר כבר בטעינה")
 
 
 # =============================================================================
 # חלק 2: Series - עמודה בודדת
 # =============================================================================
 
-def work_with_series(df: pl.DataFrame):
+def work_with_series(df: Frame):
     """
     דוגמאות לעבודה עם Series (עמודה בודדת)
     
     Args:
-        df: DataFrame עם עמודת Age
+        df: DataFrame או LazyFrame עם עמודת Age
     """
     print("\n" + "="*70)
     print("4️⃣  עבודה עם Series")
     print("="*70)
     
-    # חילוץ Series
-    age_series = df['Age']
+    # חילוץ Series (ב-LazyFrame אין Series בזיכרון - משתמשים בעמודה עצמה)
+    age_series = df['Age'] if isinstance(df, pl.DataFrame) else df.select('Age')
+    name, dtype = 'Age', df.collect_schema()['Age']
+    
+    # כל הסטטיסטיקות במעבר אחד על הנתונים (streaming_stats.fused_stats)
+    stats = fused_stats(age_series).row(0, named=True)
+    stats['length'] = stats['count'] + stats['null_count']
+    if isinstance(df, pl.LazyFrame):
+        # ספירה מדויקת שומרת את כל הערכים השונים - HyperLogLog בזיכרון קבוע
+        stats['n_unique'] = _collect(df.select(pl.col('Age').approx_n_unique())).item()
+        unique_label = 'ערכים ייחודיים (בקירוב)'
+    else:
+        stats['n_unique'] = df['Age'].n_unique()
+        unique_label = 'ערכים ייחודיים'
     
     print("\n📈 עמודת Age:")
-    print(f"  • שם: {age_series.name}")
-    print(f"  • טיפוס: {age_series.dtype}")
-    print(f"  • אורך: {len(age_series)}")
+    print(f"  • שם: {name}")
+    print(f"  • טיפוס: {dtype}")
+    print(f"  • אורך: {stats['length']}")
     
     # סטטיסטיקות
     print("\n📊 סטטיסטיקות:")
-    print(f"  • ממוצע: {age_series.mean():.2f}")
-    print(f"  • חציון: {age_series.median():.2f}")
-    print(f"  • סטיית תקן: {age_series.std():.2f}")
-    print(f"  • מינימום: {age_series.min():.2f}")
-    print(f"  • מקסימום: {age_series.max():.2f}")
-    print(f"  • ערכים ייחודיים: {age_series.n_unique()}")
-    print(f"  • ערכים חסרים: {age_series.null_count()}")
+    print(f"  • ממוצע: {stats['mean']:.2f}")
+    print(f"  • חציון: {stats['median']:.2f}")
+    print(f"  • סטיית תקן: {stats['std']:.2f}")
+    print(f"  • מינימום: {stats['min']:.2f}")
+    print(f"  • מקסימום: {stats['max']:.2f}")
+    print(f"  • {unique_label}: {stats['n_unique']}")
+    print(f"  • ערכים חסרים: {stats['null_count']}")
 
 
 # =============================================================================
 # חלק 3: LazyFrame - עיבוד עצל
 # =============================================================================
 
-def demonstrate_lazyframe(df: pl.DataFrame):
+_PARAM_PREFIX = '__param_'
+
+
+def param(name: str) -> pl.Expr:
     """
-    הדגמת שימוש ב-LazyFrame ועיבוד עצל
+    פרמטר בשם name בתוך תנאי של PreparedQuery
+    
+    דוגמה: pl.col('Age') > param('min_age')
+    """
+    return pl.col(f'{_PARAM_PREFIX}{name}')
+
+
+class PreparedQuery:
+    """
+    שאילתת filter -> select -> sort -> head מוכנה מראש, עם פרמטרים בשמות
+    
+    השאילתה נשמרת כתוכנית ולא כנתונים: בחירת העמודות, המיון ותנאי הסינון
+    עם param(...) במקום ערכים. תבנית התנאי מסוריאלזת פעם אחת בזמן ההכנה,
+    וכל הרצה רק מציבה בה את הערכים כ-literal - כך התנאי הוא השוואה רגילה
+    שנדחפת לסריקה (predicate pushdown), בלי עמודות עזר:
+    - מקור LazyFrame (למשל scan_csv) נשאר lazy, בסדר filter -> select ->
+      sort -> head, ש-Polars הופך ל-top-k: כל הרצה קוראת את הנתונים
+      העדכניים ב-streaming ולא ממיינת את כל הקלט
+    - מקור DataFrame כבר בזיכרון, ולכן המיון מחושב פעם אחת בזמן ההכנה
+      וכל הרצה רק מסננת את הנתונים הממוינים
+    
+    את השאילתה אפשר לשמור לדיסק (תוכנית מסוריאלזת, או הנתונים כ-IPC
+    כשהמקור היה DataFrame) ולטעון אותה בתהליך אחר.
     
     Args:
-        df: DataFrame להמרה ל-LazyFrame
+        plan: העמודות הנחוצות מהמקור (LazyFrame), או הנתונים הממוינים (DataFrame)
+        predicate: תנאי הסינון, עם param(...) במקום ערכים
+        columns: העמודות בתוצאה
+        limit: מספר השורות בתוצאה
+        sort_by: עמודת המיון (ב-LazyFrame - ממוינת בכל הרצה)
+        descending: כיוון המיון
     """
-    print("\n" + "="*70)
-    print("5️⃣  LazyFrame - עיבוד עצל")
-    print("="*70)
     
-    print("\n⚡ יצירת LazyFrame ושרשרת פעולות:")
+    def __init__(self, plan: Frame, predicate: pl.Expr, columns: List[str],
+                 limit: int, sort_by: Optional[str] = None, descending: bool = False):
+        self.plan = plan
+        self.predicate = predicate
+        self.columns = columns
+        self.limit = limit
+        self.sort_by = sort_by
+        self.descending = descending
+        self.params = sorted(
+            name[len(_PARAM_PREFIX):] for name in predicate.meta.root_names()
+            if name.startswith(_PARAM_PREFIX)
+        )
+        self._template = predicate.meta.serialize(format='json')
+        self._plan_text: Optional[str] = None
+    
+    @classmethod
+    def prepare(cls, source: Frame, predicate: pl.Expr, columns: List[str],
+                sort_by: str, descending: bool = False, limit: int = 10) -> 'PreparedQuery':
+        """
+        הכנת שאילתה
+        
+        Args:
+            source: מקור הנתונים - LazyFrame לא נאסף, DataFrame ממוין מראש
+            predicate: תנאי הסינון, עם param(...) במקום ערכים
+            columns: העמודות בתוצאה
+            sort_by: עמודת המיון
+            descending: כיוון המיון
+            limit: מספר השורות בתוצאה
+        
+        Returns:
+            PreparedQuery: שאילתה מוכנה להרצה
+        """
+        needed = list(dict.fromkeys(
+            columns + [sort_by] + [
+                name for name in predicate.meta.root_names()
+                if not name.startswith(_PARAM_PREFIX)
+            ]
+        ))
+        plan = source.select(needed)
+        if isinstance(plan, pl.DataFrame):
+            plan = plan.sort(sort_by, descending=descending, maintain_order=True)
+        return cls(plan, predicate, columns, limit, sort_by, descending)
+    
+    def _bind(self, params: Dict[str, Any]) -> pl.Expr:
+        """התנאי עם הערכים במקום הפרמטרים (הצבה בתבנית ה-JSON)"""
+        text = self._template
+        for name in self.params:
+            placeholder = json.dumps({'Column': f'{_PARAM_PREFIX}{name}'},
+                                     separators=(',', ':'), ensure_ascii=False)
+            text = text.replace(placeholder, pl.lit(params[name]).meta.serialize(format='json'))
+        return pl.Expr.deserialize(io.StringIO(text), format='json')
     
-    result_lazy = (
-        df.lazy()
+    def _query(self, params: Dict[str, Any]) -> pl.LazyFrame:
+        """התוכנית המלאה עם ערכי הפרמטרים"""
+        query = self.plan.lazy().filter(self._bind(params))
+        if isinstance(self.plan, pl.LazyFrame) and self.sort_by is not None:
+            query = query.sort(self.sort_by, descending=self.descending, maintain_order=True)
+        return query.head(self.limit).select(self.columns)
+    
+    def execute(self, **params) -> pl.DataFrame:
+        """
+        הרצת השאילתה עם ערכים לפרמטרים
+        
+        Args:
+            **params: ערך לכל פרמטר (למשל min_age=30)
+        
+        Returns:
+            pl.DataFrame: התוצאה
+        """
+        missing = set(self.params) - set(params)
+        if missing:
+            raise ValueError(f"חסרים ערכים לפרמטרים: {sorted(missing)}")
+        query = self._query(params)
+        if self._plan_text is None:
+            self._plan_text = query.explain(optimized=True)
+        return _collect(query)
+    
+    def explain(self) -> Optional[str]:
+        """
+        התוכנית האופטימלית (נשמרת מההרצה הראשונה - מבנה התוכנית לא תלוי
+        בערכי הפרמטרים; None לפני הרצה)
+        """
+        return self._plan_text
+    
+    def save(self, path: str) -> None:
+        """
+        שמירה לדיסק: path.json (התנאי וההגדרות) ו-path.plan (התוכנית)
+        או path.arrow (הנתונים הממוינים, כשהמקור היה DataFrame)
+        """
+        is_lazy = isinstance(self.plan, pl.LazyFrame)
+        if is_lazy:
+            with open(f'{path}.plan', 'wb') as f:
+                f.write(self.plan.serialize())
+        else:
+            self.plan.write_ipc(f'{path}.arrow')
+        spec = {
+            'predicate': self.predicate.meta.serialize().hex(),
+            'columns': self.columns,
+            'limit': self.limit,
+            'sort_by': self.sort_by,
+            'descending': self.descending,
+            'lazy': is_lazy,
+        }
+        with open(f'{path}.json', 'w', encoding='utf-8') as f:
+            json.dump(spec, f)
+    
+    @classmethod
+    def load(cls, path: str) -> 'PreparedQuery':
+        """טעינת שאילתה שנשמרה ב-save"""
+        with open(f'{path}.json', encoding='utf-8') as f:
+            spec = json.load(f)
+        predicate = pl.Expr.deserialize(io.BytesIO(bytes.fromhex(spec['predicate'])))
+        if spec['lazy']:
+            with open(f'{path}.plan', 'rb') as f:
+                plan = pl.LazyFrame.deserialize(f)
+        else:
+            plan = pl.read_ipc(f'{path}.arrow')
+        return cls(plan, predicate, spec['columns'], spec['limit'],
+                   spec.get('sort_by'), spec.get('descending', False))
+
+
+def top_fares_query(df: Frame) -> pl.LazyFrame:
+    """השאילתה של demonstrate_lazyframe: 10 המחירים הגבוהים מעל גיל 30"""
+    return (
+        df.lazy()  # על LazyFrame קיים - פעולה ריקה
         .filter(pl.col('Age') > 30)
         .select(['Name', 'Age', 'Fare'])
         .sort('Fare', descending=True)
         .head(10)
     )
+
+
+def demonstrate_lazyframe(df: Frame):
+    """
+    הדגמת שימוש ב-LazyFrame ועיבוד עצל
+    
+    Args:
+        df: DataFrame להמרה ל-LazyFrame (או LazyFrame קיים)
+    """
+    print("\n" + "="*70)
+    print("5️⃣  LazyFrame - עיבוד עצל")
+    print("="*70)
+    
+    print("\n⚡ יצירת LazyFrame ושרשרת פעולות:")
+    
+    result_lazy = top_fares_query(df)
     
     print("\n📋 תוכנית ביצוע (אחרי אופטימיזציה):")
     print(result_lazy.explain(optimized=True))
     
     print("\n✨ ביצוע החישוב:")
-    result = result_lazy.collect()
+    result = _collect(result_lazy)
     print(result)
+    
+    print("\n⚡ שאילתה מוכנה מראש עם פרמטר (PreparedQuery):")
+    query = PreparedQuery.prepare(
+        df,  # LazyFrame נשאר lazy; DataFrame ממוין פעם אחת
+        predicate=pl.col('Age') > param('min_age'),
+        columns=['Name', 'Age', 'Fare'],
+        sort_by='Fare',
+        descending=True,
+        limit=10,
+    )
+    for min_age in (30, 50, 60):
+        start = time.perf_counter()
+        answer = query.execute(min_age=min_age)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"  • min_age={min_age}: {answer.height} שורות, "
+              f"מחיר מקסימלי {answer['Fare'].max()} ({elapsed:.2f} ms)")
 
 
 # =============================================================================
 # חלק 4: בחירה וסינון
 # =============================================================================
 
-def select_and_filter_examples(df: pl.DataFrame):
+_COMPARISONS = {
+    '==': operator.eq, '!=': operator.ne,
+    '>': operator.gt, '>=': operator.ge,
+    '<': operator.lt, '<=': operator.le,
+}
+
+
+class BitmapIndex:
+    """
+    אינדקס bitmap לסינונים חוזרים על אותו DataFrame
+    
+    לכל עמודה עם מעט ערכים שונים (Sex, Embarked, Pclass, Age...) נשמרת
+    מסכה בוליאנית לכל ערך, ולכל עמודה נשמרת מסכת null. מסכה בוליאנית
+    ב-Polars שמורה כ-bitmap (ביט אחד לשורה), כך ש-& / | / ~ בין מסכות
+    הן פעולות ביטים מהירות שלא נוגעות בנתונים עצמם.
+    
+    תנאים על עמודות שאינן באינדקס מחושבים פעם אחת ונשמרים לפי
+    (עמודה, אופרטור, ערך).
+    
+    האינדקס מחזיק עותק משלו של הנתונים (clone - בלי העתקת זיכרון).
+    שינוי במקום ב-DataFrame המקורי (df[2, 'Age'] = 5.0, replace_column...)
+    מעתיק את העמודה ולא נוגע בעותק, כך שכל המסכות וה-filter תמיד עקביים
+    עם הנתונים שעליהם נבנה האינדקס. בדיקת התוקף לא עוברת על הנתונים:
+    מי שמשנה DataFrame במקום מעלה את version, ו-get_bitmap_index בונה
+    אינדקס חדש.
+    
+    Args:
+        df: DataFrame לאינדוקס
+        max_cardinality: מספר ערכים שונים מקסימלי לעמודה באינדקס
+        version: גרסה מפורשת של הנתונים (אופציונלי)
+    """
+    
+    def __init__(self, df: pl.DataFrame, max_cardinality: int = 256,
+                 version: Any = None):
+        self._frame = weakref.ref(df)
+        self.snapshot = df.clone()
+        self.version = version
+        self.schema = df.schema
+        self.height = df.height
+        self.null_masks: Dict[str, pl.Series] = {}
+        self.value_masks: Dict[str, Dict[Any, pl.Series]] = {}
+        self._predicates: Dict[Tuple[str, str, Any], pl.Series] = {}
+        
+        for name in self.snapshot.columns:
+            column = self.snapshot[name]
+            self.null_masks[name] = column.is_null()
+            values = column.drop_nulls().unique()
+            if values.len() <= max_cardinality:
+                self.value_masks[name] = {
+                    value: (column == value).fill_null(False)
+                    for value in values.to_list()
+                }
+    
+    def is_valid_for(self, df: pl.DataFrame, version: Any = None) -> bool:
+        """
+        האם האינדקס נבנה על ה-DataFrame הזה, באותה גרסה - בלי לעבור על
+        הנתונים (רק זהות האובייקט, הגרסה, מספר השורות והסכמה)
+        """
+        return (self._frame() is df and version == self.version
+                and df.height == self.height and df.schema == self.schema)
+    
+    def is_null(self, column: str) -> pl.Series:
+        """מסכת השורות שבהן column הוא null"""
+        return self.null_masks[column]
+    
+    def is_in(self, column: str, values: Iterable[Any]) -> pl.Series:
+        """מסכת השורות שבהן column באחד מהערכים (OR של ה-bitmaps)"""
+        wanted = list(values)
+        if column in self.value_masks:
+            wanted_set = set(wanted)
+            return self._any_value(column, lambda v: v in wanted_set)
+        return self._predicate((column, 'in', frozenset(wanted)), pl.col(column).is_in(wanted))
+    
+    def compare(self, column: str, op: str, value: Any) -> pl.Series:
+        """
+        מסכת השורות שמקיימות column <op> value
+        
+        Args:
+            column: שם העמודה
+            op: אחד מ- == != > >= < <=
+            value: ערך להשוואה
+        """
+        if column in self.value_masks:
+            compare = _COMPARISONS[op]
+            return self._any_value(column, lambda v: compare(v, value))
+        
+        return self._predicate((column, op, value), _COMPARISONS[op](pl.col(column), value))
+    
+    def _predicate(self, key: Tuple[str, str, Any], expr: pl.Expr) -> pl.Series:
+        """מסכה של תנאי על עמודה שאינה באינדקס - מחושבת פעם אחת ונשמרת"""
+        if key not in self._predicates:
+            self._predicates[key] = self.snapshot.select(expr.fill_null(False)).to_series()
+        return self._predicates[key]
+    
+    def _any_value(self, column: str, keep) -> pl.Series:
+        """OR של ה-bitmaps של כל הערכים שמקיימים את התנאי"""
+        mask = pl.repeat(False, self.height, eager=True)
+        for value, bitmap in self.value_masks[column].items():
+            if keep(value):
+                mask = mask | bitmap
+        return mask
+    
+    @staticmethod
+    def count(mask: pl.Series) -> int:
+        """מספר השורות שמקיימות את המסכה - בלי לגעת בנתונים"""
+        return mask.sum()
+    
+    def filter(self, mask: pl.Series) -> pl.DataFrame:
+        """השורות שמקיימות את המסכה (מהעותק שעליו נבנה האינדקס)"""
+        return self.snapshot.filter(mask)
+
+
+_bitmap_indexes: Dict[int, BitmapIndex] = {}
+
+
+def get_bitmap_index(df: pl.DataFrame, version: Any = None, **kwargs) -> BitmapIndex:
+    """
+    אינדקס ה-bitmap של DataFrame - נבנה בפעם הראשונה ונבנה מחדש אם השתנה
+    
+    Args:
+        df: DataFrame
+        version: גרסה מפורשת של הנתונים - מעלים אותה אחרי כל שינוי במקום
+                 (שינוי בלי גרסה חדשה: האינדקס עונה על העותק שלו)
+        **kwargs: פרמטרים ל-BitmapIndex
+    
+    Returns:
+        BitmapIndex: אינדקס תקף ל-df
+    """
+    index = _bitmap_indexes.get(id(df))
+    if index is None or not index.is_valid_for(df, version):
+        index = BitmapIndex(df, version=version, **kwargs)
+        _bitmap_indexes[id(df)] = index
+        weakref.finalize(df, _bitmap_indexes.pop, id(df), None)
+    return index
+
+
+def filter_examples(df: Frame) -> Dict[str, Frame]:
+    """הסינונים של select_and_filter_examples: שם -> Frame מסונן"""
+    return {
+        'over_30': df.filter(pl.col('Age') > 30),
+        'female_over_30': df.filter((pl.col('Age') > 30) & (pl.col('Sex') == 'female')),
+        'embarked_c_q': df.filter(pl.col('Embarked').is_in(['C', 'Q'])),
+        'null_cabin': df.filter(pl.col('Cabin').is_null()),
+    }
+
+
+def select_and_filter_examples(df: Frame, use_index: bool = False):
     """
     דוגמאות מקיפות לבחירה וסינון נתונים
     
     Args:
-        df: DataFrame לדוגמאות
+        df: DataFrame או LazyFrame לדוגמאות
+        use_index: ב-DataFrame - חישוב הספירות דרך אינדקס bitmap
+                   (שימושי כשמריצים הרבה צירופי תנאים על אותם נתונים)
     """
     print("\n" + "="*70)
     print("6️⃣  בחירה וסינון נתונים")
@@ -216,45 +816,55 @@ def select_and_filter_examples(df: pl.DataFrame):
     # בחירת עמודות
     print("\n🔹 בחירת עמודות ספציפיות:")
     selected = df.select(['Name', 'Age', 'Fare']).head(3)
-    print(selected)
+    print(_collect(selected))
+    
+    filters = filter_examples(df)
     
     # סינון פשוט
     print("\n🔹 סינון: גיל מעל 30")
-    filtered = df.filter(pl.col('Age') > 30)
-    print(f"נמצאו {filtered.height} נוסעים")
-    print(filtered.select(['Name', 'Age']).head(3))
+    filtered = filters['over_30']
+    print(f"נמצאו {_count_rows(filtered)} נוסעים")
+    print(_collect(filtered.select(['Name', 'Age']).head(3)))
     
     # תנאים מורכבים
     print("\n🔹 תנאים מורכבים: נשים מעל גיל 30")
-    complex_filter = df.filter(
-        (pl.col('Age') > 30) & (pl.col('Sex') == 'female')
-    )
-    print(f"נמצאו {complex_filter.height} נוסעות")
-    print(complex_filter.select(['Name', 'Age', 'Sex']).head(3))
+    complex_filter = filters['female_over_30']
+    print(f"נמצאו {_count_rows(complex_filter)} נוסעות")
+    print(_collect(complex_filter.select(['Name', 'Age', 'Sex']).head(3)))
     
     # is_in
     print("\n🔹 שימוש ב-is_in:")
-    embarked_filter = df.filter(
-        pl.col('Embarked').is_in(['C', 'Q'])
-    )
-    print(f"נוסעים שעלו בנמלים C או Q: {embarked_filter.height}")
+    embarked_filter = filters['embarked_c_q']
+    print(f"נוסעים שעלו בנמלים C או Q: {_count_rows(embarked_filter)}")
     
     # null values
     print("\n🔹 בדיקת ערכי null:")
-    null_cabin = df.filter(pl.col('Cabin').is_null())
-    print(f"נוסעים ללא מידע על Cabin: {null_cabin.height}")
+    null_cabin = filters['null_cabin']
+    print(f"נוסעים ללא מידע על Cabin: {_count_rows(null_cabin)}")
+    
+    # אינדקס bitmap
+    if use_index and isinstance(df, pl.DataFrame):
+        print("\n🔹 אותן ספירות דרך אינדקס bitmap:")
+        index = get_bitmap_index(df)
+        over_30 = index.compare('Age', '>', 30)
+        female = index.compare('Sex', '==', 'female')
+        print(f"  • גיל מעל 30: {index.count(over_30)}")
+        print(f"  • נשים מעל גיל 30: {index.count(over_30 & female)}")
+        print(f"  • עלו בנמלים C או Q: {index.count(index.is_in('Embarked', ['C', 'Q']))}")
+        print(f"  • ללא Cabin: {index.count(index.is_null('Cabin'))}")
+        print(f"  • גברים או ללא Cabin: {index.count(~female | index.is_null('Cabin'))}")
 
 
 # =============================================================================
 # חלק 5: שינוי עמודות
 # =============================================================================
 
-def modify_columns_examples(df: pl.DataFrame):
+def modify_columns_examples(df: Frame):
     """
     דוגמאות ליצירה, שינוי ומחיקה של עמודות
     
     Args:
-        df: DataFrame לשינוי
+        df: DataFrame או LazyFrame לשינוי
     """
     print("\n" + "="*70)
     print("7️⃣  שינוי עמודות")
@@ -265,7 +875,7 @@ def modify_columns_examples(df: pl.DataFrame):
     df_with_adult = df.with_columns([
         (pl.col('Age') >= 18).alias('is_adult')
     ])
-    print(df_with_adult.select(['Name', 'Age', 'is_adult']).head(3))
+    print(_collect(df_with_adult.select(['Name', 'Age', 'is_adult']).head(3)))
     
     # הוספת מספר עמודות
     print("\n🔹 הוספת מספר עמודות:")
@@ -273,43 +883,110 @@ def modify_columns_examples(df: pl.DataFrame):
         (pl.col('Age') >= 18).alias('is_adult'),
         (pl.col('Fare') > 50).alias('expensive_ticket')
     ])
-    print(df_extended.select([
+    print(_collect(df_extended.select([
         'Name', 'Age', 'is_adult', 'Fare', 'expensive_ticket'
-    ]).head(3))
+    ]).head(3)))
     
     # מחיקת עמודות
     print("\n🔹 מחיקת עמודות:")
     df_dropped = df.drop(['Ticket', 'Cabin'])
-    print(f"לפני: {df.width} עמודות")
-    print(f"אחרי: {df_dropped.width} עמודות")
+    print(f"לפני: {df.collect_schema().len()} עמודות")
+    print(f"אחרי: {df_dropped.collect_schema().len()} עמודות")
     
     # שינוי שם
     print("\n🔹 שינוי שמות עמודות:")
     df_renamed = df.rename({'Pclass': 'Class', 'SibSp': 'Siblings'})
-    print(f"עמודות חדשות: {df_renamed.columns[:5]}")
+    print(f"עמודות חדשות: {df_renamed.collect_schema().names()[:5]}")
 
 
 # =============================================================================
 # חלק 6: Method Chaining
 # =============================================================================
 
-def method_chaining_example(df: pl.DataFrame):
+_ROW_INDEX = '__row_index'
+
+
+def _top_rows(df: pl.DataFrame, by: List[str], k: int, descending: List[bool],
+              with_ties: bool, nulls_last: bool) -> pl.DataFrame:
     """
-    דוגמה מקיפה לשרשור פעולות
+    k השורות הראשונות לפי סדר המיון, בלי למיין את כל ה-DataFrame
+    
+    df כולל את עמודת _ROW_INDEX (מיקום השורה בקלט), שמשמשת לשבירת
+    שוויון: בין שורות שוות נבחרות הראשונות בקלט, כמו ב-sort יציב + head.
+    top_k תמיד מדרג null אחרון, ולכן לפני כל עמודת מיון יש מפתח is_null
+    שממקם את ה-null לפי nulls_last - כמו ב-sort.
+    עם with_ties=True נשמרות גם כל השורות ששוות לשורה ה-k (בכל עמודות המיון).
+    """
+    keys: List[pl.Expr] = []
+    reverse: List[bool] = []
+    for column, desc in zip(by, descending):
+        keys += [pl.col(column).is_null(), pl.col(column)]
+        reverse += [nulls_last, not desc]
+    top = df.top_k(k, by=keys + [pl.col(_ROW_INDEX)], reverse=reverse + [True])
+    if not with_ties or top.height < k:
+        return top
+    
+    boundary = top.sort(by + [_ROW_INDEX], descending=descending + [False],
+                        nulls_last=nulls_last).row(-1, named=True)
+    is_tie = pl.all_horizontal([
+        pl.col(c).eq_missing(boundary[c]) for c in by
+    ])
+    return pl.concat([top.filter(~is_tie), df.filter(is_tie)])
+
+
+def streaming_top_k(lf: pl.LazyFrame,
+                    by: Union[str, List[str]],
+                    k: int = 10,
+                    descending: Union[bool, Sequence[bool]] = True,
+                    with_ties: bool = False,
+                    nulls_last: bool = False,
+                    batch_size: int = 50_000) -> pl.DataFrame:
+    """
+    Top-k בזיכרון חסום - חלופה ל-sort(...).head(k) על קלט גדול מהזיכרון
+    
+    ה-LazyFrame מחושב במנות (collect_batches). מכל מנה נשמרות רק k
+    השורות הטובות ביותר, והן מתמזגות עם התוצאה החלקית של המנות הקודמות.
+    כך הזיכרון תלוי ב-k ובגודל המנה, ולא בגודל הקלט.
+    
+    שורות שוות בעמודות המיון נשארות בסדר הקלט (גם עם with_ties), ו-null
+    ממוקם לפי nulls_last, כך שהתוצאה זהה ל-
+    sort(..., maintain_order=True, nulls_last=nulls_last).head(k).
     
     Args:
-        df: DataFrame לעיבוד
+        lf: LazyFrame המקור (למשל scan_csv עם סינונים)
+        by: עמודה או רשימת עמודות למיון
+        k: מספר השורות בתוצאה
+        descending: כיוון המיון - ערך אחד או ערך לכל עמודה
+        with_ties: לכלול את כל השורות השוות לשורה ה-k
+        nulls_last: null בסוף (ברירת המחדל של sort: null בהתחלה)
+        batch_size: מספר שורות בכל מנה
     
     Returns:
-        pl.DataFrame: תוצאה אחרי שרשרת פעולות
+        pl.DataFrame: k השורות הראשונות, ממוינות
     """
-    print("\n" + "="*70)
-    print("8️⃣  Method Chaining - שרשור פעולות")
-    print("="*70)
+    by = [by] if isinstance(by, str) else list(by)
+    if isinstance(descending, bool):
+        descending = [descending] * len(by)
+    else:
+        descending = list(descending)
     
-    print("\n⛓️  שרשרת פעולות מורכבת:")
+    partial = None
+    for batch in lf.with_row_index(_ROW_INDEX).collect_batches(chunk_size=batch_size):
+        candidates = batch if partial is None else pl.concat([partial, batch])
+        partial = _top_rows(candidates, by, k, descending, with_ties, nulls_last)
     
-    result = (
+    if partial is None:
+        return lf.head(0).collect()
+    return (
+        partial
+        .sort(by + [_ROW_INDEX], descending=descending + [False], nulls_last=nulls_last)
+        .drop(_ROW_INDEX)
+    )
+
+
+def fare_per_year_pipeline(df: Frame) -> Frame:
+    """שרשרת הפעולות של method_chaining_example (לפני המיון)"""
+    return (
         df
         # סינון: רק גילאים ידועים
         .filter(pl.col('Age').is_not_null())
@@ -325,13 +1002,44 @@ def method_chaining_example(df: pl.DataFrame):
         
         # בחירת עמודות
         .select(['Name', 'Age', 'Fare', 'fare_per_year', 'Survived'])
-        
-        # מיון
-        .sort('fare_per_year', descending=True)
-        
-        # 10 ראשונים
+    )
+
+
+def top_fare_per_year_query(df: Frame) -> Frame:
+    """
+    10 המבוגרים עם המחיר הגבוה ביותר לשנת חיים - מיון יציב (שורות שוות
+    נשארות בסדר הקלט, כמו ב-streaming_top_k)
+    """
+    return (
+        fare_per_year_pipeline(df)
+        .sort('fare_per_year', descending=True, maintain_order=True)
         .head(10)
     )
+
+
+def method_chaining_example(df: Frame):
+    """
+    דוגמה מקיפה לשרשור פעולות
+    
+    Args:
+        df: DataFrame או LazyFrame לעיבוד
+    
+    Returns:
+        pl.DataFrame: תוצאה אחרי שרשרת פעולות
+    """
+    print("\n" + "="*70)
+    print("8️⃣  Method Chaining - שרשור פעולות")
+    print("="*70)
+    
+    print("\n⛓️  שרשרת פעולות מורכבת:")
+    
+    if isinstance(df, pl.LazyFrame):
+        # על קלט עצל: top-k במנות, בלי למיין את כל הנתונים
+        result = streaming_top_k(fare_per_year_pipeline(df), by='fare_per_year',
+                                 k=10, descending=True)
+    else:
+        # סינון, עמודות חדשות, מיון יציב ו-10 ראשונים
+        result = top_fare_per_year_query(df)
     
     print("\n✨ תוצאה - 10 המבוגרים עם המחיר הגבוה ביותר לשנת חיים:")
     print(result)
@@ -343,6 +1051,27 @@ def method_chaining_example(df: pl.DataFrame):
 # חלק 7: קבצים גדולים
 # =============================================================================
 
+def large_file_queries(lf: pl.LazyFrame) -> Dict[str, pl.LazyFrame]:
+    """השאילתות של large_files_techniques מעל סריקה של הקובץ"""
+    return {
+        'over_30_projection': (
+            lf
+            .filter(pl.col('Age') > 30)
+            .select(['Name', 'Age', 'Fare'])
+        ),
+        'survivors_by_sex': (
+            lf
+            .filter(pl.col('Survived') == 1)
+            .group_by('Sex')
+            .agg([
+                pl.len().alias('count'),
+                pl.col('Age').mean().alias('avg_age')
+            ])
+            .sort('Sex')
+        ),
+    }
+
+
 def large_files_techniques(filepath: str = '../data/titanic_dataset.csv'):
     """
     טכניקות לעבודה עם קבצים גדולים
@@ -354,44 +1083,150 @@ def large_files_techniques(filepath: str = '../data/titanic_dataset.csv'):
     print("9️⃣  עיבוד קבצים גדולים")
     print("="*70)
     
+    queries = large_file_queries(pl.scan_csv(filepath))
+    
     # scan_csv
     print("\n🔹 שימוש ב-scan_csv (קריאה עצלה):")
-    result = (
-        pl.scan_csv(filepath)
-        .filter(pl.col('Age') > 30)
-        .select(['Name', 'Age', 'Fare'])
-        .collect()
-    )
+    result = queries['over_30_projection'].collect()
     print(f"נטענו {result.height} שורות (רק מה שצריך!)")
     print(result.head(3))
     
     # streaming
     print("\n🔹 Streaming mode:")
-    result_stream = (
-        pl.scan_csv(filepath)
-        .filter(pl.col('Survived') == 1)
-        .group_by('Sex')
-        .agg([
-            pl.len().alias('count'),
-            pl.col('Age').mean().alias('avg_age')
-        ])
-        .collect()
-    )
+    result_stream = queries['survivors_by_sex'].collect(engine='streaming')
     print(result_stream)
     
     # קריאת עמודות ספציפיות
     print("\n🔹 קריאת עמודות ספציפיות:")
     df_small = pl.read_csv(filepath, columns=['Name', 'Age', 'Survived'])
     print(f"נקראו רק {df_small.width} עמודות (במקום 12)")
+    
+    # קריאה במנות
+    print("\n🔹 קריאה במנות (iter_titanic_batches):")
+    batches, max_rows, survivors = 0, 0, 0
+    for batch in iter_titanic_batches(filepath, rows_per_batch=200):
+        batches += 1
+        max_rows = max(max_rows, batch.height)
+        survivors += batch['Survived'].sum()
+    print(f"{batches} מנות, עד {max_rows} שורות בזיכרון בכל רגע - {survivors} שורדים")
+
+
+# =============================================================================
+# חלק 8: שאילתות משותפות - חישוב חד-פעמי
+# =============================================================================
+
+def build_section_queries(df: Frame) -> Dict[str, pl.LazyFrame]:
+    """
+    השאילתות של חלקי המדריך כ-LazyFrames מעל מקור אחד
+    
+    השאילתות נבנות באותן פונקציות שהחלקים עצמם משתמשים בהן
+    (top_fares_query, filter_examples, top_fare_per_year_query,
+    large_file_queries), ולכן הן תמיד זהות להן. כולן נבנות מאותו מקור -
+    הנתונים ש-main כבר טען (DataFrame, או LazyFrame עם --lazy / מטמון) -
+    כך ש-collect_all יכול לזהות את הסריקה ואת תתי-התוכניות המשותפות
+    (כמו Age > 30) ולחשב אותן פעם אחת.
+    
+    Args:
+        df: DataFrame או LazyFrame
+    
+    Returns:
+        Dict[str, pl.LazyFrame]: שם השאילתה -> LazyFrame
+    """
+    lf = df.lazy()
+    
+    queries = {'top_fares_over_30': top_fares_query(lf)}
+    queries.update({
+        f'count_{name}': frame.select(pl.len())
+        for name, frame in filter_examples(lf).items()
+    })
+    queries['top_fare_per_year'] = top_fare_per_year_query(lf)
+    queries.update(large_file_queries(lf))
+    return queries
+
+
+def _count_scans(plan: str) -> int:
+    """מספר הסריקות של המקור (קובץ או DataFrame בזיכרון) בתוכנית ביצוע"""
+    return sum(1 for line in plan.splitlines()
+               if ' SCAN ' in f' {line.strip()} ' or line.strip().startswith('DF ['))
+
+
+def run_shared_queries(df: Frame, repeats: int = 5) -> Dict[str, pl.DataFrame]:
+    """
+    הרצת כל שאילתות המדריך בביצוע אחד עם collect_all
+    
+    לשם השוואה השאילתות מורצות גם אחת-אחת. שתי השיטות מורצות repeats
+    פעמים בסדר מתחלף (כך שאף אחת לא נהנית תמיד מ-cache חם של מערכת
+    ההפעלה) ונלקח הזמן הטוב ביותר. מספר הסריקות שנחסכו נספר מתוכניות
+    הביצוע עצמן.
+    
+    Args:
+        df: הנתונים שנטענו (DataFrame או LazyFrame)
+        repeats: מספר המדידות לכל שיטה
+    
+    Returns:
+        Dict[str, pl.DataFrame]: שם השאילתה -> התוצאה
+    """
+    print("\n" + "="*70)
+    print("🔟  שאילתות משותפות - collect_all")
+    print("="*70)
+    
+    queries = build_section_queries(df)
+    
+    def run_separate():
+        # ביצוע נפרד: כל שאילתה סורקת את הקובץ מחדש
+        return {name: lf.collect() for name, lf in queries.items()}
+    
+    def run_shared():
+        # ביצוע משותף: סריקות ותתי-תוכניות זהות מחושבות פעם אחת
+        return dict(zip(queries, pl.collect_all(queries.values())))
+    
+    times = {run_separate: float('inf'), run_shared: float('inf')}
+    for i in range(repeats):
+        order = (run_separate, run_shared) if i % 2 == 0 else (run_shared, run_separate)
+        for run in order:
+            start = time.perf_counter()
+            results = run()
+            times[run] = min(times[run], time.perf_counter() - start)
+            if run is run_shared:
+                shared = results
+    separate_time, shared_time = times[run_separate], times[run_shared]
+    
+    separate_scans = sum(_count_scans(lf.explain()) for lf in queries.values())
+    shared_scans = _count_scans(pl.explain_all(list(queries.values())))
+    
+    print(f"\n🔹 מספר שאילתות: {len(queries)}")
+    print(f"🔹 סריקות המקור: {separate_scans} בביצוע נפרד, {shared_scans} בביצוע משותף "
+          f"({separate_scans - shared_scans} אוחדו)")
+    print(f"🔹 זמן ביצוע נפרד: {separate_time * 1000:.1f} ms (הטוב מתוך {repeats})")
+    print(f"🔹 זמן ביצוע משותף: {shared_time * 1000:.1f} ms (הטוב מתוך {repeats})")
+    print(f"🔹 נחסכו: {(separate_time - shared_time) * 1000:.1f} ms "
+          f"(פי {separate_time / max(shared_time, 1e-9):.1f})")
+    
+    print("\n✨ תוצאות החלקים:")
+    print("\n🔹 10 המחירים הגבוהים מעל גיל 30:")
+    print(shared['top_fares_over_30'])
+    for name in filter_examples(pl.LazyFrame()):
+        print(f"  • {name}: {shared[f'count_{name}'].item()}")
+    print("\n🔹 10 המבוגרים עם המחיר הגבוה ביותר לשנת חיים:")
+    print(shared['top_fare_per_year'])
+    print("\n🔹 שורדים לפי מין:")
+    print(shared['survivors_by_sex'])
+    
+    return shared
 
 
 # =============================================================================
 # פונקציית Main - הרצת כל הדוגמאות
 # =============================================================================
 
-def main():
+def main(lazy: bool = False, shared: bool = False):
     """
     פונקציה ראשית המריצה את כל הדוגמאות
+    
+    Args:
+        lazy: אם True - הנתונים נסרקים כ-LazyFrame במקום להיטען לזיכרון
+        shared: אם True - השאילתות של החלקים (LazyFrame, סינון, שרשור
+                וקבצים גדולים) מורצות בביצוע משותף אחד במקום אחת-אחת
     """
     # מבוא
     section_intro()
@@ -400,7 +1235,7 @@ def main():
     simple_df = create_simple_dataframe()
     
     # טעינת Titanic
-    df = load_titanic_data()
+    df = load_titanic_data(lazy=lazy)
     
     if df is not None:
         # מאפייני DataFrame
@@ -409,20 +1244,24 @@ def main():
         # Series
         work_with_series(df)
         
-        # LazyFrame
-        demonstrate_lazyframe(df)
-        
-        # בחירה וסינון
-        select_and_filter_examples(df)
-        
         # שינוי עמודות
         modify_columns_examples(df)
         
-        # Method Chaining
-        method_chaining_example(df)
-        
-        # קבצים גדולים
-        large_files_techniques()
+        if shared:
+            # שאילתות משותפות - במקום החלקים שמריצים שאילתות אחת-אחת
+            run_shared_queries(df)
+        else:
+            # LazyFrame
+            demonstrate_lazyframe(df)
+            
+            # בחירה וסינון
+            select_and_filter_examples(df, use_index=True)
+            
+            # Method Chaining
+            method_chaining_example(df)
+            
+            # קבצים גדולים
+            large_files_techniques()
     
     # סיום
     print("\n" + "="*70)
@@ -438,4 +1277,4 @@ def main():
 # =============================================================================
 
 if __name__ == "__main__":
-    main()
+    main(lazy='--lazy' in sys.argv, shared='--shared' in sys.argv)
@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+מדידת ביצועים - טכניקות לעבודה עם קבצים גדולים
+================================================
+
+הסקריפט מודד את הטכניקות מהחלק "עיבוד קבצים גדולים" במדריך
+(read_csv, scan_csv, streaming, קריאת עמודות ספציפיות), ואת top-k של
+method_chaining_example (sort+head מול streaming_top_k), על גרסאות
+מוגדלות של מערך נתוני Titanic, כדי לבחור דרך טעינה לפי מספרים ולא לפי הערכה.
+
+לכל גודל נתונים ולכל אסטרטגיה:
+- ריצת חימום (warm-up) ואחריה מספר חזרות
+- זמן ריצה (wall time) - מינימום, ממוצע ומקסימום
+- שיא זיכרון (peak RSS) של התהליך, מעבר לזיכרון הבסיס (המפרש והספריות)
+- כמות בתים שנקראו (לינוקס בלבד, מתוך /proc/self/io).
+  שימו לב: קריאות דרך memory-map לא נספרות, לכן גודל הקובץ (file_mb) מוצג לצידן
+
+כל אסטרטגיה רצה בתהליך נפרד, כדי ששיא הזיכרון לא יושפע מהרצות קודמות.
+תהליך שקורס או חורג מזמן ההרצה המקסימלי מדווח כשגיאה ולא תוקע את המדידה.
+הדירוג משווה רק אסטרטגיות שמחשבות את אותה משימה ומחזירות את אותה תוצאה.
+
+הוראות הרצה:
+-----------
+python 05_מדידת_ביצועים_קבצים_גדולים.py
+python 05_מדידת_ביצועים_קבצים_גדולים.py --scales 1 10 --repeats 5
+
+הדוח נשמר כ-JSON וכ-CSV בתיקיית הפלט (ברירת מחדל: benchmark_results).
+"""
+
+import argparse
+import hashlib
+import importlib
+import json
+import multiprocessing
+import queue as queue_module
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import polars as pl
+
+# קובץ המדריך (שם המודול מתחיל בספרה, לכן import רגיל לא אפשרי)
+guide = importlib.import_module('02_קובץ_Python_מוכן_להרצה')
+
+
+# =============================================================================
+# האסטרטגיות הנמדדות
+# =============================================================================
+
+def _read_csv_full(path: str) -> pl.DataFrame:
+    """read_csv - קריאה מלאה לזיכרון ואז סינון"""
+    df = pl.read_csv(path)
+    return df.filter(pl.col('Age') > 30).select(['Name', 'Age', 'Fare'])
+
+
+def _read_csv_columns(path: str) -> pl.DataFrame:
+    """read_csv עם columns= - קריאת העמודות הנחוצות בלבד"""
+    df = pl.read_csv(path, columns=['Name', 'Age', 'Fare'])
+    return df.filter(pl.col('Age') > 30)
+
+
+def _scan_filter(engine: str) -> Callable[[str], pl.DataFrame]:
+    """scan_csv עם סינון ובחירת עמודות, במנוע החישוב הנתון"""
+    def run(path: str) -> pl.DataFrame:
+        return (
+            pl.scan_csv(path)
+            .filter(pl.col('Age') > 30)
+            .select(['Name', 'Age', 'Fare'])
+            .collect(engine=engine)
+        )
+    return run
+
+
+def _scan_group_by(engine: str) -> Callable[[str], pl.DataFrame]:
+    """scan_csv עם group_by, במנוע החישוב הנתון"""
+    def run(path: str) -> pl.DataFrame:
+        return (
+            pl.scan_csv(path)
+            .filter(pl.col('Survived') == 1)
+            .group_by('Sex')
+            .agg([
+                pl.len().alias('count'),
+                pl.col('Age').mean().alias('avg_age')
+            ])
+            .collect(engine=engine)
+        )
+    return run
+
+
+def _fare_per_year(path: str) -> pl.LazyFrame:
+    """שרשרת הפעולות של method_chaining_example (מהמדריך), לפני המיון"""
+    return guide.fare_per_year_pipeline(pl.scan_csv(path))
+
+
+def _sort_head(engine: str) -> Callable[[str], pl.DataFrame]:
+    """
+    top-10 דרך sort(...).head(10), במנוע החישוב הנתון
+
+    maintain_order=True: בנתונים המוגדלים כל שורה מופיעה כמה פעמים, ובלי
+    מיון יציב התוצאה בשוויונות לא מוגדרת ולא ניתנת להשוואה
+    """
+    def run(path: str) -> pl.DataFrame:
+        return (
+            _fare_per_year(path)
+            .sort('fare_per_year', descending=True, maintain_order=True)
+            .head(10)
+            .collect(engine=engine)
+        )
+    return run
+
+
+def _streaming_top_k(path: str) -> pl.DataFrame:
+    """top-10 דרך streaming_top_k - זיכרון חסום"""
+    return guide.streaming_top_k(_fare_per_year(path), by='fare_per_year', k=10)
+
+
+# המשימה שכל אסטרטגיה מחשבת - משווים ומדרגים רק בתוך משימה
+TASKS: Dict[str, str] = {
+    'read_csv': 'filter',
+    'read_csv_columns': 'filter',
+    'scan_filter_in_memory': 'filter',
+    'scan_filter_streaming': 'filter',
+    'scan_group_by_in_memory': 'group_by',
+    'scan_group_by_streaming': 'group_by',
+    'sort_head_in_memory': 'top_k',
+    'sort_head_streaming': 'top_k',
+    'streaming_top_k': 'top_k',
+}
+
+STRATEGIES: Dict[str, Callable[[str], pl.DataFrame]] = {
+    'read_csv': _read_csv_full,
+    'read_csv_columns': _read_csv_columns,
+    'scan_filter_in_memory': _scan_filter('in-memory'),
+    'scan_filter_streaming': _scan_filter('streaming'),
+    'scan_group_by_in_memory': _scan_group_by('in-memory'),
+    'scan_group_by_streaming': _scan_group_by('streaming'),
+    'sort_head_in_memory': _sort_head('in-memory'),
+    'sort_head_streaming': _sort_head('streaming'),
+    'streaming_top_k': _streaming_top_k,
+}
+
+
+# =============================================================================
+# יצירת נתונים ומדידה
+# =============================================================================
+
+def generate_scaled_dataset(source: str, scale: int, output_dir: Path) -> Path:
+    """
+    יצירת קובץ CSV בסכמת Titanic, גדול פי scale מהמקור
+
+    Args:
+        source: נתיב לקובץ Titanic המקורי
+        scale: מקדם הגדלה (1 = הקובץ המקורי)
+        output_dir: תיקייה לכתיבת הקובץ
+
+    Returns:
+        Path: נתיב לקובץ שנוצר
+    """
+    path = output_dir / f'titanic_x{scale}.csv'
+    if not path.exists():
+        df = pl.read_csv(source)
+        scaled = pl.concat([df] * scale).with_columns(
+            pl.int_range(1, pl.len() + 1).alias('PassengerId')
+        )
+        scaled.write_csv(path)
+    return path
+
+
+def _bytes_read() -> Optional[int]:
+    """כמות הבתים שהתהליך קרא עד כה (None אם לא נתמך)"""
+    try:
+        with open('/proc/self/io') as f:
+            for line in f:
+                if line.startswith('rchar:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def _peak_rss_mb() -> float:
+    """שיא הזיכרון של התהליך ב-MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ב-macOS הערך בבתים, בלינוקס ב-KB
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _result_fingerprint(df: pl.DataFrame) -> str:
+    """
+    טביעת אצבע של תוצאה - לא תלויה בסדר השורות, ומספרים עשרוניים מעוגלים
+    (מנועים שונים יכולים להחזיר ממוצע ששונה בביט האחרון)
+    """
+    rounded = df.with_columns(pl.col(pl.Float32, pl.Float64).round(9))
+    hashes = rounded.sort(rounded.columns, nulls_last=True).hash_rows(seed=0)
+    return hashlib.blake2b(hashes.to_numpy().tobytes(), digest_size=8).hexdigest()
+
+
+def _run_strategy(name: str, path: str, warmup: int, repeats: int, queue) -> None:
+    """הרצת אסטרטגיה אחת בתהליך נפרד ושליחת המדידות חזרה"""
+    run = STRATEGIES[name]
+    # זיכרון הבסיס אחרי הייבוא - מופחת משיא הזיכרון
+    baseline_mb = _peak_rss_mb()
+    for _ in range(warmup):
+        run(path)
+
+    times, reads = [], []
+    for _ in range(repeats):
+        read_before = _bytes_read()
+        start = time.perf_counter()
+        result = run(path)
+        times.append(time.perf_counter() - start)
+        read_after = _bytes_read()
+        if read_before is not None and read_after is not None:
+            reads.append(read_after - read_before)
+
+    queue.put({
+        'times': times,
+        'baseline_rss_mb': baseline_mb,
+        'peak_rss_mb': _peak_rss_mb() - baseline_mb,
+        'bytes_read': sum(reads) // len(reads) if reads else None,
+        'fingerprint': _result_fingerprint(result),
+    })
+
+
+def _wait_for_result(proc, queue, timeout: float) -> Dict:
+    """
+    המתנה לתוצאה של תהליך מדידה
+
+    Raises:
+        RuntimeError: אם התהליך קרס (exitcode שונה מ-0) או חרג מ-timeout
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return queue.get(timeout=1.0)
+        except queue_module.Empty:
+            if not proc.is_alive():
+                # ייתכן שהתוצאה הגיעה בדיוק כשהתהליך הסתיים
+                try:
+                    return queue.get(timeout=1.0)
+                except queue_module.Empty:
+                    raise RuntimeError(f"התהליך הסתיים עם exitcode={proc.exitcode}")
+            if time.monotonic() > deadline:
+                proc.terminate()
+                raise RuntimeError(f"חריגה מזמן ההרצה ({timeout:.0f} שניות)")
+
+
+def benchmark(source: str = '../data/titanic_dataset.csv',
+              scales: List[int] = (1, 10, 100, 1000),
+              warmup: int = 1,
+              repeats: int = 3,
+              data_dir: Optional[Path] = None,
+              timeout: float = 600.0) -> pl.DataFrame:
+    """
+    הרצת כל האסטרטגיות על כל הגדלים
+
+    Args:
+        source: נתיב לקובץ Titanic המקורי
+        scales: מקדמי ההגדלה למדידה
+        warmup: מספר ריצות חימום (לא נמדדות)
+        repeats: מספר חזרות נמדדות
+        data_dir: תיקייה לקבצים המוגדלים (ברירת מחדל: תיקייה זמנית)
+        timeout: זמן מקסימלי (בשניות) לכל אסטרטגיה בכל גודל
+
+    Returns:
+        pl.DataFrame: שורה לכל צירוף של גודל ואסטרטגיה
+    """
+    data_dir = Path(data_dir or tempfile.mkdtemp(prefix='polars_bench_'))
+    data_dir.mkdir(parents=True, exist_ok=True)
+    ctx = multiprocessing.get_context('spawn')
+    rows = []
+
+    for scale in scales:
+        path = generate_scaled_dataset(source, scale, data_dir)
+        file_mb = path.stat().st_size / (1024 * 1024)
+        print(f"\n📁 x{scale}: {path.name} ({file_mb:.1f} MB)")
+
+        for name in STRATEGIES:
+            queue = ctx.Queue()
+            proc = ctx.Process(target=_run_strategy,
+                               args=(name, str(path), warmup, repeats, queue))
+            proc.start()
+            row = {'scale': scale, 'file_mb': round(file_mb, 2),
+                   'task': TASKS[name], 'strategy': name}
+            try:
+                result = _wait_for_result(proc, queue, timeout)
+            except RuntimeError as exc:
+                print(f"   • {name:<26} ❌ {exc}")
+                rows.append({**row, 'error': str(exc)})
+                continue
+            finally:
+                proc.join()
+
+            times = result['times']
+            rows.append({
+                **row,
+                'min_s': min(times),
+                'mean_s': sum(times) / len(times),
+                'max_s': max(times),
+                'peak_rss_mb': round(result['peak_rss_mb'], 1),
+                'baseline_rss_mb': round(result['baseline_rss_mb'], 1),
+                'bytes_read': result['bytes_read'],
+                'fingerprint': result['fingerprint'],
+            })
+            print(f"   • {name:<26} {min(times) * 1000:>10.1f} ms   "
+                  f"{result['peak_rss_mb']:>8.1f} MB RSS")
+
+    return pl.DataFrame(rows, infer_schema_length=None)
+
+
+def rank_strategies(report: pl.DataFrame) -> pl.DataFrame:
+    """
+    האסטרטגיה המהירה ביותר לכל גודל ולכל משימה
+
+    בכל משימה מדורגות רק אסטרטגיות שהחזירו את אותה תוצאה כמו
+    האסטרטגיה הראשונה של המשימה (אסטרטגיות שנכשלו לא מדורגות).
+
+    Args:
+        report: תוצאות benchmark
+
+    Returns:
+        pl.DataFrame: שורה לכל (גודל, משימה)
+    """
+    if 'fingerprint' not in report.columns:
+        return report.head(0)
+    measured = report.filter(pl.col('fingerprint').is_not_null())
+    return (
+        measured
+        .filter(pl.col('fingerprint') == pl.col('fingerprint').first().over('scale', 'task'))
+        .sort('min_s')
+        .group_by('scale', 'task', maintain_order=True)
+        .first()
+        .sort('scale', 'task')
+        .select(['scale', 'task', 'strategy', 'min_s', 'peak_rss_mb'])
+    )
+
+
+def save_report(report: pl.DataFrame, output_dir: Path) -> None:
+    """
+    שמירת הדוח כ-JSON וכ-CSV
+
+    Args:
+        report: תוצאות המדידה
+        output_dir: תיקיית הפלט
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    report.write_csv(output_dir / 'large_files_benchmark.csv')
+    with open(output_dir / 'large_files_benchmark.json', 'w', encoding='utf-8') as f:
+        json.dump(report.to_dicts(), f, indent=2)
+    print(f"\n💾 הדוח נשמר ב-{output_dir}")
+
+
+def main():
+    """
+    הרצת המדידות מה-command line
+    """
+    parser = argparse.ArgumentParser(description='מדידת ביצועים לקבצים גדולים')
+    parser.add_argument('--source', default='../data/titanic_dataset.csv')
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100, 1000])
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--data-dir', type=Path, default=None)
+    parser.add_argument('--timeout', type=float, default=600.0)
+    parser.add_argument('--output', type=Path, default=Path('benchmark_results'))
+    args = parser.parse_args()
+
+    print("="*70)
+    print("  ⏱️  מדידת ביצועים - קבצים גדולים")
+    print("="*70)
+
+    report = benchmark(args.source, args.scales, args.warmup, args.repeats,
+                       args.data_dir, args.timeout)
+
+    print("\n🏆 האסטרטגיה המהירה ביותר לכל גודל ומשימה:")
+    with pl.Config(tbl_rows=-1):
+        print(rank_strategies(report))
+
+    if 'fingerprint' in report.columns:
+        different = report.filter(
+            pl.col('fingerprint') != pl.col('fingerprint').first().over('scale', 'task')
+        )
+        for row in different.iter_rows(named=True):
+            print(f"⚠️ x{row['scale']} {row['strategy']}: תוצאה שונה ממשימת "
+                  f"{row['task']} (למשל שורות שוות במיון) - לא דורגה")
+
+    save_report(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
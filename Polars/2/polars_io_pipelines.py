@@ -0,0 +1,1906 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+פרק 2 - תהליכי קריאה וכתיבה מתקדמים ב-Polars
+=============================================
+
+הרחבה מעשית של המחברת polars_io_comprehensive_hebrew.ipynb:
+כלים לעבודה עם הרבה קבצים, קבצים גדולים ואגמי נתונים (data lakes).
+
+תוכן:
+    1. קליטה מקבילית של קבצי CSV מרובים עם התאמת סכמות
+    2. כוונון כתיבת Parquet - מדידת זמני כתיבה וקריאה ולא רק גודל קובץ
+    3. קטלוג מחיצות - סטטיסטיקות לכל מחיצה בקובץ צד, לדילוג בלי לסרוק תיקיות
+    4. כתיבה מאוגדת ל-Delta - איגוד הוספות קטנות, דחיסת קבצים וניקוי גרסאות
+    5. מאגר סכמות - שמירת הסכמה שהוסקה כדי לדלג על הסקה ב-NDJSON/CSV
+    6. ייצוא Excel במנות - זיכרון קבוע ומעבר לגיליון חדש במגבלת השורות
+    7. סריקת Avro עצלה - projection/predicate pushdown ופענוח בלוקים במקביל
+    8. מאגר IPC משותף - טעינה ב-memory-map ושיתוף זיכרון בין תהליכים
+
+מחבר: מדריך Polars בעברית
+תאריך: 2025
+
+דרישות:
+    pip install polars
+
+שימוש:
+    python polars_io_pipelines.py
+"""
+
+import base64
+import glob
+import hashlib
+import importlib.util
+import io
+import itertools
+import json
+import multiprocessing
+import operator
+import os
+import re
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import uuid
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from urllib.parse import quote, unquote
+
+import polars as pl
+
+# מאגר ה-IPC המשותף לכל הפרקים (Polars/dataset_store.py)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from dataset_store import DatasetStore, read_source  # noqa: E402
+
+
+def print_section(title):
+    """הדפסת כותרת מדור"""
+    print(f"\n{'='*70}")
+    print(f"  {title}")
+    print(f"{'='*70}\n")
+
+
+def _best_time(run, repeats: int) -> float:
+    """הזמן הטוב ביותר מתוך repeats הרצות"""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+# =============================================================================
+# חלק 1: קליטה מקבילית של קבצים מרובים
+# =============================================================================
+
+def _expand_paths(sources: Union[str, Iterable[str]]) -> List[str]:
+    """
+    רשימת קבצים ממוינת מתבנית glob או מרשימת נתיבים
+
+    המיון מבטיח סדר דטרמיניסטי - אותו קלט תמיד נותן אותו סדר שורות.
+    """
+    if isinstance(sources, (str, Path)):
+        paths = glob.glob(str(sources))
+    else:
+        paths = [str(p) for p in sources]
+    return sorted(paths)
+
+
+def normalize_column_name(name: str) -> str:
+    """
+    נרמול שם עמודה: רווחים בקצוות, אותיות קטנות, _ במקום רווחים ומקפים
+
+    'Order Date' / 'order-date' / ' ORDER_DATE ' -> 'order_date'
+    """
+    return re.sub(r'[\s\-]+', '_', name.strip()).lower()
+
+
+def read_shard(path: str,
+               read_options: Optional[Dict[str, Any]] = None,
+               rename: Optional[Dict[str, str]] = None,
+               normalize_names: bool = True,
+               source_column: Optional[str] = None) -> pl.DataFrame:
+    """
+    קריאת קובץ (shard) אחד והתאמת שמות העמודות שלו
+
+    Args:
+        path: נתיב לקובץ CSV
+        read_options: אפשרויות ל-pl.read_csv (has_header, new_columns, try_parse_dates...)
+        rename: מיפוי שמות ישנים לשמות הקנוניים (אחרי נרמול)
+        normalize_names: האם לנרמל את שמות העמודות
+        source_column: אם ניתן - עמודה עם שם הקובץ שממנו הגיעה השורה
+
+    Returns:
+        pl.DataFrame: תוכן הקובץ
+    """
+    df = pl.read_csv(path, **(read_options or {}))
+    if normalize_names:
+        df = df.rename(normalize_column_name)
+    if rename:
+        df = df.rename({old: new for old, new in rename.items() if old in df.columns})
+    if source_column:
+        df = df.with_columns(pl.lit(Path(path).name).alias(source_column))
+    return df
+
+
+def ingest_shards(sources: Union[str, Iterable[str]],
+                  read_options: Optional[Dict[str, Any]] = None,
+                  rename: Optional[Dict[str, str]] = None,
+                  normalize_names: bool = True,
+                  source_column: Optional[str] = None,
+                  max_workers: Optional[int] = None) -> pl.LazyFrame:
+    """
+    קליטה מקבילית של קבצי CSV רבים עם סכמות שמשתנות מעט ביניהם
+
+    - כל קובץ נקרא ב-thread נפרד (Polars משחרר את ה-GIL בזמן הפענוח)
+    - שמות העמודות מנורמלים וממופים לשמות קנוניים
+    - עמודות שחסרות בחלק מהקבצים מתמלאות ב-null (concat אלכסוני)
+    - טיפוס שונה לאותה עמודה מורחב לטיפוס משותף (למשל Int64 + Float64 -> Float64)
+    - סדר השורות קבוע: לפי סדר הקבצים הממוין
+
+    Args:
+        sources: תבנית glob (למשל 'daily/*.csv') או רשימת נתיבים
+        read_options: אפשרויות ל-pl.read_csv לכל הקבצים
+        rename: מיפוי שמות ישנים לשמות קנוניים
+        normalize_names: האם לנרמל את שמות העמודות
+        source_column: שם עמודה שתכיל את שם קובץ המקור (None = בלי)
+        max_workers: מספר threads (ברירת מחדל: לפי ThreadPoolExecutor)
+
+    Returns:
+        pl.LazyFrame: כל הנתונים המאוחדים
+    """
+    paths = _expand_paths(sources)
+    if not paths:
+        raise FileNotFoundError(f"לא נמצאו קבצים: {sources}")
+
+    def read(path: str) -> pl.DataFrame:
+        return read_shard(path, read_options, rename, normalize_names, source_column)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        # map שומר על סדר הקלט גם כשהקבצים מסתיימים בסדר אחר
+        frames = list(pool.map(read, paths))
+
+    return pl.concat(frames, how='diagonal_relaxed').lazy()
+
+
+def make_drifting_shards(source: str, output_dir: Path, n_shards: int = 30) -> List[Path]:
+    """
+    יצירת קבצי דוגמה "יומיים" עם סכמה שמשתנה מעט בין הקבצים
+
+    - בשליש מהקבצים שמות העמודות באותיות קטנות עם _
+    - בחלק מהקבצים חסרה עמודה
+    - בחלק מהקבצים Quantity נשמרת כמספר עשרוני
+
+    Args:
+        source: קובץ CSV מקורי
+        output_dir: תיקייה לקבצים
+        n_shards: מספר קבצים
+
+    Returns:
+        List[Path]: נתיבי הקבצים שנוצרו
+    """
+    df = pl.read_csv(source)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    size = -(-df.height // n_shards)
+    paths = []
+
+    for i in range(n_shards):
+        shard = df.slice(i * size, size)
+        if i % 3 == 1:
+            shard = shard.rename(lambda c: c.lower().replace(' ', '_'))
+        if i % 5 == 2:
+            shard = shard.drop(shard.columns[-1])
+        if i % 4 == 3:
+            shard = shard.with_columns(pl.col('^(Quantity|quantity)$').cast(pl.Float64))
+        path = output_dir / f'day_{i:03d}.csv'
+        shard.write_csv(path)
+        paths.append(path)
+
+    return paths
+
+
+def benchmark_ingest(paths: List[Path], repeats: int = 3) -> Dict[str, float]:
+    """
+    השוואת קליטה סדרתית (קובץ אחרי קובץ) מול קליטה מקבילית
+
+    Args:
+        paths: קבצי הקלט
+        repeats: מספר חזרות (נלקח הזמן הטוב ביותר)
+
+    Returns:
+        Dict[str, float]: שם השיטה -> זמן בשניות
+    """
+    def sequential():
+        frames = [read_shard(str(p)) for p in paths]
+        return pl.concat(frames, how='diagonal_relaxed')
+
+    def parallel():
+        return ingest_shards(paths).collect()
+
+    return {
+        'sequential': _best_time(sequential, repeats),
+        'parallel': _best_time(parallel, repeats),
+    }
+
+
+def demo_multi_file_ingest(source: str = '../data/contoso_sales.csv'):
+    """הדגמת קליטה מקבילית של קבצים עם סכמות שונות"""
+    print_section("📂 1. קליטה מקבילית של קבצים מרובים")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = make_drifting_shards(source, Path(tmp) / 'daily')
+        print(f"🔹 נוצרו {len(paths)} קבצים יומיים עם סכמות שונות מעט")
+        for path in paths[:4]:
+            print(f"   {path.name}: {pl.read_csv(path, n_rows=0).columns[:3]} ...")
+
+        lf = ingest_shards(str(Path(tmp) / 'daily' / '*.csv'), source_column='source_file')
+        df = lf.collect()
+        print(f"\n✅ אוחדו {df.height:,} שורות, {df.width} עמודות")
+        print("\n📋 הסכמה המאוחדת:")
+        print(lf.collect_schema())
+
+        timings = benchmark_ingest(paths)
+        print("\n⏱️  השוואת ביצועים:")
+        for name, seconds in timings.items():
+            print(f"   • {name:<12} {seconds * 1000:>8.1f} ms")
+        print(f"   • האצה: פי {timings['sequential'] / timings['parallel']:.1f}")
+
+
+# =============================================================================
+# חלק 2: כוונון כתיבת Parquet
+# =============================================================================
+
+# רמות הדחיסה שנבדקות לכל codec (None = ברירת המחדל של ה-codec)
+DEFAULT_CODEC_LEVELS = {
+    'uncompressed': [None],
+    'snappy': [None],
+    'lz4': [None],
+    'gzip': [6, 9],
+    'zstd': [1, 3, 10],
+}
+
+
+def parquet_write_grid(codec_levels: Optional[Dict[str, List[Optional[int]]]] = None,
+                       row_group_sizes: Iterable[int] = (16_384, 131_072),
+                       statistics: Iterable[bool] = (True, False),
+                       dictionary: Iterable[bool] = (True, False)) -> List[Dict[str, Any]]:
+    """
+    כל צירופי ההגדרות לבדיקה
+
+    קידוד dictionary נשלט רק דרך הכותב של pyarrow; אם pyarrow לא מותקן
+    הציר הזה נשמט וכל הכתיבות נעשות בכותב של Polars.
+
+    Returns:
+        List[Dict]: רשימת הגדרות
+    """
+    codec_levels = codec_levels or DEFAULT_CODEC_LEVELS
+    if importlib.util.find_spec('pyarrow') is None:
+        print("⚠️  pyarrow לא מותקן - קידוד dictionary לא נבדק")
+        dictionary = (None,)
+
+    codecs = [(codec, level) for codec, levels in codec_levels.items() for level in levels]
+    return [
+        {'codec': codec, 'level': level, 'row_group_size': rgs,
+         'statistics': stats, 'dictionary': dict_enc}
+        for (codec, level), rgs, stats, dict_enc
+        in itertools.product(codecs, row_group_sizes, statistics, dictionary)
+    ]
+
+
+def _write_parquet(df: pl.DataFrame, path: str, config: Dict[str, Any]) -> None:
+    """כתיבת Parquet לפי הגדרה אחת מהרשת"""
+    options = {
+        'compression': config['codec'],
+        'compression_level': config['level'],
+        'statistics': config['statistics'],
+        'row_group_size': config['row_group_size'],
+    }
+    if config['dictionary'] is not None:
+        options['use_pyarrow'] = True
+        options['pyarrow_options'] = {'use_dictionary': config['dictionary']}
+    df.write_parquet(path, **options)
+
+
+def benchmark_parquet_writes(df: pl.DataFrame,
+                             projected_columns: List[str],
+                             predicate: pl.Expr,
+                             grid: Optional[List[Dict[str, Any]]] = None,
+                             repeats: int = 3,
+                             rank_by: str = 'filtered_scan_s') -> pl.DataFrame:
+    """
+    מדידת כל הגדרת כתיבה: גודל, זמן כתיבה וזמני קריאה
+
+    לכל הגדרה נמדדים:
+    - write_s: זמן כתיבה
+    - size_mb: גודל הקובץ
+    - full_read_s: קריאת כל הקובץ
+    - projected_read_s: קריאת העמודות ב-projected_columns בלבד
+    - filtered_scan_s: scan_parquet עם predicate (נהנה מסטטיסטיקות ו-row groups)
+
+    Args:
+        df: הנתונים לכתיבה
+        projected_columns: עמודות לבדיקת קריאה חלקית
+        predicate: תנאי לבדיקת סריקה מסוננת
+        grid: רשימת הגדרות (ברירת מחדל: parquet_write_grid())
+        repeats: מספר חזרות לכל מדידה
+        rank_by: העמודה שלפיה מדורגות התוצאות
+
+    Returns:
+        pl.DataFrame: שורה לכל הגדרה, ממוינת לפי rank_by
+    """
+    grid = grid if grid is not None else parquet_write_grid()
+    rows = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for i, config in enumerate(grid):
+            path = os.path.join(tmp, f'config_{i}.parquet')
+            write_s = _best_time(lambda: _write_parquet(df, path, config), repeats)
+            rows.append({
+                **config,
+                'write_s': write_s,
+                'size_mb': os.path.getsize(path) / (1024 * 1024),
+                'full_read_s': _best_time(lambda: pl.read_parquet(path), repeats),
+                'projected_read_s': _best_time(
+                    lambda: pl.read_parquet(path, columns=projected_columns), repeats),
+                'filtered_scan_s': _best_time(
+                    lambda: pl.scan_parquet(path).filter(predicate).collect(), repeats),
+            })
+
+    return (
+        pl.DataFrame(rows, schema_overrides={'level': pl.Int64, 'dictionary': pl.Boolean})
+        .sort(rank_by)
+        .with_row_index('rank', offset=1)
+    )
+
+
+def demo_parquet_tuning(source: str = '../data/contoso_sales.csv'):
+    """הדגמת כוונון כתיבת Parquet"""
+    print_section("🗜️  2. כוונון כתיבת Parquet")
+
+    df_to_save = pl.read_csv(source, try_parse_dates=True)
+    report = benchmark_parquet_writes(
+        df_to_save,
+        projected_columns=['Brand', 'Net Price'],
+        predicate=pl.col('Brand') == 'Contoso',
+        grid=parquet_write_grid(row_group_sizes=(4_096, 65_536)),
+        repeats=2,
+    )
+
+    print(f"🔹 נבדקו {report.height} הגדרות")
+    print("\n🏆 10 ההגדרות המהירות ביותר לסריקה מסוננת:")
+    with pl.Config(tbl_rows=10, tbl_cols=-1, float_precision=4):
+        print(report.head(10).select(
+            'rank', 'codec', 'level', 'row_group_size', 'statistics', 'dictionary',
+            'size_mb', 'write_s', 'filtered_scan_s',
+        ))
+
+    print("\n🔹 ההגדרה הטובה ביותר לכל מדד:")
+    for metric in ('size_mb', 'write_s', 'full_read_s', 'projected_read_s', 'filtered_scan_s'):
+        best = report.sort(metric).row(0, named=True)
+        print(f"   • {metric:<18} {best['codec']}"
+              f"{'' if best['level'] is None else '(' + str(best['level']) + ')'}"
+              f", row_group={best['row_group_size']}, statistics={best['statistics']}"
+              f", dictionary={best['dictionary']}")
+
+
+# =============================================================================
+# חלק 3: קטלוג מחיצות (Partition Catalog)
+# =============================================================================
+
+# תנאי סינון בסגנון pyarrow: (עמודה, אופרטור, ערך), למשל ('Industry', '=', 'Fintech')
+Filter = Tuple[str, str, Any]
+
+_FILTER_OPS = {
+    '=': operator.eq, '==': operator.eq, '!=': operator.ne,
+    '<': operator.lt, '<=': operator.le, '>': operator.gt, '>=': operator.ge,
+}
+
+# ערך מחיצה null בנתיב (כמו ב-Hive וב-Polars)
+_HIVE_NULL = '__HIVE_DEFAULT_PARTITION__'
+
+# המרות מחרוזת -> טיפוס, לפי סדר ההסקה (ערך שלא מתאים הופך ל-null)
+_PARTITION_PARSERS = {
+    pl.Int64: lambda s: s.cast(pl.Int64, strict=False),
+    pl.Float64: lambda s: s.cast(pl.Float64, strict=False),
+    pl.Date: lambda s: s.str.to_date(strict=False),
+    pl.Datetime: lambda s: s.str.to_datetime(strict=False),
+}
+
+
+def _partition_dtype(raw_values: Iterable[str]) -> pl.DataType:
+    """
+    טיפוס עמודת מחיצה מכל הערכים שלה בנתיבים - כמו ההסקה של
+    scan_parquet(hive_partitioning=True): Boolean, Int64, Float64, Date,
+    Datetime, ואחרת String
+    """
+    values = pl.Series([v for v in raw_values if v != _HIVE_NULL], dtype=pl.String)
+    if values.len() == 0:
+        return pl.String
+    if values.str.to_lowercase().is_in(['true', 'false']).all():
+        return pl.Boolean
+    for dtype, parse in _PARTITION_PARSERS.items():
+        try:
+            if parse(values).null_count() == 0:
+                return dtype
+        except pl.exceptions.ComputeError:
+            pass  # אין פורמט תאריך שמתאים לערכים
+    return pl.String
+
+
+def _partition_value(raw: str, dtype: pl.DataType) -> Any:
+    """ערך מחיצה מהנתיב כערך Python מהטיפוס שהוסק"""
+    if raw == _HIVE_NULL:
+        return None
+    if dtype == pl.Boolean:
+        return raw.lower() == 'true'
+    if dtype == pl.String:
+        return raw
+    return _PARTITION_PARSERS[dtype](pl.Series([raw], dtype=pl.String)).item()
+
+
+class PartitionCatalog:
+    """
+    קטלוג של dataset מחולק בסגנון Hive (תיקיות Key=Value)
+
+    הקטלוג נשמר בקובץ JSON ליד תיקיית הנתונים (<root>.catalog.json - לא בתוכה,
+    כדי ש-scan_parquet על התיקייה ימשיך לעבוד). לכל קובץ נשמרים ערכי המחיצה,
+    הסכמה, מספר השורות, ו-min/max/null_count לכל עמודה מספרית או טקסטואלית.
+
+    בזמן סריקה התנאים נבדקים מול הקטלוג בלבד, כך שמחיצות וקבצים שלא יכולים
+    להכיל שורות מתאימות נפסלים בלי לרשום תיקיות ובלי לפתוח footers.
+
+    עמודות המחיצה מקבלות טיפוס כמו ב-scan_parquet(hive_partitioning=True)
+    (Int64, Float64, Boolean, Date...), כך שתנאי כמו ('year', '>=', 2020)
+    עובד גם בדילוג וגם בסינון.
+
+    Args:
+        root: תיקיית ה-dataset
+    """
+
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+        self.path = self.root.parent / f'{self.root.name}.catalog.json'
+        self.files: List[Dict[str, Any]] = []
+        if self.path.exists():
+            with open(self.path, encoding='utf-8') as f:
+                self.files = json.load(f)['files']
+
+    # -------------------------------------------------------------------------
+    # בנייה ועדכון
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def _file_entry(relative: str, partition: Dict[str, str], df: pl.DataFrame) -> Dict[str, Any]:
+        """רשומת קטלוג לקובץ אחד: מחיצה, מספר שורות וסטטיסטיקות"""
+        columns = [
+            c for c, t in df.schema.items()
+            if c not in partition and (t.is_numeric() or t == pl.String)
+        ]
+        stats = df.select(
+            expr for c in columns for expr in (
+                pl.col(c).min().alias(f'{c}__min'),
+                pl.col(c).max().alias(f'{c}__max'),
+                pl.col(c).null_count().alias(f'{c}__nulls'),
+            )
+        ).row(0, named=True) if columns else {}
+        return {
+            'path': relative,
+            'partition': partition,
+            'schema': _encode_schema(df.schema),
+            'rows': df.height,
+            'stats': {
+                c: {'min': stats[f'{c}__min'], 'max': stats[f'{c}__max'],
+                    'null_count': stats[f'{c}__nulls']}
+                for c in columns
+            },
+        }
+
+    @staticmethod
+    def _partition_of(relative: Path) -> Dict[str, str]:
+        """ערכי המחיצה מתוך הנתיב (Key=Value/...)"""
+        return dict(
+            unquote(part).split('=', 1) for part in relative.parent.parts if '=' in part
+        )
+
+    def build(self) -> 'PartitionCatalog':
+        """בנייה מלאה של הקטלוג - סריקה אחת של כל הקבצים"""
+        self.files = []
+        for path in sorted(self.root.rglob('*.parquet')):
+            relative = path.relative_to(self.root)
+            partition = self._partition_of(relative)
+            df = pl.read_parquet(path, hive_partitioning=False)
+            self.files.append(self._file_entry(relative.as_posix(), partition, df))
+        self.save()
+        return self
+
+    def save(self) -> None:
+        """שמירה אטומית של הקטלוג"""
+        tmp = self.path.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'files': self.files}, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, self.path)
+
+    def write_partitioned(self, df: pl.DataFrame, partition_by: List[str]) -> None:
+        """
+        כתיבת נתונים חדשים ל-dataset ועדכון הקטלוג באותה פעולה
+
+        כל מחיצה נכתבת כקובץ חדש בתיקייה Key=Value שלה (append).
+
+        Args:
+            df: הנתונים לכתיבה
+            partition_by: עמודות החלוקה
+        """
+        for keys, part in df.group_by(partition_by, maintain_order=True):
+            partition = {
+                k: _HIVE_NULL if v is None else str(v).lower() if isinstance(v, bool) else str(v)
+                for k, v in zip(partition_by, keys)
+            }
+            directory = Path(*(f'{k}={quote(v, safe="")}' for k, v in partition.items()))
+            relative = directory / f'{uuid.uuid4().hex}.parquet'
+            (self.root / directory).mkdir(parents=True, exist_ok=True)
+            data = part.drop(partition_by)
+            data.write_parquet(self.root / relative)
+            self.files.append(self._file_entry(relative.as_posix(), partition, data))
+        self.save()
+
+    # -------------------------------------------------------------------------
+    # דילוג על מחיצות וסריקה
+    # -------------------------------------------------------------------------
+
+    def partition_schema(self) -> Dict[str, pl.DataType]:
+        """
+        טיפוס כל עמודת מחיצה, מכל הערכים שלה בקטלוג (כמו ההסקה של Hive)
+        """
+        raw: Dict[str, List[str]] = {}
+        for entry in self.files:
+            for key, value in entry['partition'].items():
+                raw.setdefault(key, []).append(value)
+        return {key: _partition_dtype(values) for key, values in raw.items()}
+
+    @staticmethod
+    def _typed_partition(entry: Dict[str, Any],
+                         schema: Dict[str, pl.DataType]) -> Dict[str, Any]:
+        """ערכי המחיצה של קובץ כערכים מהטיפוס של כל עמודה"""
+        return {k: _partition_value(v, schema[k]) for k, v in entry['partition'].items()}
+
+    @staticmethod
+    def _may_match(entry: Dict[str, Any], flt: Filter,
+                   partition: Dict[str, Any]) -> bool:
+        """
+        האם קובץ יכול להכיל שורות שמקיימות את התנאי (לפי הקטלוג בלבד)
+
+        partition: ערכי המחיצה של הקובץ, כבר מהטיפוס הנכון (_typed_partition)
+        """
+        column, op, value = flt
+        values = value if op == 'in' else [value]
+
+        if column in partition:
+            actual = partition[column]
+            if actual is None:
+                return False  # מחיצת null - אף השוואה לא מתקיימת
+            try:
+                if op == 'in':
+                    return actual in values
+                return _FILTER_OPS[op](actual, value)
+            except TypeError:
+                return True  # טיפוסים לא ברי השוואה - הסינון ב-Polars יכריע
+
+        stats = entry['stats'].get(column)
+        if stats is None:
+            return True  # אין סטטיסטיקות - אי אפשר לפסול
+        low, high = stats['min'], stats['max']
+        if low is None:
+            return False  # כל הערכים null - אף השוואה לא מתקיימת
+
+        if op in ('=', '==', 'in'):
+            return any(low <= v <= high for v in values)
+        if op == '!=':
+            return not (low == high == value)
+        if op == '<':
+            return low < value
+        if op == '<=':
+            return low <= value
+        if op == '>':
+            return high > value
+        if op == '>=':
+            return high >= value
+        raise ValueError(f"אופרטור לא נתמך: {op}")
+
+    def prune(self, filters: Iterable[Filter]) -> List[Dict[str, Any]]:
+        """
+        הקבצים שעשויים להכיל שורות מתאימות (AND בין התנאים)
+
+        Args:
+            filters: רשימת תנאים (עמודה, אופרטור, ערך)
+
+        Returns:
+            List[Dict]: רשומות הקטלוג של הקבצים שנשארו
+        """
+        filters = list(filters)
+        schema = self.partition_schema()
+        kept = []
+        for entry in self.files:
+            partition = self._typed_partition(entry, schema)
+            if all(self._may_match(entry, f, partition) for f in filters):
+                kept.append(entry)
+        return kept
+
+    def scan(self, filters: Iterable[Filter] = ()) -> pl.LazyFrame:
+        """
+        סריקה של הקבצים הרלוונטיים בלבד, עם עמודות המחיצה ועם התנאים
+
+        Args:
+            filters: רשימת תנאים (עמודה, אופרטור, ערך)
+
+        Returns:
+            pl.LazyFrame: הנתונים המסוננים
+        """
+        filters = list(filters)
+        kept = self.prune(filters)
+        if not kept:
+            # אף קובץ לא מתאים: אותן עמודות (כולל המחיצה), אפס שורות
+            return self.empty()
+
+        schema = self.partition_schema()
+        lf = pl.concat([self._scan_entry(entry, schema) for entry in kept],
+                       how='diagonal_relaxed')
+        for column, op, value in filters:
+            if op == 'in':
+                lf = lf.filter(pl.col(column).is_in(value))
+            else:
+                lf = lf.filter(_FILTER_OPS[op](pl.col(column), value))
+        return lf
+
+    def _scan_entry(self, entry: Dict[str, Any], schema: Dict[str, pl.DataType],
+                    empty: bool = False) -> pl.LazyFrame:
+        """
+        קובץ אחד עם עמודות המחיצה שלו, מהטיפוס שב-schema (partition_schema)
+
+        עם empty=True - מסגרת ריקה לפי הסכמה שבקטלוג, בלי לפתוח את הקובץ
+        (קטלוגים ישנים בלי סכמה: הסכמה נקראת מה-footer)
+        """
+        if empty and 'schema' in entry:
+            lf = pl.LazyFrame(schema=_decode_schema(entry['schema']))
+        else:
+            lf = pl.scan_parquet(self.root / entry['path'], hive_partitioning=False)
+            lf = lf.head(0) if empty else lf
+        return lf.with_columns(
+            pl.lit(v, dtype=schema[k]).alias(k)
+            for k, v in self._typed_partition(entry, schema).items()
+        )
+
+    def empty(self) -> pl.LazyFrame:
+        """
+        מסגרת ריקה עם הסכמה המלאה של ה-dataset - כל העמודות של כל הקבצים
+        ועמודות המחיצה, בדיוק כמו בתוצאה של scan (קטלוג ריק: בלי עמודות)
+        """
+        if not self.files:
+            return pl.LazyFrame()
+        partition_schema = self.partition_schema()
+        schema = pl.concat(
+            [self._scan_entry(entry, partition_schema, empty=True) for entry in self.files],
+            how='diagonal_relaxed',
+        ).collect_schema()
+        return pl.LazyFrame(schema=schema)
+
+
+def demo_partition_catalog(source: str = '../data/venture_funding_deals_partitioned'):
+    """הדגמת קטלוג מחיצות על venture_funding_deals_partitioned"""
+    print_section("🗂️  3. קטלוג מחיצות (Partition Catalog)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / 'venture_funding_deals_partitioned'
+        shutil.copytree(source, root)
+
+        catalog = PartitionCatalog(root).build()
+        print(f"🔹 הקטלוג נבנה: {len(catalog.files)} קבצים, "
+              f"{sum(e['rows'] for e in catalog.files)} שורות")
+        print(f"   נשמר ב: {catalog.path.name}")
+
+        filters = [('Industry', 'in', ['Fintech', 'Artificial intelligence'])]
+        kept = catalog.prune(filters)
+        print(f"\n🔹 תנאי: {filters}")
+        print(f"   נשארו {len(kept)} מתוך {len(catalog.files)} קבצים - בלי לגעת בדיסק")
+
+        result = catalog.scan(filters).select(['Company', 'Amount', 'Industry']).collect()
+        print(f"\n✅ נטענו {result.height} שורות:")
+        print(result.head())
+
+        # כתיבה חדשה מעדכנת את הקטלוג
+        new_deals = result.head(2).with_columns(
+            pl.lit('Robotics').alias('Industry'),
+            pl.lit('2024').alias('Date reported'),
+            pl.lit(None, dtype=pl.String).alias('Valuation'),
+            pl.lit(None, dtype=pl.String).alias('Lead investors'),
+        )
+        catalog.write_partitioned(new_deals, ['Industry'])
+        reloaded = PartitionCatalog(root)
+        robotics = reloaded.scan([('Industry', '=', 'Robotics')]).collect()
+        print(f"\n🔹 אחרי כתיבה: {len(reloaded.files)} קבצים בקטלוג, "
+              f"{robotics.height} שורות Robotics")
+
+
+# =============================================================================
+# חלק 4: כתיבה מאוגדת ל-Delta Lake
+# =============================================================================
+
+class BufferedDeltaWriter:
+    """
+    כותב Delta שמאגד הוספות קטנות לפני הכתיבה
+
+    כל write_delta(mode='append') יוצר קובץ Parquet חדש, ואלפי הוספות של
+    שורה אחת מייצרות אלפי קבצים זעירים שמאטים כל scan_delta. הכותב:
+    - שומר הוספות בזיכרון, וגם ביומן מקומי (WAL) של קבצי IPC כדי לא לאבד
+      נתונים אם התהליך נופל - ביצירה מחדש היומן נטען שוב
+    - כותב (flush) כשהמאגר עובר max_rows או כשעברו max_delay_s שניות -
+      תהליכון רקע כותב בזמן גם כשלא מגיעות הוספות חדשות
+    - אחרי כל compact_every כתיבות מריץ ברקע דחיסה (optimize.compact)
+      לקבצים בגודל target_file_size וניקוי גרסאות ישנות (vacuum)
+
+    כתיבות ודחיסה לא רצות במקביל על הטבלה (נעילה משותפת). שגיאה בתהליכון
+    רקע נשמרת ונזרקת בקריאה הבאה ל-append / flush / close.
+
+    Args:
+        table_uri: נתיב טבלת ה-Delta
+        max_rows: מספר שורות במאגר שמפעיל כתיבה
+        max_delay_s: זמן מקסימלי (שניות) שהוספה ממתינה במאגר
+        wal_dir: תיקיית היומן (None = בלי יומן)
+        compact_every: מספר כתיבות בין דחיסות (0 = בלי דחיסה אוטומטית)
+        target_file_size: גודל היעד של קובץ אחרי דחיסה (בבתים)
+        retention_hours: כמה שעות לשמור קבצים של גרסאות ישנות
+    """
+
+    def __init__(self, table_uri: Union[str, Path],
+                 max_rows: int = 10_000,
+                 max_delay_s: float = 5.0,
+                 wal_dir: Optional[Union[str, Path]] = None,
+                 compact_every: int = 10,
+                 target_file_size: int = 128 * 1024 ** 2,
+                 retention_hours: int = 168):
+        self.table_uri = str(table_uri)
+        self.max_rows = max_rows
+        self.max_delay_s = max_delay_s
+        self.compact_every = compact_every
+        self.target_file_size = target_file_size
+        self.retention_hours = retention_hours
+
+        self._buffer: List[pl.DataFrame] = []
+        self._buffered_rows = 0
+        self._first_append: Optional[float] = None
+        self.flushes = 0
+        self._lock = threading.Lock()           # המאגר
+        self._changed = threading.Condition(self._lock)
+        self._commit_lock = threading.Lock()    # כתיבה/דחיסה של הטבלה
+        self._compaction: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+        self._closed = False
+
+        self.wal_dir = Path(wal_dir) if wal_dir is not None else None
+        if self.wal_dir is not None:
+            self.wal_dir.mkdir(parents=True, exist_ok=True)
+            self._replay_wal()
+
+        self._flusher: Optional[threading.Thread] = None
+        self._start_flusher()
+
+    def __enter__(self) -> 'BufferedDeltaWriter':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # -------------------------------------------------------------------------
+    # מאגר ויומן
+    # -------------------------------------------------------------------------
+
+    def _wal_files(self) -> List[Path]:
+        """קבצי היומן לפי סדר הכתיבה"""
+        return sorted(self.wal_dir.glob('*.arrow')) if self.wal_dir is not None else []
+
+    def _replay_wal(self) -> None:
+        """טעינת הוספות שנשארו ביומן מריצה קודמת שלא הספיקה לכתוב"""
+        for path in self._wal_files():
+            df = pl.read_ipc(path)
+            self._buffer.append(df)
+            self._buffered_rows += df.height
+        if self._buffer:
+            self._first_append = time.monotonic()
+
+    # -------------------------------------------------------------------------
+    # תהליכוני רקע
+    # -------------------------------------------------------------------------
+
+    def _start_flusher(self) -> None:
+        """הפעלת תהליכון הכתיבה לפי max_delay_s (אם הוא לא רץ)"""
+        if self._flusher is None or not self._flusher.is_alive():
+            self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+            self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        """המתנה עד שההוספה הוותיקה במאגר מגיעה ל-max_delay_s, וכתיבה"""
+        while True:
+            with self._changed:
+                while not self._closed:
+                    if self._first_append is None:
+                        self._changed.wait()
+                        continue
+                    remaining = self._first_append + self.max_delay_s - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._changed.wait(remaining)
+                if self._closed:
+                    return
+            try:
+                self.flush(raise_pending=False)
+            except Exception as exc:
+                self._error = exc
+                return  # מופעל מחדש אחרי שהשגיאה נזרקת למשתמש
+
+    def _raise_pending(self) -> None:
+        """זריקת שגיאה שנשמרה בתהליכון רקע (פעם אחת)"""
+        error, self._error = self._error, None
+        if error is not None:
+            if not self._closed:
+                self._start_flusher()
+            raise error
+
+    def append(self, df: pl.DataFrame) -> None:
+        """
+        הוספת שורות לטבלה (דרך המאגר)
+
+        Args:
+            df: השורות להוספה - באותה סכמה כמו הטבלה
+
+        Raises:
+            Exception: שגיאה מכתיבה או דחיסה שרצו ברקע
+        """
+        self._raise_pending()
+        with self._lock:
+            if self.wal_dir is not None:
+                name = f'{time.time_ns():020d}-{uuid.uuid4().hex[:8]}.arrow'
+                df.write_ipc(self.wal_dir / name)
+            self._buffer.append(df)
+            self._buffered_rows += df.height
+            if self._first_append is None:
+                self._first_append = time.monotonic()
+                self._changed.notify()
+            due = (self._buffered_rows >= self.max_rows
+                   or time.monotonic() - self._first_append >= self.max_delay_s)
+        if due:
+            self.flush()
+
+    def flush(self, raise_pending: bool = True) -> None:
+        """
+        כתיבת כל המאגר כקומיט אחד לטבלה
+
+        Args:
+            raise_pending: לזרוק קודם שגיאה שנשמרה בתהליכון רקע
+        """
+        if raise_pending:
+            self._raise_pending()
+        with self._lock:
+            if not self._buffer:
+                return
+            wal_files = self._wal_files()
+            with self._commit_lock:
+                pl.concat(self._buffer, how='diagonal_relaxed').write_delta(
+                    self.table_uri, mode='append'
+                )
+            # הנתונים כבר בטבלה - אפשר לנקות את היומן
+            for path in wal_files:
+                path.unlink(missing_ok=True)
+            self._buffer, self._buffered_rows, self._first_append = [], 0, None
+            self.flushes += 1
+            compact_now = self.compact_every and self.flushes % self.compact_every == 0
+
+        if compact_now:
+            self.compact_in_background()
+
+    # -------------------------------------------------------------------------
+    # דחיסה וניקוי
+    # -------------------------------------------------------------------------
+
+    def compact(self) -> Dict[str, Any]:
+        """
+        דחיסת קבצים קטנים לקבצים בגודל היעד וניקוי גרסאות ישנות
+
+        Returns:
+            Dict: מדדי הדחיסה של deltalake ורשימת הקבצים שנמחקו
+        """
+        from deltalake import DeltaTable
+
+        with self._commit_lock:
+            table = DeltaTable(self.table_uri)
+            metrics = table.optimize.compact(target_size=self.target_file_size)
+            removed = table.vacuum(
+                retention_hours=self.retention_hours,
+                dry_run=False,
+                enforce_retention_duration=False,
+            )
+        return {**metrics, 'vacuumed_files': removed}
+
+    def _compact_safely(self) -> None:
+        """compact בתהליכון רקע - שגיאה נשמרת ונזרקת בקריאה הבאה"""
+        try:
+            self.compact()
+        except Exception as exc:
+            self._error = exc
+
+    def compact_in_background(self) -> None:
+        """הרצת compact בתהליכון רקע (אם אחת לא רצה כבר)"""
+        if self._compaction is not None and self._compaction.is_alive():
+            return
+        self._compaction = threading.Thread(target=self._compact_safely, daemon=True)
+        self._compaction.start()
+
+    def close(self) -> None:
+        """
+        עצירת תהליכון הכתיבה, כתיבת מה שנשאר במאגר והמתנה לדחיסה שרצה ברקע
+
+        Raises:
+            Exception: שגיאה מכתיבה או דחיסה שרצו ברקע
+        """
+        with self._changed:
+            self._closed = True
+            self._changed.notify_all()
+        if self._flusher is not None:
+            self._flusher.join()
+        try:
+            self.flush(raise_pending=False)
+        finally:
+            if self._compaction is not None:
+                self._compaction.join()
+        self._raise_pending()
+
+
+def _delta_file_count(table_uri: Union[str, Path]) -> int:
+    """מספר קבצי ה-Parquet הפעילים בגרסה הנוכחית של הטבלה"""
+    from deltalake import DeltaTable
+
+    return len(DeltaTable(str(table_uri)).file_uris())
+
+
+def benchmark_delta_compaction(source: str = '../data/venture_funding_deals_delta',
+                               n_appends: int = 300,
+                               repeats: int = 5) -> pl.DataFrame:
+    """
+    זמן קריאה של טבלת Delta אחרי הוספות של שורה אחת - לפני ואחרי דחיסה
+
+    Args:
+        source: טבלת ה-Delta המקורית (מועתקת לתיקייה זמנית)
+        n_appends: מספר הוספות של שורה אחת
+        repeats: מספר חזרות למדידת זמן
+
+    Returns:
+        pl.DataFrame: שורה לכל שלב - מספר קבצים וזמן קריאה
+    """
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        table = Path(tmp) / 'venture_funding_deals_delta'
+        shutil.copytree(source, table)
+        new_rows = pl.read_delta(str(table))
+
+        def measure(stage: str) -> None:
+            read_s = _best_time(lambda: pl.scan_delta(str(table)).collect(), repeats)
+            filtered_s = _best_time(
+                lambda: pl.scan_delta(str(table))
+                .filter(pl.col('Industry') == 'Fintech').collect(),
+                repeats,
+            )
+            rows.append({'stage': stage, 'files': _delta_file_count(table),
+                         'rows': pl.scan_delta(str(table)).select(pl.len()).collect().item(),
+                         'read_s': read_s, 'filtered_read_s': filtered_s})
+
+        measure('original')
+
+        # הדפוס מהמחברת: write_delta(mode='append') לכל שורה חדשה
+        for i in range(n_appends):
+            new_rows.slice(i % new_rows.height, 1).write_delta(str(table), mode='append')
+        measure(f'{n_appends} appends')
+
+        with BufferedDeltaWriter(table, compact_every=0, retention_hours=0) as writer:
+            writer.compact()
+        measure('compacted + vacuumed')
+
+    return pl.DataFrame(rows)
+
+
+def demo_buffered_delta(source: str = '../data/venture_funding_deals_delta'):
+    """הדגמת כתיבה מאוגדת ודחיסה של טבלת Delta"""
+    print_section("🧱 4. כתיבה מאוגדת ל-Delta Lake")
+
+    if importlib.util.find_spec('deltalake') is None:
+        print("⚠️  deltalake לא מותקן (pip install deltalake) - מדלגים")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        table = Path(tmp) / 'deals_delta'
+        shutil.copytree(source, table)
+        new_rows = pl.read_delta(str(table))
+
+        with BufferedDeltaWriter(table, max_rows=100, wal_dir=Path(tmp) / 'wal',
+                                 compact_every=2, retention_hours=0) as writer:
+            for i in range(250):
+                writer.append(new_rows.slice(i % new_rows.height, 1))
+
+        print(f"🔹 250 הוספות של שורה אחת -> {writer.flushes} קומיטים, "
+              f"{_delta_file_count(table)} קבצים פעילים")
+        print(f"   שורות בטבלה: {pl.scan_delta(str(table)).select(pl.len()).collect().item()}")
+
+    print("\n⏱️  זמן קריאה - הוספות של שורה אחת, לפני ואחרי דחיסה:")
+    report = benchmark_delta_compaction(source)
+    with pl.Config(float_precision=4):
+        print(report)
+
+
+# =============================================================================
+# חלק 5: מאגר סכמות (Schema Registry)
+# =============================================================================
+
+DEFAULT_SCHEMA_REGISTRY = Path(
+    os.environ.get('POLARS_SCHEMA_REGISTRY',
+                   Path.home() / '.cache' / 'polars_tutorials' / 'schema_registry.json')
+)
+
+_SCANNERS = {'ndjson': pl.scan_ndjson, 'csv': pl.scan_csv}
+
+
+class SchemaDriftError(ValueError):
+    """הקובץ כבר לא מתאים לסכמה השמורה"""
+
+    def __init__(self, dataset: str, changes: List[str]):
+        self.dataset = dataset
+        self.changes = changes
+        super().__init__(f"שינוי סכמה ב-{dataset}: " + '; '.join(changes))
+
+
+def _encode_schema(schema: pl.Schema) -> str:
+    """סכמה -> מחרוזת (מסגרת ריקה בפורמט הבינארי של Polars, ב-base64)"""
+    return base64.b64encode(schema.to_frame().serialize()).decode('ascii')
+
+
+def _decode_schema(encoded: str) -> pl.Schema:
+    """מחרוזת -> סכמה"""
+    return pl.DataFrame.deserialize(io.BytesIO(base64.b64decode(encoded))).schema
+
+
+def _dtype_fits(stored: pl.DataType, probed: pl.DataType) -> bool:
+    """האם ערכים שהוסקו כ-probed נכנסים בטיפוס השמור"""
+    return (
+        stored == probed
+        or probed == pl.Null
+        or stored == pl.String
+        or (stored.is_float() and probed.is_integer())
+    )
+
+
+class SchemaRegistry:
+    """
+    מאגר מתמיד של סכמות שהוסקו, לפי שם dataset
+
+    ההרצה הראשונה מסיקה את הסכמה מכל הקובץ (infer_schema_length=None) ושומרת
+    אותה יחד עם טביעת אצבע של הקובץ (גודל, mtime ו-hash של תחילתו). בהרצות
+    הבאות הסכמה השמורה מועברת ל-scan_* כ-schema= ואין מעבר הסקה בכלל.
+
+    כשטביעת האצבע משתנה (קובץ חדש או מעודכן), נבדקים רק ההתחלה והסוף של
+    הקובץ מול הסכמה השמורה. שינויים (עמודות חדשות/חסרות, טיפוס שלא נכנס)
+    מדווחים, ולפי on_drift: 'reinfer' (הסקה מלאה ועדכון), 'raise' או 'ignore'.
+
+    Args:
+        path: קובץ ה-JSON של המאגר
+        probe_bytes: כמה בתים לקרוא מתחילת ומסוף קובץ שהשתנה
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None, probe_bytes: int = 64 * 1024):
+        self.path = Path(path or DEFAULT_SCHEMA_REGISTRY)
+        self.probe_bytes = probe_bytes
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    # -------------------------------------------------------------------------
+    # אחסון
+    # -------------------------------------------------------------------------
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, registry: Dict[str, Any]) -> None:
+        """שמירה אטומית של כל המאגר (קובץ זמני ו-os.replace)"""
+        tmp = self.path.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(registry, f, indent=1)
+        os.replace(tmp, self.path)
+
+    def _store(self, dataset: str, entry: Dict[str, Any]) -> None:
+        """עדכון רשומה ושמירה אטומית"""
+        registry = self._load()
+        registry[dataset] = entry
+        self._save(registry)
+
+    def schema_of(self, dataset: str) -> Optional[pl.Schema]:
+        """הסכמה השמורה של dataset (None אם אין)"""
+        entry = self._load().get(dataset)
+        return _decode_schema(entry['schema']) if entry else None
+
+    def forget(self, dataset: str) -> None:
+        """מחיקת dataset מהמאגר"""
+        registry = self._load()
+        if registry.pop(dataset, None) is not None:
+            self._save(registry)
+
+    # -------------------------------------------------------------------------
+    # טביעות אצבע ובדיקת שינויים
+    # -------------------------------------------------------------------------
+
+    def _fingerprint(self, path: Path) -> Dict[str, Any]:
+        """גודל, mtime ו-hash של תחילת הקובץ"""
+        stat = path.stat()
+        with open(path, 'rb') as f:
+            head = f.read(self.probe_bytes)
+        return {
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'head': hashlib.blake2b(head, digest_size=16).hexdigest(),
+        }
+
+    def _probe_schema(self, path: Path, fmt: str, options: Dict[str, Any]) -> pl.Schema:
+        """הסקת סכמה מתחילת הקובץ ומסופו בלבד"""
+        with open(path, 'rb') as f:
+            head = f.read(self.probe_bytes)
+            f.seek(max(path.stat().st_size - self.probe_bytes, 0))
+            tail = f.read()
+
+        head = head[:head.rfind(b'\n') + 1] or head
+        tail = tail[tail.find(b'\n') + 1:] if len(tail) == self.probe_bytes else tail
+        if fmt == 'csv':
+            tail = head[:head.find(b'\n') + 1] + tail
+
+        schema: Dict[str, pl.DataType] = {}
+        for chunk in (head, tail):
+            if not chunk.strip():
+                continue
+            probed = _SCANNERS[fmt](chunk, infer_schema_length=None, **options).collect_schema()
+            for name, dtype in probed.items():
+                known = schema.get(name)
+                if known is None or _dtype_fits(dtype, known):
+                    schema[name] = dtype
+                elif not _dtype_fits(known, dtype):
+                    schema[name] = pl.String
+        return pl.Schema(schema)
+
+    @staticmethod
+    def diff(stored: pl.Schema, probed: pl.Schema) -> List[str]:
+        """
+        רשימת השינויים בין הסכמה השמורה לסכמה שנבדקה
+
+        Returns:
+            List[str]: תיאור לכל שינוי (ריקה אם אין שינוי)
+        """
+        changes = [f"עמודה חדשה '{c}' ({probed[c]})" for c in probed if c not in stored]
+        changes += [f"עמודה חסרה '{c}'" for c in stored if c not in probed]
+        changes += [
+            f"'{c}': {stored[c]} -> {probed[c]}"
+            for c in stored
+            if c in probed and not _dtype_fits(stored[c], probed[c])
+        ]
+        return changes
+
+    # -------------------------------------------------------------------------
+    # קריאה
+    # -------------------------------------------------------------------------
+
+    def _infer(self, dataset: str, path: Path, fmt: str,
+               options: Dict[str, Any], fingerprint: Dict[str, Any]) -> pl.Schema:
+        """הסקה מלאה (מעבר אחד על כל הקובץ) ושמירה במאגר"""
+        schema = _SCANNERS[fmt](path, infer_schema_length=None, **options).collect_schema()
+        self._store(dataset, {
+            'format': fmt,
+            'options': repr(sorted(options.items())),
+            'fingerprint': fingerprint,
+            'schema': _encode_schema(schema),
+        })
+        return schema
+
+    def resolve(self, source: Union[str, Path], fmt: str = 'ndjson',
+                dataset: Optional[str] = None, on_drift: str = 'reinfer',
+                **options) -> pl.Schema:
+        """
+        הסכמה של קובץ - מהמאגר כשאפשר, אחרת בהסקה מלאה
+
+        Args:
+            source: נתיב לקובץ NDJSON או CSV
+            fmt: 'ndjson' או 'csv'
+            dataset: שם ה-dataset במאגר (ברירת מחדל: שם הקובץ)
+            on_drift: 'reinfer', 'raise' או 'ignore'
+            **options: אפשרויות ל-scan_ndjson / scan_csv
+
+        Returns:
+            pl.Schema: הסכמה
+        """
+        if fmt not in _SCANNERS:
+            raise ValueError(f"פורמט לא נתמך: {fmt}")
+        if on_drift not in ('reinfer', 'raise', 'ignore'):
+            raise ValueError(f"on_drift לא נתמך: {on_drift}")
+
+        path = Path(source)
+        dataset = dataset or path.stem
+        fingerprint = self._fingerprint(path)
+        entry = self._load().get(dataset)
+
+        if entry is None or entry['format'] != fmt or entry['options'] != repr(sorted(options.items())):
+            return self._infer(dataset, path, fmt, options, fingerprint)
+
+        stored = _decode_schema(entry['schema'])
+        if entry['fingerprint'] == fingerprint:
+            return stored
+
+        changes = self.diff(stored, self._probe_schema(path, fmt, options))
+        if changes:
+            print(f"⚠️  שינוי סכמה ב-{dataset}:")
+            for change in changes:
+                print(f"   • {change}")
+            if on_drift == 'raise':
+                raise SchemaDriftError(dataset, changes)
+            if on_drift == 'reinfer':
+                return self._infer(dataset, path, fmt, options, fingerprint)
+
+        self._store(dataset, {**entry, 'fingerprint': fingerprint})
+        return stored
+
+    def scan(self, source: Union[str, Path], fmt: str = 'ndjson',
+             dataset: Optional[str] = None, on_drift: str = 'reinfer',
+             **options) -> pl.LazyFrame:
+        """scan_ndjson / scan_csv עם הסכמה מהמאגר - בלי מעבר הסקה"""
+        schema = self.resolve(source, fmt, dataset, on_drift, **options)
+        return _SCANNERS[fmt](source, schema=schema, **options)
+
+    def read(self, source: Union[str, Path], fmt: str = 'ndjson',
+             dataset: Optional[str] = None, on_drift: str = 'reinfer',
+             **options) -> pl.DataFrame:
+        """
+        read_ndjson / read_csv עם הסכמה מהמאגר
+
+        אם ערך באמצע הקובץ לא מתאים לסכמה השמורה (שינוי שהבדיקה המהירה
+        לא ראתה), הסכמה מוסקת מחדש והקריאה חוזרת.
+        """
+        try:
+            return self.scan(source, fmt, dataset, on_drift, **options).collect()
+        except pl.exceptions.ComputeError as error:
+            dataset = dataset or Path(source).stem
+            if on_drift == 'raise':
+                raise SchemaDriftError(dataset, [str(error).splitlines()[0]]) from error
+            print(f"⚠️  הסכמה השמורה של {dataset} לא מתאימה - הסקה מחדש")
+            self.forget(dataset)
+            return self.scan(source, fmt, dataset, on_drift, **options).collect()
+
+
+def demo_schema_registry(source: str = '../data/world_population.jsonl', scale: int = 500):
+    """הדגמת מאגר סכמות על world_population.jsonl מוגדל"""
+    print_section("🗃️  5. מאגר סכמות (Schema Registry)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        registry = SchemaRegistry(Path(tmp) / 'schema_registry.json')
+        big = Path(tmp) / 'world_population.jsonl'
+        with open(source, 'rb') as f:
+            content = f.read()
+        with open(big, 'wb') as f:
+            for _ in range(scale):
+                f.write(content)
+        print(f"🔹 קובץ NDJSON: {big.stat().st_size / 1024 ** 2:.1f} MB")
+
+        full_inference = _best_time(
+            lambda: pl.read_ndjson(big, infer_schema_length=None), repeats=3
+        )
+        start = time.perf_counter()
+        registry.read(big)
+        first_run = time.perf_counter() - start
+        cached = _best_time(lambda: registry.read(big), repeats=3)
+
+        print(f"   • read_ndjson עם הסקה מלאה:    {full_inference * 1000:>8.1f} ms")
+        print(f"   • מאגר - הרצה ראשונה (הסקה):  {first_run * 1000:>8.1f} ms")
+        print(f"   • מאגר - סכמה שמורה:           {cached * 1000:>8.1f} ms "
+              f"(x{full_inference / cached:.1f})")
+
+        # קובץ שהשתנה: עמודה חדשה ו-place עם ערך עשרוני בסוף הקובץ
+        with open(big, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({'place': 0.5, 'country': 'Atlantis', 'continent': 'Ocean'}) + '\n')
+        print("\n🔹 אחרי הוספת שורה בסכמה אחרת:")
+        try:
+            registry.scan(big, on_drift='raise')
+        except SchemaDriftError as error:
+            print(f"   ❌ SchemaDriftError ({len(error.changes)} שינויים)")
+        df = registry.read(big)
+        print(f"   ✅ הסקה מחדש: place={df.schema['place']}, "
+              f"continent={df.schema['continent']}")
+
+
+# =============================================================================
+# חלק 6: ייצוא Excel במנות
+# =============================================================================
+
+EXCEL_MAX_ROWS = 1_048_576  # מגבלת השורות של גיליון Excel (כולל כותרת)
+
+
+def _prefetch(batches: Iterator[pl.DataFrame]) -> Iterator[pl.DataFrame]:
+    """
+    הכנת המנה הבאה בתהליכון רקע בזמן שהמנה הנוכחית נכתבת
+
+    Polars משחרר את ה-GIL בזמן החישוב, כך שהקריאה והחישוב של המנה הבאה
+    רצים במקביל לכתיבת התאים (שהיא קוד Python של xlsxwriter).
+
+    תהליכון אחד בכוונה: xlsxwriter כותב קובץ אחד מתהליכון אחד ושורה אחרי
+    שורה (constant_memory), ו-collect_batches מחזיר מנות לפי הסדר - אין
+    עוד עבודה שאפשר להכין במקביל בלי להחזיק כמה מנות בזיכרון.
+    """
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        pending = pool.submit(next, batches, None)
+        while True:
+            batch = pending.result()
+            if batch is None:
+                return
+            pending = pool.submit(next, batches, None)
+            yield batch
+
+
+def write_excel_chunked(source: Union[pl.DataFrame, pl.LazyFrame],
+                        path: Union[str, Path],
+                        sheet_name: str = 'Data',
+                        batch_size: int = 50_000,
+                        max_rows: int = EXCEL_MAX_ROWS,
+                        header_format: Optional[Dict[str, Any]] = None,
+                        date_format: str = 'yyyy-mm-dd') -> List[Tuple[str, int]]:
+    """
+    כתיבת DataFrame/LazyFrame לקובץ Excel בזיכרון קבוע
+
+    הנתונים נקראים במנות (LazyFrame - ב-streaming דרך collect_batches) ונכתבים
+    ב-constant_memory של xlsxwriter: כל שורה נכתבת לדיסק מיד. כשגיליון מגיע
+    ל-max_rows שורות נפתח גיליון חדש (Data, Data_2, Data_3...) עם כותרת משלו.
+    הגיליונות נכתבים ברצף (xlsxwriter הוא כותב יחיד); המקבילות היא הכנת
+    המנה הבאה בתהליכון רקע בזמן הכתיבה (_prefetch).
+
+    הערה: עמודות מקוננות (List/Struct) לא נתמכות ב-Excel - יש להמיר אותן קודם.
+
+    Args:
+        source: הנתונים
+        path: נתיב קובץ ה-xlsx
+        sheet_name: שם הגיליון הראשון (הבאים מקבלים סיומת _2, _3...)
+        batch_size: מספר שורות בכל מנה
+        max_rows: מספר שורות מקסימלי בגיליון, כולל שורת הכותרת
+        header_format: עיצוב הכותרת (ברירת מחדל: מודגש)
+        date_format: פורמט תאריכים
+
+    Returns:
+        List[Tuple[str, int]]: (שם גיליון, מספר שורות נתונים) לכל גיליון
+    """
+    import xlsxwriter
+
+    if isinstance(source, pl.LazyFrame):
+        batches = iter(source.collect_batches(chunk_size=batch_size))
+    else:
+        batches = (source.slice(offset, batch_size) for offset in range(0, source.height, batch_size))
+    columns = source.collect_schema().names()
+
+    workbook = xlsxwriter.Workbook(str(path), {
+        'constant_memory': True,
+        'default_date_format': date_format,
+        'remove_timezone': True,
+    })
+    header = workbook.add_format(header_format or {'bold': True})
+    sheets: List[List[Any]] = []
+    worksheet, row = None, max_rows
+
+    def new_sheet():
+        name = sheet_name if not sheets else f'{sheet_name}_{len(sheets) + 1}'
+        sheet = workbook.add_worksheet(name)
+        sheet.write_row(0, 0, columns, header)
+        sheets.append([name, 0])
+        return sheet
+
+    try:
+        for batch in _prefetch(batches):
+            for values in batch.iter_rows():
+                if row == max_rows:
+                    worksheet, row = new_sheet(), 1
+                worksheet.write_row(row, 0, values)
+                sheets[-1][1] += 1
+                row += 1
+        if not sheets:
+            new_sheet()
+    finally:
+        workbook.close()
+
+    return [(name, rows) for name, rows in sheets]
+
+
+def demo_excel_export(source: str = '../data/contoso_sales.csv', copies: int = 2):
+    """הדגמת ייצוא Excel במנות ממקור lazy"""
+    print_section("📗 6. ייצוא Excel במנות")
+
+    if importlib.util.find_spec('xlsxwriter') is None:
+        print("⚠️  xlsxwriter לא מותקן (pip install xlsxwriter) - מדלגים")
+        return
+
+    lf = pl.concat([pl.scan_csv(source, try_parse_dates=True)] * copies)
+    total = lf.select(pl.len()).collect().item()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'contoso_export.xlsx'
+        start = time.perf_counter()
+        # מגבלה קטנה כדי לראות מעבר בין גיליונות גם על נתונים קטנים
+        sheets = write_excel_chunked(lf, path, sheet_name='Sales', batch_size=10_000,
+                                     max_rows=10_001)
+        elapsed = time.perf_counter() - start
+
+        print(f"🔹 נכתבו {total:,} שורות ב-{elapsed:.2f} שניות "
+              f"({path.stat().st_size / 1024 ** 2:.1f} MB)")
+        for name, rows in sheets:
+            print(f"   • {name}: {rows:,} שורות")
+
+        if importlib.util.find_spec('fastexcel') is not None:
+            back = pl.read_excel(path, sheet_id=0)
+            print(f"\n✅ נקראו חזרה {sum(df.height for df in back.values()):,} שורות "
+                  f"מ-{len(back)} גיליונות")
+
+
+# =============================================================================
+# חלק 7: סריקת Avro עצלה
+# =============================================================================
+
+def _read_long(f) -> int:
+    """קריאת long של Avro (varint בקידוד zigzag)"""
+    shift, result = 0, 0
+    while True:
+        byte = f.read(1)
+        if not byte:
+            raise EOFError
+        result |= (byte[0] & 0x7F) << shift
+        if byte[0] < 0x80:
+            return (result >> 1) ^ -(result & 1)
+        shift += 7
+
+
+class AvroFile:
+    """
+    מבנה קובץ Avro (object container): כותרת, סכמה וגבולות הבלוקים
+
+    גבולות הבלוקים נקראים מהמסגור בלבד (מספר רשומות + גודל), בלי לפענח
+    רשומות. הכותרת + רצף בלוקים הם קובץ Avro תקין בפני עצמו, ולכן כל קבוצת
+    בלוקים מפוענחת בנפרד על ידי הקורא של Polars (עם columns=).
+
+    Args:
+        path: נתיב לקובץ Avro
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = str(path)
+        with open(self.path, 'rb') as f:
+            if f.read(4) != b'Obj\x01':
+                raise ValueError(f"{path} אינו קובץ Avro")
+            while True:  # מפת המטא-דאטה של הכותרת
+                count = _read_long(f)
+                if count == 0:
+                    break
+                if count < 0:
+                    _read_long(f)
+                    count = -count
+                for _ in range(2 * count):  # מפתח וערך
+                    f.seek(_read_long(f), os.SEEK_CUR)
+            f.seek(16, os.SEEK_CUR)  # sync marker
+            self.header_size = f.tell()
+
+            self.blocks: List[Tuple[int, int, int]] = []  # (offset, length, records)
+            while True:
+                start = f.tell()
+                try:
+                    records = _read_long(f)
+                except EOFError:
+                    break
+                f.seek(_read_long(f) + 16, os.SEEK_CUR)
+                self.blocks.append((start, f.tell() - start, records))
+
+            f.seek(0)
+            self.header = f.read(self.header_size)
+
+        # כותרת בלי בלוקים = קובץ ריק עם הסכמה המלאה
+        self.schema = pl.read_avro(io.BytesIO(self.header)).schema
+
+    @property
+    def num_rows(self) -> int:
+        return sum(records for _, _, records in self.blocks)
+
+    def read_blocks(self, blocks: List[Tuple[int, int, int]],
+                    columns: Optional[List[str]] = None) -> pl.DataFrame:
+        """פענוח קבוצת בלוקים רצופה - רק העמודות המבוקשות"""
+        if not blocks:
+            return self.schema.to_frame().select(columns or self.schema.names())
+        with open(self.path, 'rb') as f:
+            f.seek(blocks[0][0])
+            body = f.read(blocks[-1][0] + blocks[-1][1] - blocks[0][0])
+        return pl.read_avro(io.BytesIO(self.header + body), columns=columns)
+
+    def block_groups(self, rows_per_group: int) -> List[List[Tuple[int, int, int]]]:
+        """חלוקת הבלוקים לקבוצות רצופות של בערך rows_per_group שורות"""
+        groups, current, rows = [], [], 0
+        for block in self.blocks:
+            current.append(block)
+            rows += block[2]
+            if rows >= rows_per_group:
+                groups.append(current)
+                current, rows = [], 0
+        if current:
+            groups.append(current)
+        return groups
+
+
+class _DecodeTracker:
+    """
+    פענוחים שרצים כרגע עבור מקור Avro אחד
+
+    Polars ממשיך לקרוא מהמקור ברקע גם אחרי שקיבל מספיק שורות (למשל head).
+    אם התהליך מסתיים באמצע פענוח כזה, התהליכון מנסה לחזור ל-Python אחרי
+    סגירת המפרש והתהליך קורס. close() עוצר פענוחים חדשים וממתין לאלה שרצים;
+    scan_avro קושר אותו לחיי המקור (weakref.finalize - כשהמקור נאסף, או
+    ביציאה אם הוא עדיין חי).
+    """
+
+    def __init__(self):
+        self._changed = threading.Condition()
+        self._active = 0
+        self._closed = False
+
+    def begin(self) -> bool:
+        """סימון פענוח שמתחיל (False אם המקור כבר נסגר)"""
+        with self._changed:
+            if self._closed:
+                return False
+            self._active += 1
+            return True
+
+    def end(self) -> None:
+        with self._changed:
+            self._active -= 1
+            self._changed.notify_all()
+
+    def close(self, timeout: float = 30.0) -> None:
+        """לא מתחילים פענוחים חדשים וממתינים לאלה שרצים"""
+        with self._changed:
+            self._closed = True
+            self._changed.wait_for(lambda: self._active == 0, timeout)
+
+
+def _map_ordered(func, items: List[Any], max_workers: int) -> Iterator[Any]:
+    """func על כל פריט במאגר תהליכונים - בסדר המקורי, עם לכל היותר max_workers בהמתנה"""
+    if max_workers <= 1 or len(items) <= 1:
+        yield from map(func, items)
+        return
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        pending = [pool.submit(func, item) for item in items[:max_workers]]
+        for item in items[max_workers:]:
+            yield pending.pop(0).result()
+            pending.append(pool.submit(func, item))
+        for future in pending:
+            yield future.result()
+
+
+def scan_avro(path: Union[str, Path],
+              max_workers: Optional[int] = None,
+              rows_per_task: int = 25_000) -> pl.LazyFrame:
+    """
+    סריקה עצלה של קובץ Avro - כמו scan_parquet
+
+    המקור נרשם כ-IO plugin של Polars, כך שהאופטימייזר מעביר אליו את העמודות
+    הנדרשות (projection pushdown), את תנאי הסינון (predicate pushdown) ואת
+    n_rows. קבוצות בלוקים מפוענחות במקביל, רק עם העמודות הנדרשות, והסינון
+    מתבצע על כל מנה לפני שהיא נמסרת הלאה.
+
+    Args:
+        path: נתיב לקובץ Avro
+        max_workers: מספר תהליכוני פענוח (1 = ללא מקביליות)
+        rows_per_task: מספר שורות (בקירוב) בכל משימת פענוח
+
+    Returns:
+        pl.LazyFrame: הנתונים
+    """
+    from polars.io.plugins import register_io_source
+
+    avro = AvroFile(path)
+    max_workers = max_workers or os.cpu_count() or 1
+    decodes = _DecodeTracker()
+
+    def source(with_columns: Optional[List[str]], predicate: Optional[pl.Expr],
+               n_rows: Optional[int], batch_size: Optional[int]) -> Iterator[pl.DataFrame]:
+        # עמודות שהתנאי צריך נקראות גם אם לא נבחרו, ומוסרות אחרי הסינון
+        columns = with_columns
+        if columns is not None and predicate is not None:
+            needed = set(predicate.meta.root_names()) | set(with_columns)
+            columns = [c for c in avro.schema if c in needed]
+
+        # עם n_rows - מנות קטנות וללא מקביליות, כדי לעצור מוקדם
+        if n_rows is not None:
+            groups, workers = avro.block_groups(batch_size or rows_per_task), 1
+        else:
+            groups, workers = avro.block_groups(rows_per_task), max_workers
+
+        def decode(group):
+            if not decodes.begin():
+                return None
+            try:
+                return avro.read_blocks(group, columns)
+            finally:
+                decodes.end()
+
+        remaining = n_rows
+        for df in _map_ordered(decode, groups, workers):
+            if df is None:
+                return
+            if predicate is not None:
+                df = df.filter(predicate)
+            if with_columns is not None:
+                df = df.select(with_columns)
+            if remaining is not None:
+                df = df.head(remaining)
+                remaining -= df.height
+            yield df
+            if remaining == 0:
+                return
+
+    weakref.finalize(source, decodes.close)
+    return register_io_source(source, schema=avro.schema, explain_name='AVRO',
+                              explain_detail=f'{avro.path} ({len(avro.blocks)} blocks)')
+
+
+def iter_avro_batches(path: Union[str, Path],
+                      columns: Optional[List[str]] = None,
+                      batch_size: int = 50_000) -> Iterator[pl.DataFrame]:
+    """
+    קריאת קובץ Avro במנות (בזיכרון חסום)
+
+    Args:
+        path: נתיב לקובץ Avro
+        columns: עמודות לקריאה (ברירת מחדל: הכל)
+        batch_size: מספר שורות (בקירוב - לפי גבולות הבלוקים) בכל מנה
+
+    Yields:
+        pl.DataFrame: מנה
+    """
+    avro = AvroFile(path)
+    for group in avro.block_groups(batch_size):
+        yield avro.read_blocks(group, columns)
+
+
+def make_wide_avro(source: str, path: Path, n_rows: int = 100_000,
+                   n_extra: int = 97, block_bytes: int = 1024 ** 2) -> Path:
+    """
+    קובץ Avro רחב לבדיקה: שדות world_population + n_extra שדות מספריים
+
+    נכתב עם fastavro, כי הכותב של Polars כותב את כל הקובץ כבלוק אחד.
+
+    Args:
+        source: world_population.avro המקורי
+        path: נתיב הפלט
+        n_rows: מספר שורות
+        n_extra: מספר שדות נוספים
+        block_bytes: גודל בלוק (בקירוב, בבתים)
+
+    Returns:
+        Path: נתיב הקובץ
+    """
+    import fastavro
+
+    base = pl.read_avro(source)
+    df = base.sample(n_rows, with_replacement=True, seed=42).with_columns(
+        (pl.int_range(pl.len()) * (i + 1) % 1000).alias(f'metric_{i:03d}') for i in range(n_extra)
+    )
+    schema = {
+        'type': 'record', 'name': 'population',
+        'fields': [{'name': 'country', 'type': ['null', 'string']},
+                   {'name': 'pop2023', 'type': ['null', 'long']},
+                   {'name': 'density', 'type': ['null', 'double']}]
+                  + [{'name': f'metric_{i:03d}', 'type': 'long'} for i in range(n_extra)],
+    }
+    with open(path, 'wb') as f:
+        fastavro.writer(f, fastavro.parse_schema(schema), df.iter_rows(named=True),
+                        sync_interval=block_bytes)
+    return path
+
+
+def benchmark_avro(path: Path, columns: List[str], predicate: pl.Expr,
+                   repeats: int = 3) -> pl.DataFrame:
+    """
+    השוואת scan_avro לקורא ה-eager של Polars
+
+    Returns:
+        pl.DataFrame: שורה לכל שיטה - זמן ומספר שורות בתוצאה
+    """
+    methods = {
+        'read_avro + select': lambda: pl.read_avro(path).select(columns).filter(predicate),
+        'read_avro(columns=)': lambda: pl.read_avro(path, columns=columns).filter(predicate),
+        'scan_avro (serial)': lambda: scan_avro(path, max_workers=1)
+        .select(columns).filter(predicate).collect(),
+        'scan_avro (parallel)': lambda: scan_avro(path)
+        .select(columns).filter(predicate).collect(),
+        'scan_avro + head(100)': lambda: scan_avro(path)
+        .select(columns).filter(predicate).head(100).collect(),
+    }
+    rows = []
+    for name, run in methods.items():
+        rows.append({'method': name, 'rows': run().height, 'time_s': _best_time(run, repeats)})
+    return pl.DataFrame(rows).sort('time_s')
+
+
+def demo_avro_scan(source: str = '../data/world_population.avro'):
+    """הדגמת סריקת Avro עצלה"""
+    print_section("🪶 7. סריקת Avro עצלה")
+
+    lf = scan_avro(source)
+    result = (
+        lf.filter(pl.col('density') > 1000)
+        .select(['country', 'density'])
+        .sort('density', descending=True)
+        .collect()
+    )
+    print(f"🔹 scan_avro + filter + select: {result.height} מדינות בצפיפות > 1000")
+    print(result.head())
+    print("\n🔹 תוכנית השאילתה (הסינון והעמודות נדחפים לסריקה):")
+    print(lf.filter(pl.col('density') > 1000).select(['country', 'density']).explain())
+
+    if importlib.util.find_spec('fastavro') is None:
+        print("\n⚠️  fastavro לא מותקן (pip install fastavro) - מדלגים על המדידה")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        wide = make_wide_avro(source, Path(tmp) / 'wide.avro')
+        avro = AvroFile(wide)
+        print(f"\n🔹 קובץ רחב: {avro.num_rows:,} שורות, {len(avro.schema)} שדות, "
+              f"{len(avro.blocks)} בלוקים ({wide.stat().st_size / 1024 ** 2:.1f} MB)")
+
+        batches = sum(1 for _ in iter_avro_batches(wide, ['country'], batch_size=25_000))
+        print(f"   iter_avro_batches: {batches} מנות")
+
+        print("\n⏱️  3 מתוך 100 שדות, עם סינון:")
+        report = benchmark_avro(wide, ['country', 'pop2023', 'density'],
+                                pl.col('pop2023') > 10_000_000)
+        with pl.Config(float_precision=4):
+            print(report)
+
+
+# =============================================================================
+# חלק 8: מאגר IPC משותף בין תהליכים
+# =============================================================================
+
+def _memory_mb() -> Dict[str, float]:
+    """
+    זיכרון התהליך (לינוקס, מתוך /proc/self/smaps_rollup), ב-MB
+
+    Pss מחלק כל דף משותף בין התהליכים שמשתמשים בו, כך שסכום ה-Pss של כל
+    התהליכים הוא הזיכרון הפיזי שהם תופסים יחד. Pss_Anon הוא זיכרון פרטי
+    (heap), Pss_File הוא דפי קבצים (כולל memory-map).
+    """
+    fields = {'Rss', 'Pss', 'Pss_Anon', 'Pss_File'}
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            return {
+                key: int(value.split()[0]) / 1024
+                for key, value in (line.split(':', 1) for line in f)
+                if key in fields
+            }
+    except OSError:
+        return {}
+
+
+def _shared_store_worker(method: str, source: str, store_dir: str,
+                         read_options: Dict[str, Any], barrier, queue) -> None:
+    """תהליך עבודה: טעינה, מעבר על כל הנתונים, ודיווח זיכרון כשכולם טעונים"""
+    start = time.perf_counter()
+    if method == 'parse':
+        frame = read_source(Path(source), **read_options)
+        df = frame.collect() if isinstance(frame, pl.LazyFrame) else frame
+    else:
+        df = DatasetStore(store_dir).load(source, **read_options)
+    load_s = time.perf_counter() - start
+
+    df.hash_rows()  # עבודה שנוגעת בכל הערכים, כמו עיבוד אמיתי
+    barrier.wait()
+    queue.put({'load_s': load_s, **_memory_mb()})
+    barrier.wait()  # לא יוצאים לפני שכולם מדדו
+
+
+def benchmark_shared_store(source: str,
+                           store_dir: Union[str, Path],
+                           process_counts: Iterable[int] = (1, 4, 16),
+                           **read_options) -> pl.DataFrame:
+    """
+    זיכרון וזמן טעינה: פענוח המקור בכל תהליך מול טעינה מהמאגר
+
+    Args:
+        source: dataset המקור
+        store_dir: תיקיית המאגר
+        process_counts: מספרי התהליכים לבדיקה
+        **read_options: אפשרויות קריאה
+
+    Returns:
+        pl.DataFrame: שורה לכל שיטה ומספר תהליכים
+    """
+    ctx = multiprocessing.get_context('spawn')
+    rows = []
+    for method, n in itertools.product(('parse', 'store'), process_counts):
+        barrier, queue = ctx.Barrier(n), ctx.Queue()
+        procs = [
+            ctx.Process(target=_shared_store_worker,
+                        args=(method, source, str(store_dir), read_options, barrier, queue))
+            for _ in range(n)
+        ]
+        for proc in procs:
+            proc.start()
+        results = [queue.get() for _ in range(n)]
+        for proc in procs:
+            proc.join()
+
+        rows.append({
+            'method': method,
+            'processes': n,
+            'mean_load_s': sum(r['load_s'] for r in results) / n,
+            'total_pss_mb': sum(r.get('Pss', 0) for r in results),
+            'private_mb': sum(r.get('Pss_Anon', 0) for r in results),
+            'shared_file_mb': sum(r.get('Pss_File', 0) for r in results),
+        })
+    return pl.DataFrame(rows)
+
+
+def demo_shared_store(source: str = '../data/contoso_sales.csv', copies: int = 40,
+                      process_counts: Iterable[int] = (1, 4, 16)):
+    """הדגמת מאגר IPC משותף ומדידת זיכרון עם כמה תהליכים"""
+    print_section("🧠 8. מאגר IPC משותף (memory-map)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # גרסה מוגדלת של המקור, כדי שההבדל בזיכרון יהיה ברור
+        big = Path(tmp) / 'contoso_sales_big.csv'
+        pl.concat([pl.read_csv(source)] * copies).write_csv(big)
+        store = DatasetStore(Path(tmp) / 'store')
+
+        start = time.perf_counter()
+        ipc_path = store.path_for(big, try_parse_dates=True)
+        print(f"🔹 המרה חד-פעמית ל-IPC: {time.perf_counter() - start:.2f} שניות "
+              f"({big.stat().st_size / 1024 ** 2:.0f} MB CSV -> "
+              f"{ipc_path.stat().st_size / 1024 ** 2:.0f} MB IPC)")
+
+        parse_s = _best_time(lambda: pl.read_csv(big, try_parse_dates=True), repeats=2)
+        load_s = _best_time(lambda: store.load(big, try_parse_dates=True), repeats=2)
+        print(f"   • read_csv:      {parse_s * 1000:>8.1f} ms")
+        print(f"   • store.load:    {load_s * 1000:>8.1f} ms")
+
+        if not _memory_mb():
+            print("\n⚠️  /proc/self/smaps_rollup לא זמין - מדלגים על מדידת הזיכרון")
+            return
+
+        print(f"\n⏱️  {' / '.join(map(str, process_counts))} תהליכים על אותם נתונים:")
+        report = benchmark_shared_store(str(big), store.store_dir, process_counts,
+                                        try_parse_dates=True)
+        with pl.Config(float_precision=1):
+            print(report)
+
+
+def main():
+    """הרצת כל הדוגמאות"""
+    demo_multi_file_ingest()
+    demo_parquet_tuning()
+    demo_partition_catalog()
+    demo_buffered_delta()
+    demo_schema_registry()
+    demo_excel_export()
+    demo_avro_scan()
+    demo_shared_store()
+
+    print_section("✅ כל הדוגמאות הושלמו בהצלחה!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1510 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+פרק 4 - כלים מתקדמים לצבירה וטרנספורמציה ב-Polars
+=================================================
+
+הרחבה מעשית של המחברת polars_data_transformation_guide.ipynb:
+כלים לצבירות שחוזרות על עצמן ולעבודה על נתונים גדולים.
+
+תוכן:
+    1. קוביית צבירה (Rollup Cube) - צבירות שמורות שמתעדכנות רק מהשורות החדשות
+    2. מנוע צבירה לפי שורות - צבירה אופקית במעבר אחד, בלי עמודות ביניים
+    3. הרצה מקבילית לכל קבוצה - תחליף ללולאת for על group_by
+    4. סקיצות צבירה משוערות - ערכים שונים, אחוזונים ושכיחים, עם מצב שאפשר למזג
+    5. describe() ב-streaming - פרופיל סטטיסטי למקורות שלא נכנסים בזיכרון
+
+מחבר: מדריך Polars בעברית
+תאריך: 2025
+
+דרישות:
+    pip install polars numpy
+
+שימוש:
+    python polars_aggregation_tools.py
+"""
+
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Type, Union
+
+import numpy as np
+import polars as pl
+
+# מודולים משותפים: סטטיסטיקה במעבר אחד (streaming_stats.py) וקריאת מקורות (dataset_store.py)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from dataset_store import read_source  # noqa: E402
+from streaming_stats import (  # noqa: E402
+    ColumnStats, QuantileSketch, accumulate_stats, pack_state, unpack_state,
+)
+
+
+def print_section(title):
+    """הדפסת כותרת מדור"""
+    print(f"\n{'='*70}")
+    print(f"  {title}")
+    print(f"{'='*70}\n")
+
+
+def _best_time(run, repeats: int) -> float:
+    """הזמן הטוב ביותר מתוך repeats הרצות"""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+# =============================================================================
+# חלק 1: קוביית צבירה (Rollup Cube)
+# =============================================================================
+
+class RollupCube:
+    """
+    קוביית צבירה שמורה בדיסק: מותג × חנות × חודש הזמנה
+
+    בכל תא נשמרים מספר השורות, ולכל מדד - סכום ומספר ערכים שאינם null.
+    כל אלה חיבוריים, ולכן:
+    - שורות חדשות נצברות לקובייה קטנה וממוזגות לקיימת (בלי לקרוא מחדש הכל)
+    - כל שאילתה ברמה גסה יותר (מותג בלבד, מותג × שנה...) מחושבת מהקובייה,
+      והממוצע מחושב בסוף כ-סכום / ספירה
+
+    refresh מניח שקובץ ה-CSV רק גדל (שורות נוספות בסופו): הוא שומר כמה
+    בתים כבר נקראו ו-hash מלא שלהם, וקורא רק את ההמשך. אם החלק שכבר נקרא
+    השתנה, הקובייה נבנית מחדש.
+
+    התאים נכתבים לקובץ parquet חדש בכל שמירה, ו-cube.json (שמצביע עליו)
+    מוחלף באופן אטומי אחריו - קריסה באמצע משאירה את הזוג הקודם שלם.
+
+    Args:
+        path: תיקיית הקובייה (cube.json + קובץ התאים שהוא מצביע עליו)
+        dimensions: עמודות הממדים בטבלה המקורית
+        measures: עמודות המדדים
+        date_column: עמודת התאריך שממנה נגזר החודש
+        month_column: שם עמודת החודש בקובייה
+    """
+
+    def __init__(self, path: Union[str, Path],
+                 dimensions: Sequence[str] = ('Brand', 'Store Name'),
+                 measures: Sequence[str] = ('Quantity', 'Net Price', 'Unit Price'),
+                 date_column: str = 'Order Date',
+                 month_column: str = 'Order Month'):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.dimensions = list(dimensions)
+        self.measures = list(measures)
+        self.date_column = date_column
+        self.month_column = month_column
+        self.meta: Dict[str, Any] = {}
+        self.cells: Optional[pl.DataFrame] = None
+
+        if (self.path / 'cube.json').exists():
+            with open(self.path / 'cube.json', encoding='utf-8') as f:
+                self.meta = json.load(f)
+            self.cells = pl.read_parquet(self.path / self.meta.get('cells', 'cube.parquet'))
+
+    @property
+    def keys(self) -> List[str]:
+        """עמודות המפתח של התאים"""
+        return self.dimensions + [self.month_column]
+
+    # -------------------------------------------------------------------------
+    # בנייה ועדכון
+    # -------------------------------------------------------------------------
+
+    def _aggregate(self, rows: Union[pl.DataFrame, pl.LazyFrame]) -> pl.DataFrame:
+        """צבירת שורות גולמיות לתאי הקובייה"""
+        return (
+            rows.lazy()
+            .group_by(
+                *self.dimensions,
+                pl.col(self.date_column).dt.truncate('1mo').alias(self.month_column),
+            )
+            .agg(
+                pl.len().alias('rows'),
+                *[pl.col(m).cast(pl.Float64).sum().alias(f'{m}_sum') for m in self.measures],
+                *[pl.col(m).count().alias(f'{m}_count') for m in self.measures],
+            )
+            .collect()
+        )
+
+    def _merge(self, delta: pl.DataFrame) -> None:
+        """מיזוג תאים חדשים לקובייה - כל העמודות חיבוריות"""
+        if self.cells is None:
+            self.cells = delta
+            return
+        self.cells = (
+            pl.concat([self.cells, delta], how='vertical_relaxed')
+            .group_by(self.keys)
+            .agg(pl.exclude(self.keys).sum())
+        )
+
+    def _save(self) -> None:
+        """
+        שמירה אטומית של התאים והמטא-דאטה יחד
+
+        התאים נכתבים לקובץ חדש (cube-<גרסה>.parquet), ואז cube.json מוחלף
+        ב-os.replace ומצביע עליו - זו נקודת ה-commit היחידה. קבצי תאים
+        ישנים נמחקים רק אחריה.
+        """
+        cells_file = f'cube-{time.time_ns():020d}-{os.getpid()}.parquet'
+        tmp = self.path / f'{cells_file}.tmp'
+        self.cells.sort(self.keys).write_parquet(tmp)
+        os.replace(tmp, self.path / cells_file)
+
+        self.meta['cells'] = cells_file
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix='.json.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(self.meta, f, indent=1)
+        os.replace(tmp, self.path / 'cube.json')
+
+        for stale in self.path.glob('cube*.parquet'):
+            if stale.name != cells_file:
+                stale.unlink(missing_ok=True)
+
+    def update(self, new_rows: Union[pl.DataFrame, pl.LazyFrame]) -> int:
+        """
+        הוספת שורות חדשות לקובייה
+
+        Args:
+            new_rows: שורות גולמיות (באותה סכמה כמו הטבלה המקורית)
+
+        Returns:
+            int: מספר התאים שעודכנו או נוספו
+        """
+        delta = self._aggregate(new_rows)
+        self._merge(delta)
+        self._save()
+        return delta.height
+
+    @staticmethod
+    def _prefix_digest(path: Path, n_bytes: int) -> 'hashlib.blake2b':
+        """
+        hash של כל החלק שכבר נקרא (n_bytes הראשונים), בבלוקים של 1MB
+
+        מוחזר אובייקט ה-hash עצמו, כדי להמשיך אותו עם הבתים החדשים
+        בלי לקרוא את ההתחלה פעם נוספת.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, 'rb') as f:
+            remaining = n_bytes
+            while remaining > 0:
+                block = f.read(min(1024 * 1024, remaining))
+                if not block:
+                    break
+                digest.update(block)
+                remaining -= len(block)
+        return digest
+
+    def refresh(self, source: Union[str, Path], **read_options) -> Dict[str, Any]:
+        """
+        עדכון הקובייה מקובץ CSV שנוספו לו שורות - קורא רק את השורות החדשות
+
+        Args:
+            source: קובץ ה-CSV
+            **read_options: אפשרויות ל-pl.read_csv
+
+        Returns:
+            Dict: mode ('full' / 'incremental' / 'unchanged'), new_rows, cells
+        """
+        source = Path(source)
+        stat = source.stat()
+        size = stat.st_size
+        state = self.meta.get('source')
+        read_options.setdefault('try_parse_dates', True)
+
+        same_source = state is not None and state['path'] == str(source.resolve())
+        if (same_source and state.get('size') == size
+                and state.get('mtime_ns') == stat.st_mtime_ns):
+            return {'mode': 'unchanged', 'new_rows': 0, 'cells': self.cells.height}
+
+        digest = None
+        if same_source and state['offset'] <= size:
+            digest = self._prefix_digest(source, state['offset'])
+            if digest.hexdigest() != state['prefix_hash']:
+                digest = None
+        resumable = digest is not None
+
+        with open(source, 'rb') as f:
+            if resumable:
+                header = f.readline()
+                f.seek(state['offset'])
+                body = f.read()
+            else:
+                header, body = b'', f.read()
+
+        # רק עד סוף השורה המלאה האחרונה - שורה חלקית תיקרא בפעם הבאה
+        end = body.rfind(b'\n') + 1
+        body = body[:end]
+        offset = (state['offset'] if resumable else 0) + end
+        if digest is None:
+            digest = hashlib.blake2b(digest_size=16)
+        digest.update(body)
+
+        new_rows = pl.read_csv(header + body, **read_options) if body.strip() else None
+        if not resumable:
+            self.cells = None
+        if new_rows is not None:
+            self._merge(self._aggregate(new_rows))
+
+        self.meta['source'] = {
+            'path': str(source.resolve()),
+            'offset': offset,
+            'size': size,
+            'mtime_ns': stat.st_mtime_ns,
+            'prefix_hash': digest.hexdigest(),
+        }
+        self._save()
+        return {
+            'mode': 'incremental' if resumable else 'full',
+            'new_rows': 0 if new_rows is None else new_rows.height,
+            'cells': self.cells.height,
+        }
+
+    # -------------------------------------------------------------------------
+    # שאילתות
+    # -------------------------------------------------------------------------
+
+    def query(self, by: Iterable[Union[str, pl.Expr]] = (),
+              where: Optional[pl.Expr] = None) -> pl.DataFrame:
+        """
+        צבירה ברמה גסה יותר - מחושבת מהקובייה בלבד
+
+        Args:
+            by: ממדים לקיבוץ (שמות עמודות או ביטויים על עמודות הקובייה,
+                למשל pl.col('Order Month').dt.year().alias('Order Year'))
+            where: תנאי סינון על עמודות הקובייה
+
+        Returns:
+            pl.DataFrame: rows ו-sum/count/mean לכל מדד
+        """
+        if self.cells is None:
+            raise ValueError("הקובייה ריקה - יש לקרוא ל-refresh או update קודם")
+        lf = self.cells.lazy()
+        if where is not None:
+            lf = lf.filter(where)
+
+        by = list(by)
+        sums = [pl.col('rows').sum()] + [
+            pl.col(f'{m}_{part}').sum() for m in self.measures for part in ('sum', 'count')
+        ]
+        lf = lf.group_by(by).agg(sums) if by else lf.select(sums)
+        return (
+            lf.with_columns(
+                (pl.col(f'{m}_sum') / pl.col(f'{m}_count')).alias(f'{m}_mean')
+                for m in self.measures
+            )
+            .sort([e.meta.output_name() if isinstance(e, pl.Expr) else e for e in by]
+                  if by else pl.first())
+            .collect()
+        )
+
+
+def demo_rollup_cube(source: str = '../data/contoso_sales.csv'):
+    """הדגמת קוביית צבירה עם עדכון מהשורות החדשות בלבד"""
+    print_section("🧊 1. קוביית צבירה (Rollup Cube)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # קובץ מכירות שגדל: 80% מהשורות עכשיו, השאר "מחר"
+        sales = Path(tmp) / 'contoso_sales.csv'
+        df = pl.read_csv(source, try_parse_dates=True)
+        split = int(df.height * 0.8)
+        df.head(split).write_csv(sales)
+
+        cube = RollupCube(Path(tmp) / 'sales_cube')
+        info = cube.refresh(sales)
+        print(f"🔹 בנייה ראשונה: {info['new_rows']:,} שורות -> {info['cells']:,} תאים")
+
+        with open(sales, 'a', encoding='utf-8') as f:
+            df.tail(df.height - split).write_csv(f, include_header=False)
+        start = time.perf_counter()
+        info = cube.refresh(sales)
+        print(f"🔹 עדכון ({info['mode']}): {info['new_rows']:,} שורות חדשות בלבד, "
+              f"{(time.perf_counter() - start) * 1000:.1f} ms -> {info['cells']:,} תאים")
+
+        # שאילתה ברמה גסה - מותג בלבד
+        by_brand = cube.query(['Brand'])
+        print("\n🔹 ממוצע מחיר לפי מותג - מהקובייה:")
+        print(by_brand.select('Brand', 'rows', 'Unit Price_mean').head())
+
+        raw = (
+            pl.read_csv(sales, try_parse_dates=True)
+            .group_by('Brand')
+            .agg(pl.len().alias('rows'), pl.col('Unit Price').mean().alias('Unit Price_mean'))
+            .sort('Brand')
+        )
+        matches = (
+            raw['rows'].equals(by_brand['rows'])
+            and (raw['Unit Price_mean'] - by_brand['Unit Price_mean']).abs().max() < 1e-6
+        )
+        print(f"\n✅ זהה ל-group_by על הנתונים הגולמיים: {matches}")
+
+        # מותג × שנה, רק 2019
+        year = pl.col('Order Month').dt.year().alias('Order Year')
+        print("\n🔹 מותג × שנה (2019 בלבד):")
+        print(cube.query(['Brand', year], where=year == 2019)
+              .select('Brand', 'Order Year', 'Quantity_sum', 'Net Price_mean').head())
+
+        raw_s = _best_time(
+            lambda: pl.scan_csv(sales, try_parse_dates=True)
+            .group_by('Brand').agg(pl.col('Net Price').mean()).collect(),
+            repeats=5,
+        )
+        cube_s = _best_time(lambda: cube.query(['Brand']), repeats=5)
+        print(f"\n⏱️  סריקת הטבלה: {raw_s * 1000:.1f} ms, קובייה: {cube_s * 1000:.1f} ms "
+              f"(x{raw_s / cube_s:.1f})")
+
+
+# =============================================================================
+# חלק 2: מנוע צבירה לפי שורות (Row-wise Reduction)
+# =============================================================================
+
+# צבירה -> ufunc שמצטבר עמודה אחרי עמודה (fmin/fmax מדלגים על NaN)
+_ROW_UFUNCS = {
+    'sum': np.add, 'mean': np.add, 'weighted_sum': np.add,
+    'min': np.fmin, 'max': np.fmax,
+    'all': np.logical_and, 'any': np.logical_or,
+}
+
+_ROW_HORIZONTAL = {
+    'sum': pl.sum_horizontal, 'min': pl.min_horizontal, 'max': pl.max_horizontal,
+    'all': pl.all_horizontal, 'any': pl.any_horizontal,
+}
+
+
+def _row_reduce_dtype(columns: Sequence[Union[str, pl.Expr]],
+                      op: Union[str, np.ufunc],
+                      initial: Optional[Any] = None
+                      ) -> Optional[Union[pl.DataType, pl.DataTypeExpr]]:
+    """
+    טיפוס התוצאה של row_reduce - כמו בצבירה האופקית המקבילה של Polars
+
+    Returns:
+        טיפוס (או DataTypeExpr שנפתר מול הסכמה), None עבור ufunc חופשי
+    """
+    if op in ('mean', 'weighted_sum'):
+        return pl.Float64
+    horizontal = _ROW_HORIZONTAL.get(op) if isinstance(op, str) else None
+    if horizontal is None:
+        return None
+    extra = [] if initial is None else [pl.lit(initial)]
+    return pl.dtype_of(horizontal(*columns, *extra))
+
+
+def row_reduce(df: pl.DataFrame,
+               columns: Sequence[Union[str, pl.Expr]],
+               op: Union[str, np.ufunc] = 'sum',
+               weights: Optional[Sequence[float]] = None,
+               initial: Optional[Any] = None,
+               name: str = 'row_reduce') -> pl.Series:
+    """
+    צבירה אופקית (לכל שורה) על קבוצת עמודות, במעבר אחד
+
+    fold ו-reduce מפעילים פונקציה על זוגות עמודות ויוצרים Series חדש בכל
+    צעד. כאן העמודות נקראות כמערכי NumPy (בלי העתקה, כשאין בהן null) והן
+    מצטברות לתוך מערך פלט אחד שמוקצה פעם אחת: ufunc(acc, column, out=acc).
+    כך אין הקצאת ביניים לכל עמודה, וגם אין העתקה של כל הטבלה לבלוק חדש.
+
+    Args:
+        df: הנתונים
+        columns: שמות עמודות או ביטויים (למשל pl.col(cols) > 80)
+        op: 'sum', 'mean', 'min', 'max', 'all', 'any', 'weighted_sum',
+            או ufunc אסוציאטיבי של NumPy (למשל np.multiply, np.bitwise_or)
+        weights: משקלים לכל עמודה (עבור 'weighted_sum')
+        initial: ערך התחלתי (כמו acc ב-pl.fold)
+        name: שם ה-Series בתוצאה
+
+    Returns:
+        pl.Series: ערך לכל שורה
+
+    Note:
+        null מדולג, כמו ב-sum_horizontal (שורה שכולה null מחזירה null
+        ב-mean/min/max). ufunc בלי איבר ניטרלי לא תומך ב-null.
+        טיפוס התוצאה זהה ל-sum/min/max_horizontal: בוליאני נסכם כמספר,
+        ו-min/max על Int64 מחזירים Int64.
+    """
+    frame = df.select(columns)
+    if frame.width == 0:
+        raise ValueError("נדרשת לפחות עמודה אחת")
+    ufunc = op if isinstance(op, np.ufunc) else _ROW_UFUNCS.get(op)
+    if ufunc is None:
+        raise ValueError(f"צבירה לא נתמכת: {op}")
+    if op == 'weighted_sum' and (weights is None or len(weights) != frame.width):
+        raise ValueError("weighted_sum דורש משקל לכל עמודה")
+
+    target = _row_reduce_dtype([pl.all()], op, initial)
+    if isinstance(target, pl.DataTypeExpr):
+        target = frame.head(0).select(pl.lit(None).cast(target)).dtypes[0]
+    if op in ('min', 'max'):
+        frame = frame.select(pl.all().cast(target))
+    elif isinstance(op, str) and op not in ('all', 'any'):
+        # בוליאני כמספר, כמו ב-sum_horizontal (np.add על bool הוא "או")
+        frame = frame.with_columns(pl.col(pl.Boolean).cast(pl.UInt32))
+
+    has_nulls = frame.null_count().sum_horizontal().item() > 0
+    if has_nulls:
+        counts = frame.select(pl.sum_horizontal(pl.all().is_not_null())).to_series().to_numpy()
+        if op in ('min', 'max'):
+            # null -> הקצה הנגדי של הטיפוס, כך שלא משפיע על התוצאה
+            if target == pl.Boolean:
+                extreme = op == 'min'
+            else:
+                extreme = target.max() if op == 'min' else target.min()
+            frame = frame.fill_null(extreme)
+        else:
+            identity = {'all': True, 'any': False}.get(op, ufunc.identity)
+            if identity is None:
+                raise ValueError(f"{op} אינו תומך בערכי null")
+            frame = frame.fill_null(identity)
+
+    arrays = [series.to_numpy() for series in frame.iter_columns()]
+    if op in ('mean', 'weighted_sum'):
+        dtype = np.dtype(np.float64)
+    else:
+        dtype = np.result_type(*arrays, *([] if initial is None else [initial]))
+
+    acc = np.empty(frame.height, dtype=dtype)
+    if op == 'weighted_sum':
+        tmp = np.empty_like(acc)
+        np.multiply(arrays[0], weights[0], out=acc)
+        for values, weight in zip(arrays[1:], weights[1:]):
+            np.multiply(values, weight, out=tmp)
+            np.add(acc, tmp, out=acc)
+    else:
+        acc[...] = arrays[0]
+        for values in arrays[1:]:
+            ufunc(acc, values, out=acc)
+
+    if op == 'mean':
+        with np.errstate(invalid='ignore', divide='ignore'):  # שורה שכולה null
+            acc /= counts if has_nulls else frame.width
+    if initial is not None:
+        ufunc(initial, acc, out=acc)
+    result = pl.Series(name, acc, nan_to_null=has_nulls and op == 'mean')
+    if has_nulls and op in ('min', 'max'):
+        result = result.scatter(np.flatnonzero(counts == 0), None)
+    return result if target is None else result.cast(target)
+
+
+def row_reduce_expr(columns: Sequence[str], op: Union[str, np.ufunc] = 'sum',
+                    **kwargs) -> pl.Expr:
+    """
+    row_reduce כביטוי - לשימוש בתוך with_columns / select
+
+    Args:
+        columns: שמות העמודות
+        op: הצבירה (ראו row_reduce)
+        **kwargs: weights / initial
+
+    Returns:
+        pl.Expr: ביטוי שמחשב את הצבירה לכל שורה
+    """
+    return pl.struct(columns).map_batches(
+        lambda s: row_reduce(s.struct.unnest(), columns, op, name=s.name, **kwargs),
+        return_dtype=_row_reduce_dtype(columns, op, kwargs.get('initial')),
+    )
+
+
+def widen_stats(df: pl.DataFrame, columns: List[str], n_columns: int,
+                n_rows: int) -> pl.DataFrame:
+    """
+    טבלה רחבה לבדיקה: n_columns עמודות (עותקים מוזזים של columns) ו-n_rows שורות
+    """
+    base = df.select(columns).sample(n_rows, with_replacement=True, seed=0)
+    return base.select(
+        (pl.col(columns[i % len(columns)]) + i // len(columns)).alias(f'stat_{i:03d}')
+        for i in range(n_columns)
+    )
+
+
+def benchmark_row_reductions(df: pl.DataFrame, columns: List[str],
+                             widths: Iterable[int] = (6, 60, 600),
+                             n_rows: int = 100_000,
+                             repeats: int = 3) -> pl.DataFrame:
+    """
+    השוואת row_reduce ל-fold / reduce / sum_horizontal ברוחבים שונים
+
+    Returns:
+        pl.DataFrame: שורה לכל רוחב ושיטה - זמן ריצה ויחס ל-fold
+    """
+    rows = []
+    for width in widths:
+        wide = widen_stats(df, columns, width, n_rows)
+        cols = wide.columns
+        weights = np.linspace(0.5, 1.5, width).tolist()
+        methods: Dict[str, Callable[[], Any]] = {
+            'fold': lambda: wide.select(
+                pl.fold(pl.lit(0), lambda acc, x: acc + x, pl.col(cols))),
+            'reduce': lambda: wide.select(pl.reduce(lambda acc, x: acc + x, pl.col(cols))),
+            'sum_horizontal': lambda: wide.select(pl.sum_horizontal(cols)),
+            'row_reduce': lambda: row_reduce(wide, cols, 'sum'),
+            'fold (max)': lambda: wide.select(
+                pl.fold(pl.col(cols[0]), lambda acc, x: acc.zip_with(acc >= x, x),
+                        pl.col(cols[1:]))),
+            'row_reduce (max)': lambda: row_reduce(wide, cols, 'max'),
+            'fold (weighted_sum)': lambda: wide.select(pl.fold(
+                pl.lit(0.0), lambda acc, x: acc + x,
+                [pl.col(c) * w for c, w in zip(cols, weights)])),
+            'row_reduce (weighted_sum)': lambda: row_reduce(
+                wide, cols, 'weighted_sum', weights=weights),
+        }
+        expected = wide.select(pl.sum_horizontal(cols)).to_series()
+        if not (row_reduce(wide, cols, 'sum') == expected).all():
+            raise AssertionError("row_reduce לא תואם ל-sum_horizontal")
+        for name, run in methods.items():
+            rows.append({'columns': width, 'method': name, 'time_s': _best_time(run, repeats)})
+
+    report = pl.DataFrame(rows)
+    fold_time = pl.col('time_s').filter(pl.col('method') == 'fold').first().over('columns')
+    return report.with_columns((fold_time / pl.col('time_s')).alias('speedup_vs_fold'))
+
+
+def demo_row_reductions(source: str = '../data/pokemon.csv'):
+    """הדגמת מנוע הצבירה לפי שורות על נתוני הפוקימונים"""
+    print_section("↔️  2. מנוע צבירה לפי שורות")
+
+    pokemon_df = pl.read_csv(source)
+    cols = ['HP', 'Attack', 'Defense', 'Sp. Atk', 'Sp. Def', 'Speed']
+
+    result = pokemon_df.select('Name').with_columns(
+        row_reduce(pokemon_df, cols, 'sum', name='סך נקודות'),
+        row_reduce(pokemon_df, cols, 'sum', initial=100, name='סך נקודות + 100'),
+        row_reduce(pokemon_df, cols, 'max', name='הסטטיסטיקה הגבוהה'),
+        row_reduce(pokemon_df, cols, 'weighted_sum', weights=[1, 2, 1, 2, 1, 1],
+                   name='ציון התקפי'),
+        row_reduce(pokemon_df, [pl.col(cols) > 80], 'all', name='הכל מעל 80'),
+    )
+    print(result.head())
+
+    same = result['סך נקודות'].equals(pokemon_df['Total'].alias('סך נקודות'))
+    print(f"\n✅ זהה לעמודת Total: {same}")
+
+    with_expr = pokemon_df.with_columns(row_reduce_expr(cols, 'mean').alias('ממוצע'))
+    print(f"🔹 כביטוי בתוך with_columns: {with_expr.select('Name', 'ממוצע').row(0)}")
+
+    print("\n⏱️  6 / 60 / 600 עמודות, 100,000 שורות:")
+    report = benchmark_row_reductions(pokemon_df, cols)
+    with pl.Config(tbl_rows=30, float_precision=4):
+        print(report)
+
+
+# =============================================================================
+# חלק 3: הרצה מקבילית לכל קבוצה (Group Apply)
+# =============================================================================
+
+def _to_ipc(df: pl.DataFrame) -> bytes:
+    """DataFrame -> בתים בפורמט Arrow IPC"""
+    return df.write_ipc(None).getvalue()
+
+
+def _from_ipc(payload: bytes) -> pl.DataFrame:
+    """בתים בפורמט Arrow IPC -> DataFrame"""
+    return pl.read_ipc(io.BytesIO(payload))
+
+
+def _apply_task(func: Callable[..., pl.DataFrame], kwargs: Dict[str, Any],
+                groups: List[Tuple[int, bytes]]) -> List[Tuple[int, bytes, float, int]]:
+    """
+    משימה אחת בתהליך עבודה: func על כל קבוצה שבה
+
+    Returns:
+        List: (מספר קבוצה, תוצאה ב-IPC, שניות, pid) לכל קבוצה
+    """
+    results = []
+    for index, payload in groups:
+        start = time.perf_counter()
+        result = func(_from_ipc(payload), **kwargs)
+        results.append((index, _to_ipc(result), time.perf_counter() - start, os.getpid()))
+    return results
+
+
+def print_progress(done: int, total: int, elapsed: float) -> None:
+    """דיווח התקדמות ברירת המחדל"""
+    print(f"   ⏳ {done}/{total} קבוצות ({elapsed:.1f} שניות)", end='\r' if done < total else '\n')
+
+
+class GroupApplyExecutor:
+    """
+    הרצת פונקציית Python על כל קבוצה - במקביל, בתהליכים נפרדים
+
+    במקום `for name, data in df.group_by(...)` (קבוצה אחרי קבוצה, תחת GIL):
+    - הטבלה מחולקת פעם אחת (partition_by)
+    - קבוצות קטנות נארזות יחד למשימה אחת, עד min_rows_per_task שורות
+    - כל משימה נשלחת לתהליך עבודה כבתים בפורמט Arrow IPC (בלי pickle של
+      אובייקטי Python) והתוצאות חוזרות באותו פורמט
+    - התוצאות מחוברות לפי סדר הופעת הקבוצות בטבלה - בלי קשר לסדר הסיום
+
+    func צריכה להיות מוגדרת ברמת המודול (כדי שתהליכי העבודה יוכלו לייבא
+    אותה), לקבל DataFrame של קבוצה ולהחזיר DataFrame. עמודות המפתח
+    מתווספות לתוצאה אם func לא החזירה אותן.
+
+    Args:
+        max_workers: מספר תהליכי עבודה (ברירת מחדל: מספר הליבות)
+        min_rows_per_task: מספר שורות מינימלי במשימה (אריזת קבוצות קטנות)
+        progress: פונקציה (done, total, elapsed) לדיווח התקדמות, או None
+    """
+
+    def __init__(self, max_workers: Optional[int] = None,
+                 min_rows_per_task: int = 10_000,
+                 progress: Optional[Callable[[int, int, float], None]] = print_progress):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.min_rows_per_task = min_rows_per_task
+        self.progress = progress
+        self.timings: Optional[pl.DataFrame] = None
+
+    def _tasks(self, groups: List[pl.DataFrame]) -> List[List[Tuple[int, bytes]]]:
+        """אריזת הקבוצות למשימות - קבוצות גדולות לבד, קטנות יחד"""
+        tasks, current, rows = [], [], 0
+        for index, group in enumerate(groups):
+            current.append((index, _to_ipc(group)))
+            rows += group.height
+            if rows >= self.min_rows_per_task:
+                tasks.append(current)
+                current, rows = [], 0
+        if current:
+            tasks.append(current)
+        return tasks
+
+    def apply(self, df: pl.DataFrame, by: Union[str, List[str]],
+              func: Callable[..., pl.DataFrame], **kwargs) -> pl.DataFrame:
+        """
+        הרצת func על כל קבוצה וחיבור התוצאות
+
+        Args:
+            df: הנתונים
+            by: עמודות הקיבוץ
+            func: פונקציה DataFrame -> DataFrame
+            **kwargs: פרמטרים נוספים ל-func
+
+        Returns:
+            pl.DataFrame: התוצאות של כל הקבוצות, לפי סדר הופעת הקבוצות.
+            זמני הריצה לכל קבוצה נשמרים ב-self.timings
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        partitions = df.partition_by(by, maintain_order=True, as_dict=True)
+        keys, groups = list(partitions.keys()), list(partitions.values())
+        tasks = self._tasks(groups)
+
+        results: Dict[int, Tuple[bytes, float, int]] = {}
+        start = time.perf_counter()
+        if self.max_workers == 1:
+            for task in tasks:
+                for index, payload, seconds, pid in _apply_task(func, kwargs, task):
+                    results[index] = (payload, seconds, pid)
+                if self.progress:
+                    self.progress(len(results), len(groups), time.perf_counter() - start)
+        else:
+            ctx = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(self.max_workers, mp_context=ctx) as pool:
+                futures = [pool.submit(_apply_task, func, kwargs, task) for task in tasks]
+                for future in as_completed(futures):
+                    for index, payload, seconds, pid in future.result():
+                        results[index] = (payload, seconds, pid)
+                    if self.progress:
+                        self.progress(len(results), len(groups), time.perf_counter() - start)
+
+        outputs, timings = [], []
+        for index, key in enumerate(keys):
+            payload, seconds, pid = results[index]
+            output = _from_ipc(payload)
+            missing = [pl.lit(value).alias(name) for name, value in zip(by, key)
+                       if name not in output.columns]
+            outputs.append(output.select(*missing, pl.all()) if missing else output)
+            timings.append({**dict(zip(by, key)), 'rows': groups[index].height,
+                            'seconds': seconds, 'worker_pid': pid})
+
+        self.timings = pl.DataFrame(timings)
+        return pl.concat(outputs, how='diagonal_relaxed')
+
+
+def fit_price_model(group: pl.DataFrame, n_bootstrap: int = 200) -> pl.DataFrame:
+    """
+    "מודל" לקבוצה: רגרסיה לינארית של Net Price לפי Unit Price, עם
+    רווח סמך ב-bootstrap (עבודת Python/NumPy טיפוסית שרצה תחת GIL)
+    """
+    x = group['Unit Price'].to_numpy()
+    y = group['Net Price'].to_numpy()
+    rng = np.random.default_rng(0)
+    slopes = []
+    for _ in range(n_bootstrap):
+        sample = rng.integers(0, len(x), len(x))
+        if np.ptp(x[sample]) > 0:
+            slopes.append(np.polyfit(x[sample], y[sample], 1)[0])
+    slope, intercept = np.polyfit(x, y, 1) if np.ptp(x) > 0 else (np.nan, y.mean())
+    low, high = np.percentile(slopes, [2.5, 97.5]) if slopes else (np.nan, np.nan)
+    return pl.DataFrame({
+        'n': [len(x)], 'slope': [slope], 'intercept': [intercept],
+        'slope_low': [low], 'slope_high': [high],
+    })
+
+
+def demo_group_apply(source: str = '../data/contoso_sales.csv'):
+    """הדגמת הרצה מקבילית לכל קבוצה"""
+    print_section("🏭 3. הרצה מקבילית לכל קבוצה")
+
+    df = pl.read_csv(source, try_parse_dates=True)
+
+    start = time.perf_counter()
+    serial = pl.concat([
+        fit_price_model(data).select(pl.lit(name[0]).alias('Brand'), pl.all())
+        for name, data in df.group_by(['Brand'], maintain_order=True)
+    ])
+    serial_s = time.perf_counter() - start
+    print(f"🔹 לולאת for על group_by: {serial_s:.2f} שניות")
+
+    workers = max(2, os.cpu_count() or 1)
+    executor = GroupApplyExecutor(max_workers=workers, min_rows_per_task=2_000)
+    start = time.perf_counter()
+    result = executor.apply(df, 'Brand', fit_price_model)
+    parallel_s = time.perf_counter() - start
+    print(f"🔹 GroupApplyExecutor ({workers} תהליכים): {parallel_s:.2f} שניות "
+          f"(כולל הפעלת התהליכים; {os.cpu_count()} ליבות זמינות)")
+
+    print(result.head())
+    print(f"\n✅ זהה ללולאה: {result.equals(serial)}")
+
+    print("\n🔹 הקבוצות האיטיות ביותר:")
+    print(executor.timings.sort('seconds', descending=True).head(3))
+
+
+# =============================================================================
+# חלק 4: סקיצות צבירה משוערות (Mergeable Sketches)
+# =============================================================================
+
+SKETCH_HASH_SEED = 0x5EED
+# תג פונקציית ה-hash שנשמר בכל מצב: מצבים עם תג שונה לא ממוזגים
+SKETCH_HASH_VERSION = 'blake2b-splitmix64-v1'
+
+_MASK64 = (1 << 64) - 1
+_GOLDEN64 = 0x9E3779B97F4A7C15
+
+
+def _sketch_keys(values: pl.Series) -> pl.Series:
+    """
+    נרמול ערכים לפני hash: מספרים שלמים -> Int64, כל השאר -> String
+
+    כך ערך זהה מקבל אותו hash גם כשסוג העמודה שונה בין מחיצות.
+    """
+    values = values.drop_nulls()
+    return values.cast(pl.Int64) if values.dtype.is_integer() else values.cast(pl.String)
+
+
+def _mix64(x: np.ndarray) -> np.ndarray:
+    """ערבוב 64 ביט של splitmix64 (חשבון uint64 עם גלישה)"""
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def _stable_hash(keys: pl.Series, seed: int = SKETCH_HASH_SEED) -> np.ndarray:
+    """
+    hash של 64 ביט שלא תלוי בגרסת Polars (בניגוד ל-Series.hash)
+
+    Int64 נלקח כמו שהוא, מחרוזות עוברות blake2b על ה-UTF-8 שלהן; התוצאה
+    מעורבבת עם seed ב-splitmix64. מצבים שנשמרו היום ימוזגו נכון גם אחרי
+    שדרוג Polars.
+
+    Args:
+        keys: ערכים מנורמלים (ראו _sketch_keys)
+        seed: seed - ערך שונה נותן פונקציית hash אחרת
+
+    Returns:
+        np.ndarray: מערך uint64
+    """
+    if keys.dtype == pl.Int64:
+        base = keys.to_numpy().astype(np.uint64)
+    else:
+        base = np.fromiter(
+            (int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'little')
+             for value in keys.to_list()),
+            dtype=np.uint64, count=len(keys),
+        )
+    return _mix64(base + np.uint64((seed * _GOLDEN64) & _MASK64))
+
+
+def _check_hash_version(sketch: Any, other: Any = None) -> None:
+    """שגיאה אם מצב נבנה עם פונקציית hash אחרת (או אם שני מצבים לא תואמים)"""
+    expected = SKETCH_HASH_VERSION if other is None else other.hash_version
+    if sketch.hash_version != expected:
+        raise ValueError(f"פונקציות hash שונות: {sketch.hash_version!r} ו-{expected!r} "
+                         f"- אי אפשר לשלב את המצבים")
+
+
+class HyperLogLog:
+    """
+    ספירת ערכים שונים משוערת (HyperLogLog) - מצב בגודל קבוע שאפשר למזג
+
+    כל ערך עובר hash של 64 ביט: precision הביטים העליונים בוחרים "רגיסטר",
+    והרגיסטר שומר את מספר האפסים המובילים המקסימלי בשאר הביטים. מיזוג
+    הוא מקסימום בין רגיסטרים - לכן מצבים של ימים/מחיצות שונים מתמזגים
+    לתוצאה זהה למעבר אחד על כל הנתונים.
+
+    שגיאה יחסית טיפוסית: 1.04 / sqrt(2^precision) (כ-0.8% עבור 14).
+    בניגוד ל-Expr.approx_n_unique, המצב נשמר וממוזג; null לא נספר.
+
+    ה-hash לא תלוי בגרסת Polars (ראו _stable_hash), ותג הגרסה שלו נשמר
+    במצב: מיזוג מצבים עם תגים שונים נכשל במקום להחזיר אומדן שגוי.
+
+    Args:
+        precision: מספר ביטי האינדקס, 11-18 (2^precision רגיסטרים)
+    """
+
+    def __init__(self, precision: int = 14):
+        if not 11 <= precision <= 18:
+            raise ValueError(f"precision חייב להיות בין 11 ל-18, התקבל {precision}")
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+        self.hash_version = SKETCH_HASH_VERSION
+
+    def update(self, values: pl.Series) -> 'HyperLogLog':
+        """הוספת ערכים לסקיצה"""
+        _check_hash_version(self)
+        keys = _sketch_keys(values).unique()
+        if keys.len() == 0:
+            return self
+        hashes = pl.Series('h', _stable_hash(keys), dtype=pl.UInt64)
+        shift = 64 - self.precision
+        ranks = (
+            pl.DataFrame({'h': hashes})
+            .group_by((pl.col('h') // (1 << shift)).alias('index'))
+            .agg(((pl.col('h') & ((1 << shift) - 1)).bitwise_leading_zeros().max()
+                  - self.precision + 1).alias('rank'))
+        )
+        index = ranks['index'].to_numpy().astype(np.intp)
+        rank = ranks['rank'].to_numpy().astype(np.uint8)
+        self.registers[index] = np.maximum(self.registers[index], rank)
+        return self
+
+    def merge(self, other: 'HyperLogLog') -> 'HyperLogLog':
+        """מיזוג סקיצה אחרת לתוך זו - מחזיר את self"""
+        if other.precision != self.precision:
+            raise ValueError(f"אי אפשר למזג precision {other.precision} לתוך {self.precision}")
+        _check_hash_version(other, self)
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def estimate(self) -> int:
+        """מספר הערכים השונים המשוער"""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.ldexp(1.0, -self.registers.astype(np.int64)).sum()
+        zeros = int(np.count_nonzero(self.registers == 0))
+        # טווח קטן: linear counting מדויק יותר
+        if raw <= 2.5 * m and zeros:
+            raw = m * np.log(m / zeros)
+        return int(round(raw))
+
+    def to_bytes(self) -> bytes:
+        """סריאליזציה (רגיסטרים ריקים נדחסים כמעט לאפס)"""
+        return pack_state({'precision': self.precision, 'hash': self.hash_version},
+                          [self.registers])
+
+    @classmethod
+    def from_bytes(cls, payload: bytes) -> 'HyperLogLog':
+        """שחזור סקיצה מ-to_bytes (מצב ישן בלי תג - hash_version הוא None)"""
+        meta, (registers,) = unpack_state(payload)
+        sketch = cls(meta['precision'])
+        sketch.registers = registers
+        sketch.hash_version = meta.get('hash')
+        return sketch
+
+
+class CountMinSketch:
+    """
+    ספירת שכיחויות משוערת (Count-Min) ומעקב אחרי הערכים השכיחים ביותר
+
+    טבלה של depth שורות על width עמודות: כל ערך מוסיף את המשקל שלו לתא
+    אחד בכל שורה (לפי hash שונה לכל שורה), והאומדן הוא המינימום על
+    השורות. האומדן לעולם לא נמוך מהאמת, ובהסתברות 1 - e^-depth גבוה
+    ממנה לכל היותר ב-(e / width) * total. מיזוג הוא חיבור טבלאות.
+
+    לצד הטבלה נשמרים top_k מועמדים ל"שכיחים". אחרי מיזוג האומדנים שלהם
+    מחושבים מחדש מהטבלה רק כשצריך אותם - כך מיזוג של הרבה מצבים זול.
+
+    Args:
+        width: מספר העמודות (שגיאה יחסית e / width)
+        depth: מספר השורות (הסתברות כישלון e^-depth)
+        top_k: מספר הערכים השכיחים שנשמרים
+    """
+
+    def __init__(self, width: int = 2048, depth: int = 5, top_k: int = 20):
+        self.width = width
+        self.depth = depth
+        self.top_k = top_k
+        self.counts = np.zeros((depth, width), dtype=np.int64)
+        self.total = 0
+        self.heavy: Dict[Any, int] = {}
+        self.hash_version = SKETCH_HASH_VERSION
+        self._stale = False
+
+    def _buckets(self, keys: pl.Series) -> List[np.ndarray]:
+        """התא של כל ערך בכל שורה"""
+        _check_hash_version(self)
+        return [(_stable_hash(keys, SKETCH_HASH_SEED + row) % np.uint64(self.width)).astype(np.intp)
+                for row in range(self.depth)]
+
+    def _estimate_keys(self, keys: pl.Series) -> np.ndarray:
+        """אומדן שכיחות לערכים מנורמלים"""
+        buckets = self._buckets(keys)
+        return np.min([self.counts[row, buckets[row]] for row in range(self.depth)], axis=0)
+
+    def _refresh_heavy(self, keys: Optional[pl.Series] = None) -> None:
+        """בחירה מחדש של top_k מתוך המועמדים הקיימים והערכים החדשים"""
+        candidates = pl.Series(list(self.heavy)) if self.heavy else None
+        if keys is None:
+            keys = candidates
+        elif candidates is not None:
+            keys = pl.concat([keys, candidates.cast(keys.dtype)]).unique()
+        self._stale = False
+        if keys is None:
+            return
+        estimates = self._estimate_keys(keys)
+        top = np.argsort(-estimates, kind='stable')[:self.top_k]
+        self.heavy = dict(zip(keys.gather(top).to_list(), estimates[top].tolist()))
+
+    def update(self, values: pl.Series, weights: Optional[pl.Series] = None) -> 'CountMinSketch':
+        """
+        הוספת ערכים לסקיצה
+
+        Args:
+            values: הערכים
+            weights: משקל לכל ערך (למשל Quantity); ברירת מחדל 1
+        """
+        frame = pl.DataFrame({
+            'key': values,
+            'weight': weights if weights is not None else pl.repeat(1, len(values), eager=True),
+        }).filter(pl.col('key').is_not_null())
+        totals = frame.group_by('key').agg(pl.col('weight').sum())
+        if totals.height == 0:
+            return self
+        keys = _sketch_keys(totals['key'])
+        weight = totals['weight'].to_numpy()
+        for row, bucket in enumerate(self._buckets(keys)):
+            self.counts[row] += np.bincount(bucket, weights=weight, minlength=self.width).astype(np.int64)
+        self.total += int(weight.sum())
+        self._refresh_heavy(keys)
+        return self
+
+    def merge(self, other: 'CountMinSketch') -> 'CountMinSketch':
+        """מיזוג סקיצה אחרת לתוך זו - מחזיר את self"""
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("אפשר למזג רק סקיצות Count-Min באותו width ו-depth")
+        _check_hash_version(other, self)
+        self.counts += other.counts
+        self.total += other.total
+        for key in other.heavy:
+            self.heavy.setdefault(key, 0)
+        self._stale = True
+        return self
+
+    def estimate(self, values: Union[pl.Series, Sequence[Any]]) -> np.ndarray:
+        """אומדן שכיחות (סכום משקלים) לכל ערך"""
+        return self._estimate_keys(_sketch_keys(pl.Series(values)))
+
+    def most_common(self, k: Optional[int] = None) -> List[Tuple[Any, int]]:
+        """הערכים השכיחים ביותר: [(ערך, אומדן), ...] בסדר יורד"""
+        if self._stale:
+            self._refresh_heavy()
+        return sorted(self.heavy.items(), key=lambda item: -item[1])[:k or self.top_k]
+
+    def to_bytes(self) -> bytes:
+        """סריאליזציה (המועמדים נשמרים כרשימת זוגות ב-JSON)"""
+        if self._stale:
+            self._refresh_heavy()
+        meta = {'width': self.width, 'depth': self.depth, 'top_k': self.top_k,
+                'total': self.total, 'heavy': list(self.heavy.items()),
+                'hash': self.hash_version}
+        return pack_state(meta, [self.counts])
+
+    @classmethod
+    def from_bytes(cls, payload: bytes) -> 'CountMinSketch':
+        """שחזור סקיצה מ-to_bytes"""
+        meta, (counts,) = unpack_state(payload)
+        sketch = cls(meta['width'], meta['depth'], meta['top_k'])
+        sketch.counts = counts
+        sketch.total = meta['total']
+        sketch.heavy = {key: count for key, count in meta['heavy']}
+        sketch.hash_version = meta.get('hash')
+        return sketch
+
+
+def hll_state(column: str, precision: int = 14) -> pl.Expr:
+    """ביטוי צבירה (בתוך agg): מצב HyperLogLog של כל קבוצה, כ-Binary"""
+    return pl.col(column).map_batches(
+        lambda s: HyperLogLog(precision).update(s).to_bytes(),
+        return_dtype=pl.Binary, returns_scalar=True,
+    )
+
+
+def quantile_state(column: str, capacity: int = 1024) -> pl.Expr:
+    """ביטוי צבירה (בתוך agg): מצב QuantileSketch (בסגנון KLL) של כל קבוצה"""
+    return pl.col(column).map_batches(
+        lambda s: QuantileSketch(capacity).update(
+            s.drop_nulls().cast(pl.Float64).to_numpy()).to_bytes(),
+        return_dtype=pl.Binary, returns_scalar=True,
+    )
+
+
+def cms_state(column: str, weights: Optional[str] = None,
+              width: int = 2048, depth: int = 5, top_k: int = 20) -> pl.Expr:
+    """ביטוי צבירה (בתוך agg): מצב Count-Min של כל קבוצה, עם משקלים אופציונליים"""
+    if weights is None:
+        return pl.col(column).map_batches(
+            lambda s: CountMinSketch(width, depth, top_k).update(s).to_bytes(),
+            return_dtype=pl.Binary, returns_scalar=True,
+        )
+    return pl.struct(column, weights).map_batches(
+        lambda s: CountMinSketch(width, depth, top_k).update(
+            s.struct.field(column), s.struct.field(weights)).to_bytes(),
+        return_dtype=pl.Binary, returns_scalar=True,
+    ).alias(column)
+
+
+def merge_states(column: str,
+                 sketch: Type[Union[HyperLogLog, QuantileSketch, CountMinSketch]]) -> pl.Expr:
+    """
+    ביטוי צבירה (בתוך agg): מיזוג כל מצבי הסקיצה בקבוצה למצב אחד
+
+    Args:
+        column: עמודת Binary עם מצבים (מ-hll_state / quantile_state / cms_state)
+        sketch: מחלקת הסקיצה
+
+    Returns:
+        pl.Expr: מצב ממוזג, כ-Binary
+    """
+    def merge(states: pl.Series) -> bytes:
+        merged = None
+        for payload in states.drop_nulls():
+            state = sketch.from_bytes(payload)
+            merged = state if merged is None else merged.merge(state)
+        return (merged or sketch()).to_bytes()
+
+    return pl.col(column).map_batches(merge, return_dtype=pl.Binary, returns_scalar=True)
+
+
+def _finalize(column: str, sketch: Type, result: Callable[[Any], Any],
+              return_dtype: pl.DataType) -> pl.Expr:
+    """ביטוי שמחשב תוצאה מכל מצב בעמודה (null נשאר null)"""
+    return pl.col(column).map_batches(
+        lambda states: pl.Series(
+            [None if payload is None else result(sketch.from_bytes(payload)) for payload in states],
+            dtype=return_dtype,
+        ),
+        return_dtype=return_dtype,
+    )
+
+
+def approx_distinct(column: str) -> pl.Expr:
+    """מספר הערכים השונים המשוער ממצב HyperLogLog"""
+    return _finalize(column, HyperLogLog, HyperLogLog.estimate, pl.Int64)
+
+
+def approx_quantile(column: str, q: float) -> pl.Expr:
+    """אחוזון q משוער ממצב QuantileSketch"""
+    return _finalize(column, QuantileSketch, lambda sketch: sketch.quantile(q), pl.Float64)
+
+
+def approx_top_k(column: str, k: int = 10) -> pl.Expr:
+    """הערכים השכיחים ממצב Count-Min, כרשימת {value, count}"""
+    dtype = pl.List(pl.Struct({'value': pl.String, 'count': pl.Int64}))
+    return _finalize(
+        column, CountMinSketch,
+        lambda sketch: [{'value': str(value), 'count': count}
+                        for value, count in sketch.most_common(k)],
+        dtype,
+    )
+
+
+SKETCH_COLUMNS = {'customers': HyperLogLog, 'net_price': QuantileSketch, 'products': CountMinSketch}
+
+
+def daily_sketches(frame: pl.DataFrame, by: str = 'Brand',
+                   date_column: str = 'Order Date') -> pl.DataFrame:
+    """מצבי הסקיצות לכל קבוצה ויום - מה שהג'וב הלילי שומר"""
+    return frame.group_by(by, date_column).agg(
+        hll_state('Customer Name').alias('customers'),
+        quantile_state('Net Price').alias('net_price'),
+        cms_state('Product Name', weights='Quantity').alias('products'),
+    )
+
+
+def merge_daily_sketches(states: pl.DataFrame, by: str = 'Brand') -> pl.DataFrame:
+    """מיזוג מצבים יומיים לתוצאה לכל קבוצה - בלי לקרוא שוב את הנתונים"""
+    return (
+        states.group_by(by)
+        .agg(merge_states(name, sketch).alias(name) for name, sketch in SKETCH_COLUMNS.items())
+        .select(
+            by,
+            approx_distinct('customers').alias('customers'),
+            approx_quantile('net_price', 0.5).alias('median_net_price'),
+            approx_top_k('products', 1).list.first().struct.field('value').alias('top_product'),
+        )
+        .sort(by)
+    )
+
+
+def exact_brand_stats(frame: Union[pl.DataFrame, pl.LazyFrame], by: str = 'Brand') -> pl.DataFrame:
+    """אותן סטטיסטיקות בחישוב מדויק - מעבר מלא על כל הנתונים"""
+    top_product = (
+        frame.lazy().group_by(by, 'Product Name').agg(pl.col('Quantity').sum())
+        .sort('Quantity', 'Product Name', descending=[True, False])
+        .group_by(by).agg(pl.col('Product Name').first().alias('top_product'))
+    )
+    return (
+        frame.lazy().group_by(by)
+        .agg(
+            pl.col('Customer Name').n_unique().alias('customers'),
+            pl.col('Net Price').median().alias('median_net_price'),
+        )
+        .join(top_product, on=by)
+        .sort(by)
+        .collect()
+    )
+
+
+def benchmark_sketch_refresh(source: str = '../data/contoso_sales.csv',
+                             days: int = 30, day_copies: int = 8,
+                             repeats: int = 3) -> Dict[str, float]:
+    """
+    רענון לילי אחרי יום חדש: חישוב מדויק על כל ההיסטוריה מול סקיצה ליום
+    החדש בלבד ומיזוג עם המצבים השמורים
+
+    כל "יום" הוא day_copies עותקים של contoso_sales עם לקוחות ומחירים
+    מוזזים. זמן החישוב המדויק גדל עם מספר השורות בהיסטוריה; זמן הסקיצות
+    תלוי רק ביום החדש ובמספר המצבים השמורים (days * מותגים).
+
+    Returns:
+        Dict[str, float]: מספר שורות וזמני ריצה בשניות
+    """
+    base = pl.read_csv(source, try_parse_dates=True).select(
+        'Brand', 'Customer Name', 'Product Name', 'Quantity', 'Net Price'
+    )
+
+    def day(i: int) -> pl.DataFrame:
+        return pl.concat([base] * day_copies).with_columns(
+            pl.lit(i).alias('Day'),
+            (pl.col('Customer Name') + f'#{i % 7}').alias('Customer Name'),
+            pl.col('Net Price') * (1 + i / 100),
+        )
+
+    history = pl.concat([day(i) for i in range(days)])
+    stored = daily_sketches(history, date_column='Day')
+    new_day = day(days)
+
+    def exact():
+        return exact_brand_stats(pl.concat([history, new_day]))
+
+    def sketched():
+        states = pl.concat([stored, daily_sketches(new_day, date_column='Day')])
+        return merge_daily_sketches(states)
+
+    return {
+        'rows': history.height + new_day.height,
+        'exact_s': _best_time(exact, repeats),
+        'sketch_s': _best_time(sketched, repeats),
+    }
+
+
+def demo_sketches(source: str = '../data/contoso_sales.csv'):
+    """הדגמת סקיצות צבירה משוערות"""
+    print_section("🧮 4. סקיצות צבירה משוערות")
+
+    df = pl.read_csv(source, try_parse_dates=True)
+
+    print("🔹 מצבי סקיצה לכל מותג ויום (בתוך agg):")
+    states = daily_sketches(df)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'daily_sketches.parquet'
+        states.write_parquet(path)
+        print(f"   {states.height:,} מצבים, {path.stat().st_size / 1024:.0f} KB ב-Parquet")
+        states = pl.read_parquet(path)
+
+    approx = merge_daily_sketches(states)
+    exact = exact_brand_stats(df)
+    comparison = exact.join(approx, on='Brand', suffix='_approx').select(
+        'Brand', 'customers', 'customers_approx',
+        ((pl.col('customers_approx') / pl.col('customers') - 1) * 100).round(2).alias('error_%'),
+        'median_net_price', 'median_net_price_approx',
+        (pl.col('top_product') == pl.col('top_product_approx')).alias('same_top'),
+    )
+    print("\n🔹 מיזוג המצבים היומיים מול חישוב מדויק:")
+    print(comparison)
+
+    print("\n🔹 רענון אחרי יום חדש - היסטוריה מלאה מול מיזוג מצבים שמורים:")
+    result = benchmark_sketch_refresh(source)
+    print(f"   {result['rows']:,} שורות | מדויק: {result['exact_s'] * 1000:.0f} ms | "
+          f"סקיצות: {result['sketch_s'] * 1000:.0f} ms "
+          f"(x{result['exact_s'] / result['sketch_s']:.1f})")
+    print("   💡 זמן הסקיצות לא גדל עם ההיסטוריה - היתרון גדל ככל שיש יותר ימים ושורות")
+
+
+# =============================================================================
+# חלק 5: describe() ב-streaming
+# =============================================================================
+
+DESCRIBE_PERCENTILES = (0.25, 0.5, 0.75)
+
+
+def _percentile_name(q: float) -> str:
+    """שם השורה כמו ב-describe: 0.25 -> 25%, 0.025 -> 2.5%"""
+    return f'{q * 100:g}%'
+
+
+def _describe_kind(dtype: pl.DataType) -> str:
+    """איך לחשב כל עמודה: numeric / boolean / temporal / string / other"""
+    if dtype.is_numeric():
+        return 'numeric'
+    if dtype == pl.Boolean:
+        return 'boolean'
+    if dtype.is_temporal():
+        return 'temporal'
+    if dtype in (pl.String, pl.Categorical) or isinstance(dtype, pl.Enum):
+        return 'string'
+    return 'other'
+
+
+def _describe_input(name: str, kind: str) -> pl.Expr:
+    """
+    העמודה בצורה שנכנסת לסטטיסטיקה: Boolean -> 0/1, תאריכים -> הערך
+    הפיזי (מספר שלם), טקסט -> String
+    """
+    col = pl.col(name)
+    if kind == 'boolean':
+        return col.cast(pl.UInt8)
+    if kind == 'temporal':
+        return col.to_physical()
+    if kind == 'string':
+        return col.cast(pl.String)
+    return col
+
+
+def _profile_batch(batch: pl.DataFrame, sketched: List[str], counted: List[str],
+                   capacity: int) -> Tuple[Dict[str, ColumnStats], Dict[str, list], int]:
+    """
+    מצבי הסטטיסטיקה של מנה אחת (רץ בתהליכון)
+
+    Returns:
+        Tuple: (ColumnStats לעמודות עם סקיצה, [count, null_count, min, max]
+        לשאר העמודות, מספר השורות)
+    """
+    states = accumulate_stats(batch, sketched, batch_size=max(batch.height, 1),
+                              capacity=capacity) if sketched else {}
+    others = {}
+    if counted:
+        exprs = []
+        for name in counted:
+            col = pl.col(name)
+            has_order = batch.schema[name] == pl.String
+            exprs += [
+                col.count().alias(f'{name}__count'),
+                col.null_count().alias(f'{name}__null_count'),
+                (col.min() if has_order else pl.lit(None)).alias(f'{name}__min'),
+                (col.max() if has_order else pl.lit(None)).alias(f'{name}__max'),
+            ]
+        row = batch.select(exprs).row(0)
+        others = {name: list(row[4 * i:4 * i + 4]) for i, name in enumerate(counted)}
+    return states, others, batch.height
+
+
+def _merge_counted(total: list, part: list) -> list:
+    """מיזוג [count, null_count, min, max] של שתי מנות"""
+    low = [v for v in (total[2], part[2]) if v is not None]
+    high = [v for v in (total[3], part[3]) if v is not None]
+    return [total[0] + part[0], total[1] + part[1],
+            min(low) if low else None, max(high) if high else None]
+
+
+def print_scan_progress(rows: int, elapsed: float, done: bool) -> None:
+    """דיווח התקדמות ברירת המחדל של describe_streaming"""
+    rate = rows / elapsed if elapsed else 0
+    print(f"   ⏳ {rows:,} שורות ({elapsed:.1f} שניות, {rate:,.0f} שורות/שנייה)",
+          end='\n' if done else '\r')
+
+
+def describe_streaming(source: Union[str, Path, pl.DataFrame, pl.LazyFrame],
+                       percentiles: Sequence[float] = DESCRIBE_PERCENTILES,
+                       *,
+                       interpolation: str = 'nearest',
+                       batch_size: int = 100_000,
+                       max_workers: Optional[int] = None,
+                       capacity: int = 4096,
+                       progress: Optional[Callable[[int, float, bool], None]] = print_scan_progress,
+                       ) -> pl.DataFrame:
+    """
+    describe() על מקור שלא נכנס בזיכרון - מנה אחר מנה, בזיכרון חסום
+
+    המקור נקרא ב-streaming (collect_batches). כל מנה מסוכמת בתהליכון נפרד
+    למצבים שאפשר למזג - Moments (ממוצע וסטיית תקן בשיטת Welford),
+    QuantileSketch לאחוזונים, ספירות ומינימום/מקסימום - והמצבים ממוזגים
+    לפי סדר המנות. החישובים של Polars ו-NumPy משחררים את ה-GIL, כך
+    שהמנות מעובדות במקביל על כל הליבות.
+
+    התוצאה באותה צורה כמו DataFrame.describe(): עמודת statistic ועמודה
+    לכל עמודה במקור, כך שמספיק להחליף קריאה אחת:
+
+        df.select(cs.numeric()).describe()
+        describe_streaming(pl.scan_csv(path).select(cs.numeric()))
+
+    count, null_count, mean, std, min ו-max מדויקים. האחוזונים מדויקים
+    כל עוד בכל עמודה יש עד capacity ערכים; מעבר לכך הם משוערים.
+
+    Args:
+        source: נתיב (CSV, Parquet, ...), LazyFrame או DataFrame
+        percentiles: האחוזונים לחישוב
+        interpolation: 'nearest' (כמו describe) או 'linear'
+        batch_size: מספר שורות בכל מנה
+        max_workers: מספר תהליכונים (ברירת מחדל: מספר הליבות)
+        capacity: קיבולת סקיצת האחוזונים
+        progress: פונקציה (rows, elapsed, done) לדיווח התקדמות, או None
+
+    Returns:
+        pl.DataFrame: statistic + עמודה לכל עמודה במקור
+    """
+    if isinstance(source, (str, Path)):
+        source = read_source(Path(source))
+    lf = source.lazy()
+    schema = lf.collect_schema()
+    kinds = {name: _describe_kind(dtype) for name, dtype in schema.items()}
+    sketched = [n for n, k in kinds.items() if k in ('numeric', 'boolean', 'temporal')]
+    counted = [n for n, k in kinds.items() if k in ('string', 'other')]
+
+    batches = lf.select(_describe_input(n, k) for n, k in kinds.items()).collect_batches(
+        chunk_size=batch_size)
+    states: Dict[str, ColumnStats] = {n: ColumnStats(capacity) for n in sketched}
+    others: Dict[str, list] = {n: [0, 0, None, None] for n in counted}
+    rows, start = 0, time.perf_counter()
+
+    def merge(result: Tuple[Dict[str, ColumnStats], Dict[str, list], int]) -> None:
+        nonlocal rows
+        batch_states, batch_others, height = result
+        for name, state in batch_states.items():
+            states[name].merge(state)
+        for name, part in batch_others.items():
+            others[name] = _merge_counted(others[name], part)
+        rows += height
+        if progress:
+            progress(rows, time.perf_counter() - start, False)
+
+    workers = max_workers or os.cpu_count() or 1
+    with ThreadPoolExecutor(workers) as pool:
+        pending = deque()
+        for batch in batches:
+            pending.append(pool.submit(_profile_batch, batch, sketched, counted, capacity))
+            if len(pending) >= 2 * workers:
+                merge(pending.popleft().result())
+        while pending:
+            merge(pending.popleft().result())
+    if progress:
+        progress(rows, time.perf_counter() - start, True)
+
+    statistics = ['count', 'null_count', 'mean', 'std', 'min',
+                  *(_percentile_name(q) for q in percentiles), 'max']
+    columns = [pl.Series('statistic', statistics)]
+    for name, kind in kinds.items():
+        if name in others:
+            count, nulls, low, high = others[name]
+            if kind == 'other':
+                # עמודות מקוננות: רק ספירות, כמו ב-describe
+                values = [count, nulls, *([None] * (len(statistics) - 2))]
+                columns.append(pl.Series(name, values, dtype=pl.Float64))
+                continue
+            values = [str(count), str(nulls), None, None, low,
+                      *([None] * len(percentiles)), high]
+            columns.append(pl.Series(name, values, dtype=pl.String))
+            continue
+
+        state = states[name]
+        count, nulls = state.moments.count, state.null_count
+        mean = state.moments.mean if count else None
+        quantiles = [state.sketch.quantile(q, interpolation) if kind != 'boolean' else None
+                     for q in percentiles]
+        if kind != 'temporal':
+            std = state.moments.std if kind == 'numeric' else None
+            values = [count, nulls, mean, std, state.min, *quantiles, state.max]
+            columns.append(pl.Series(name, values, dtype=pl.Float64))
+            continue
+
+        # תאריכים: חזרה מהערך הפיזי לסוג המקורי (ממוצע של Date מוצג כ-Datetime)
+        dtype = schema[name]
+        points = [state.min, *quantiles, state.max]
+        points = pl.Series([None if v is None else int(v) for v in points],
+                           dtype=pl.Int64).cast(dtype).to_list()
+        if mean is not None:
+            if dtype == pl.Date:
+                mean = pl.Series([int(mean * 86_400_000_000)]).cast(pl.Datetime('us'))
+            else:
+                mean = pl.Series([int(mean)]).cast(dtype)
+            mean = mean.to_list()[0]
+        values = [count, nulls, mean, None, *points]
+        columns.append(pl.Series(name, [None if v is None else str(v) for v in values],
+                                 dtype=pl.String))
+    return pl.DataFrame(columns)
+
+
+def demo_describe_streaming(source: str = '../data/contoso_sales.csv', copies: int = 20):
+    """הדגמת describe ב-streaming על קובץ CSV מוגדל"""
+    print_section("📋 5. describe() ב-streaming")
+
+    import polars.selectors as cs
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'contoso_x{}.csv'.format(copies)
+        pl.concat([pl.read_csv(source, try_parse_dates=True)] * copies).write_csv(path)
+        print(f"📁 {path.name}: {path.stat().st_size / 1024 ** 2:.1f} MB")
+
+        start = time.perf_counter()
+        eager = pl.read_csv(path, try_parse_dates=True).describe()
+        eager_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        streamed = describe_streaming(pl.scan_csv(path, try_parse_dates=True),
+                                      batch_size=50_000)
+        streaming_s = time.perf_counter() - start
+
+    print(f"🔹 read_csv().describe(): {eager_s:.2f} שניות | "
+          f"describe_streaming: {streaming_s:.2f} שניות (זיכרון חסום לגודל מנה)")
+    print(streamed.select('statistic', cs.numeric()))
+
+    numeric = [c for c in eager.columns if eager.schema[c] == pl.Float64]
+    exact_rows = ['count', 'null_count', 'mean', 'std', 'min', 'max']
+    diff = (
+        pl.concat([eager.select('statistic', *numeric).with_columns(pl.lit('eager').alias('src')),
+                   streamed.select('statistic', *numeric).with_columns(pl.lit('streaming').alias('src'))])
+        .unpivot(index=['statistic', 'src'])
+        .pivot('src', index=['statistic', 'variable'], values='value')
+        .with_columns(((pl.col('streaming') - pl.col('eager')).abs()
+                       / pl.col('eager').abs().clip(lower_bound=1e-12)).alias('rel_diff'))
+    )
+    exact = diff.filter(pl.col('statistic').is_in(exact_rows))['rel_diff'].max()
+    approx = diff.filter(~pl.col('statistic').is_in(exact_rows))['rel_diff'].max()
+    print(f"\n✅ אותה צורה: {streamed.columns == eager.columns and streamed.height == eager.height}")
+    print(f"✅ count/mean/std/min/max - הפרש יחסי מקסימלי: {exact:.1e}")
+    print(f"✅ אחוזונים (סקיצה) - הפרש יחסי מקסימלי: {approx:.2%}")
+    same_text = (streamed.filter(pl.col('statistic').is_in(exact_rows)).select(cs.string())
+                 .equals(eager.filter(pl.col('statistic').is_in(exact_rows)).select(cs.string())))
+    print(f"✅ עמודות טקסט ותאריכים (ללא אחוזונים) זהות: {same_text}")
+
+
+def main():
+    """הרצת כל הדוגמאות"""
+    demo_rollup_cube()
+    demo_row_reductions()
+    demo_group_apply()
+    demo_sketches()
+    demo_describe_streaming()
+
+    print_section("✅ כל הדוגמאות הושלמו בהצלחה!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,958 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+פרק 5 - כלים מתקדמים לטיפול בערכים חסרים ב-Polars
+==================================================
+
+הרחבה מעשית של polars_missing_values_executable.py: אותן אסטרטגיות מילוי
+(fill_null, interpolate, forward_fill, backward_fill, חציון, טווח...)
+כרכיבים שאפשר להפעיל שוב ושוב על נתונים גדולים.
+
+תוכן:
+    1. Imputer - לומד את ערכי המילוי במעבר אחד, שומר אותם ומחיל אותם
+       בצורה lazy על כל LazyFrame (גם לפי עמודה וגם לפי קבוצה)
+    2. מילוי ואינטרפולציה לפי ישות - מיון אחד, מקטעים רציפים במקביל,
+       ואינטרפולציה משוקללת בזמן לחותמות זמן לא סדירות
+    3. פרופיל ערכים חסרים במעבר אחד - null, NaN, רצפים וחוסר משותף,
+       עם מטמון לכל גרסה של הנתונים
+
+מחבר: מדריך Polars בעברית
+תאריך: 2025
+
+דרישות:
+    pip install polars numpy
+
+שימוש:
+    python polars_missing_values_tools.py
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import polars as pl
+from polars.testing import assert_frame_equal
+
+# קריאת מקורות לפי סוג הקובץ (Polars/dataset_store.py)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from csv_cache import source_stat  # noqa: E402
+from dataset_store import read_source  # noqa: E402
+
+
+def print_section(title):
+    """הדפסת כותרת מדור"""
+    print(f"\n{'='*70}")
+    print(f"  {title}")
+    print(f"{'='*70}\n")
+
+
+def _best_time(run, repeats: int) -> float:
+    """הזמן הטוב ביותר מתוך repeats הרצות"""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+# =============================================================================
+# חלק 1: Imputer - fit / transform
+# =============================================================================
+
+Frame = Union[pl.DataFrame, pl.LazyFrame]
+FillStep = Union[str, Tuple[str, Any]]
+
+# אסטרטגיות שדורשות סטטיסטיקה - נלמדות ב-fit
+_STATISTICS = {
+    'mean': lambda col: col.mean(),
+    'median': lambda col: col.median(),
+    'min': lambda col: col.min(),
+    'max': lambda col: col.max(),
+    'range': lambda col: col.max() - col.min(),
+    'mode': lambda col: col.drop_nulls().mode().sort().first(),
+}
+
+# אסטרטגיות שתלויות רק בסדר השורות - לא נלמדות, מוחלות ב-transform
+_ORDER_FILLS = {
+    'forward': lambda expr, limit: expr.forward_fill(limit),
+    'backward': lambda expr, limit: expr.backward_fill(limit),
+    'interpolate': lambda expr, _: expr.interpolate(),
+    'nearest': lambda expr, _: expr.interpolate(method='nearest'),
+}
+
+
+def _parse_step(step: FillStep) -> Tuple[str, Any]:
+    """
+    נרמול צעד מילוי ל-(סוג, פרמטר)
+
+    'median' / 'interpolate' / ... -> (שם, None)
+    ('forward', 1) / ('backward', 2) -> עם limit
+    ('value', 0) -> ערך קבוע
+    """
+    kind, param = (step, None) if isinstance(step, str) else tuple(step)
+    if kind not in _STATISTICS and kind not in _ORDER_FILLS and kind != 'value':
+        raise ValueError(f"אסטרטגיית מילוי לא מוכרת: {step!r}")
+    return kind, param
+
+
+class Imputer:
+    """
+    מילוי ערכים חסרים בשני שלבים: fit לומד, transform מחיל
+
+    fit מחשב את כל הסטטיסטיקות (ממוצע, חציון, טווח...) של כל העמודות
+    בשאילתה אחת - שאילתות לפי קבוצות רצות יחד עם collect_all וחולקות
+    את אותה סריקה. transform לא סורק שוב את נתוני הלמידה: הוא מוסיף
+    לתוכנית ה-lazy רק fill_null בערכים שנלמדו (ו-join לטבלת הערכים
+    כשהמילוי לפי קבוצה), כך שאפשר להחיל אותו על כל LazyFrame - גם על
+    נתונים חדשים שלא היו ב-fit.
+
+    לכל עמודה אפשר לתת צעד אחד או רשימת צעדים שמוחלים לפי הסדר, למשל
+    ['interpolate', 'backward', 'median']: אינטרפולציה, אחר כך מילוי
+    אחורה להתחלה, ובסוף חציון לקבוצות שכולן null.
+
+    צעדים:
+        'mean', 'median', 'min', 'max', 'range' (max-min), 'mode' - נלמדים ב-fit
+        'forward', 'backward', ('forward', limit), ('backward', limit),
+        'interpolate', 'nearest' - לפי סדר השורות (בתוך הקבוצה כשיש by)
+        ('value', x) - ערך קבוע
+
+    Args:
+        strategies: עמודה -> צעד או רשימת צעדים
+        by: עמודות קבוצה לכל העמודות, או מילון עמודה -> עמודות קבוצה.
+            קבוצה שלא הייתה ב-fit מקבלת את הערך הכללי של העמודה
+        nan_as_null: להמיר NaN ל-null לפני fit ו-transform
+    """
+
+    def __init__(self, strategies: Dict[str, Union[FillStep, List[FillStep]]],
+                 by: Optional[Union[str, Sequence[str], Dict[str, Union[str, Sequence[str]]]]] = None,
+                 nan_as_null: bool = True):
+        self.steps = {
+            column: [_parse_step(s) for s in (spec if isinstance(spec, list) else [spec])]
+            for column, spec in strategies.items()
+        }
+
+        def as_key(columns) -> Tuple[str, ...]:
+            return (columns,) if isinstance(columns, str) else tuple(columns or ())
+
+        if isinstance(by, dict):
+            self.by = {column: as_key(by.get(column)) for column in self.steps}
+        else:
+            self.by = {column: as_key(by) for column in self.steps}
+        self.nan_as_null = nan_as_null
+        self.global_stats: Optional[pl.DataFrame] = None
+        self.group_stats: Dict[Tuple[str, ...], pl.DataFrame] = {}
+
+    @staticmethod
+    def _stat_name(column: str, statistic: str) -> str:
+        """שם העמודה של סטטיסטיקה בטבלאות הערכים"""
+        return f'{column}__{statistic}'
+
+    def _statistics(self) -> Dict[Tuple[str, ...], List[Tuple[str, str]]]:
+        """קבוצה -> [(עמודה, סטטיסטיקה)] שצריך ללמוד"""
+        needed: Dict[Tuple[str, ...], List[Tuple[str, str]]] = {}
+        for column, steps in self.steps.items():
+            for kind, _ in steps:
+                if kind in _STATISTICS:
+                    needed.setdefault(self.by[column], []).append((column, kind))
+        return needed
+
+    def _prepare(self, source: Frame) -> pl.LazyFrame:
+        """LazyFrame, עם NaN -> null בעמודות הצפות (אם nan_as_null)"""
+        lf = source.lazy()
+        if not self.nan_as_null:
+            return lf
+        schema = lf.collect_schema()
+        floats = [c for c in self.steps if schema[c].is_float()]
+        return lf.with_columns(pl.col(floats).fill_nan(None)) if floats else lf
+
+    def fit(self, source: Frame) -> 'Imputer':
+        """
+        לימוד ערכי המילוי - מעבר אחד על הנתונים
+
+        Args:
+            source: DataFrame או LazyFrame (למשל pl.scan_parquet)
+
+        Returns:
+            Imputer: self
+        """
+        lf = self._prepare(source)
+        needed = self._statistics()
+
+        def exprs(pairs):
+            return [_STATISTICS[stat](pl.col(column)).alias(self._stat_name(column, stat))
+                    for column, stat in pairs]
+
+        # ערכים כלליים לכל הסטטיסטיקות (גם כברירת מחדל לקבוצות חדשות)
+        all_pairs = [pair for pairs in needed.values() for pair in pairs]
+        grouped = [key for key in needed if key]
+        queries = [lf.select(exprs(all_pairs))]
+        queries += [lf.group_by(list(key)).agg(exprs(needed[key])) for key in grouped]
+        results = pl.collect_all(queries)
+
+        self.global_stats = results[0]
+        self.group_stats = dict(zip(grouped, results[1:]))
+        return self
+
+    def _fill_expr(self, column: str) -> pl.Expr:
+        """ביטוי המילוי של עמודה אחת - כל הצעדים לפי הסדר"""
+        by = list(self.by[column])
+        expr = pl.col(column)
+        for kind, param in self.steps[column]:
+            if kind == 'value':
+                expr = expr.fill_null(pl.lit(param))
+            elif kind in _STATISTICS:
+                name = self._stat_name(column, kind)
+                value = pl.lit(self.global_stats[name][0], dtype=self.global_stats.schema[name])
+                if by:
+                    value = pl.col(f'__imputer__{name}').fill_null(value)
+                expr = expr.fill_null(value)
+            else:
+                expr = _ORDER_FILLS[kind](expr, param)
+                if by:
+                    expr = expr.over(by)
+        return expr
+
+    def transform(self, source: Frame) -> pl.LazyFrame:
+        """
+        החלת ערכי המילוי - lazy, בלי לסרוק שוב את נתוני הלמידה
+
+        סדר השורות נשמר. מילוי לפי סדר (forward, interpolate...) משתמש בסדר
+        השורות הקיים, לכן מיינו לפני כן (למשל לפי זמן).
+
+        Args:
+            source: DataFrame או LazyFrame
+
+        Returns:
+            pl.LazyFrame: אותן עמודות, עם הערכים החסרים ממולאים
+        """
+        if self.global_stats is None:
+            raise RuntimeError("יש לקרוא ל-fit (או load) לפני transform")
+        lf = self._prepare(source)
+        columns = lf.collect_schema().names()
+
+        helpers = []
+        for key, stats in self.group_stats.items():
+            values = [c for c in stats.columns if c not in key]
+            lf = lf.join(
+                stats.lazy().rename({c: f'__imputer__{c}' for c in values}),
+                on=list(key), how='left', maintain_order='left', nulls_equal=True,
+            )
+            helpers += [f'__imputer__{c}' for c in values]
+
+        lf = lf.with_columns(self._fill_expr(column) for column in self.steps)
+        return lf.select(columns) if helpers else lf
+
+    def fit_transform(self, source: Frame) -> pl.LazyFrame:
+        """fit ואז transform על אותם נתונים"""
+        return self.fit(source).transform(source)
+
+    # -------------------------------------------------------------------------
+    # שמירה וטעינה
+    # -------------------------------------------------------------------------
+
+    def save(self, path: Union[str, Path]) -> None:
+        """
+        שמירת ה-Imputer לתיקייה: imputer.json (ההגדרות) וקבצי Parquet לערכים
+
+        Args:
+            path: תיקיית היעד (ערכים קבועים בצעדי 'value' חייבים להיות JSON)
+        """
+        if self.global_stats is None:
+            raise RuntimeError("אין מה לשמור - יש לקרוא ל-fit קודם")
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        self.global_stats.write_parquet(path / 'global.parquet')
+        groups = []
+        for i, (key, stats) in enumerate(self.group_stats.items()):
+            stats.write_parquet(path / f'groups_{i}.parquet')
+            groups.append(list(key))
+        meta = {
+            'steps': {c: [list(step) for step in steps] for c, steps in self.steps.items()},
+            'by': {c: list(key) for c, key in self.by.items()},
+            'nan_as_null': self.nan_as_null,
+            'groups': groups,
+        }
+        with open(path / 'imputer.json', 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'Imputer':
+        """טעינת Imputer שנשמר ב-save"""
+        path = Path(path)
+        with open(path / 'imputer.json', encoding='utf-8') as f:
+            meta = json.load(f)
+        imputer = cls({c: [tuple(step) for step in steps] for c, steps in meta['steps'].items()},
+                      by=meta['by'], nan_as_null=meta['nan_as_null'])
+        imputer.global_stats = pl.read_parquet(path / 'global.parquet')
+        imputer.group_stats = {
+            tuple(key): pl.read_parquet(path / f'groups_{i}.parquet')
+            for i, key in enumerate(meta['groups'])
+        }
+        return imputer
+
+
+def make_sensor_frame(n_rows: int = 2_000_000, n_sensors: int = 1_000,
+                      null_fraction: float = 0.1, seed: int = 0) -> pl.DataFrame:
+    """
+    נתוני חיישנים לדוגמה: קריאה לכל חיישן בכל דקה, עם ערכים חסרים
+
+    Args:
+        n_rows: מספר שורות
+        n_sensors: מספר חיישנים
+        null_fraction: חלק הקריאות החסרות בכל עמודה
+        seed: זרע לאקראיות
+    """
+    rng = np.random.default_rng(seed)
+    sensor = np.arange(n_rows) % n_sensors
+    minute = np.arange(n_rows) // n_sensors
+    base = rng.normal(20, 5, n_sensors)[sensor]
+
+    def with_nulls(values: np.ndarray) -> pl.Series:
+        return pl.Series(values).scatter(
+            np.flatnonzero(rng.random(n_rows) < null_fraction), None)
+
+    return pl.DataFrame({
+        'sensor': sensor,
+        'minute': minute,
+        'temperature': with_nulls(base + rng.normal(0, 1, n_rows)),
+        'humidity': with_nulls(np.clip(rng.normal(50, 15, n_rows), 0, 100)),
+        'status': with_nulls(rng.choice(np.array(['ok', 'ok', 'ok', 'warn', 'error']), n_rows)),
+    })
+
+
+SENSOR_STRATEGIES = {
+    'temperature': ['interpolate', 'median'],
+    'humidity': [('forward', 5), 'mean'],
+    'status': 'mode',
+}
+
+
+def naive_fill(frame: Frame) -> pl.LazyFrame:
+    """
+    המילוי של היום: כל fill מחשב את הסטטיסטיקה שלו מחדש על הנתונים
+    שהוא מקבל (ולכן כדי למלא נתונים חדשים לפי ההיסטוריה - סורקים הכל)
+    """
+    return frame.lazy().with_columns(
+        pl.col('temperature').interpolate().over('sensor')
+        .fill_null(pl.col('temperature').median().over('sensor'))
+        .fill_null(pl.col('temperature').median()),
+        pl.col('humidity').forward_fill(5).over('sensor')
+        .fill_null(pl.col('humidity').mean().over('sensor'))
+        .fill_null(pl.col('humidity').mean()),
+        pl.col('status').fill_null(pl.col('status').drop_nulls().mode().sort().first()),
+    )
+
+
+def demo_imputer(source: str = '../data/temperatures.csv', n_rows: int = 2_000_000):
+    """הדגמת Imputer"""
+    print_section("🩹 1. Imputer - fit / transform")
+
+    # אותן אסטרטגיות כמו ב-polars_missing_values_executable.py
+    df = pl.read_csv(source, try_parse_dates=True)
+    temp = pl.col('avg_temp_celsius')
+    expected = df.with_columns(temp.fill_nan(None)).with_columns(
+        temp.fill_null(temp.median()).alias('median'),
+        temp.fill_null(temp.max() - temp.min()).alias('range'),
+        temp.fill_null(strategy='mean').alias('mean'),
+        temp.interpolate().forward_fill().backward_fill().alias('chain'),
+    )
+    imputed = pl.concat([
+        Imputer({'avg_temp_celsius': strategy}).fit_transform(df).collect()
+        .select(pl.col('avg_temp_celsius').alias(name))
+        for name, strategy in [('median', 'median'), ('range', 'range'), ('mean', 'mean'),
+                               ('chain', ['interpolate', 'forward', 'backward'])]
+    ], how='horizontal')
+    print("🔹 Imputer מול fill_null / interpolate מהפרק:")
+    print(pl.concat([df, imputed], how='horizontal'))
+    print(f"✅ זהה: {imputed.equals(expected.select(imputed.columns))}")
+
+    print(f"\n🔹 נתוני חיישנים: {n_rows:,} שורות היסטוריה, מילוי לפי חיישן")
+    history = make_sensor_frame(n_rows)
+    imputer = Imputer(SENSOR_STRATEGIES, by={'temperature': 'sensor', 'humidity': 'sensor'})
+
+    start = time.perf_counter()
+    imputer.fit(history.lazy())
+    print(f"   fit (מעבר אחד): {time.perf_counter() - start:.2f} שניות")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        imputer.save(tmp)
+        files = ', '.join(sorted(p.name for p in Path(tmp).iterdir()))
+        imputer = Imputer.load(tmp)
+    print(f"   💾 נשמר ונטען: {files}")
+
+    batches = [make_sensor_frame(n_rows // 20, seed=seed) for seed in range(1, 11)]
+    filled = imputer.transform(batches[0].lazy())
+    print("\n🔹 תוכנית ה-lazy של transform (ללא סריקה של ההיסטוריה):")
+    print(filled.explain())
+    print(filled.collect().head())
+
+    # בלי Imputer: כדי למלא מנה חדשה לפי ההיסטוריה צריך לסרוק את כולה
+    def naive():
+        for batch in batches:
+            naive_fill(pl.concat([history, batch])).tail(batch.height).collect()
+
+    def fitted():
+        for batch in batches:
+            imputer.transform(batch).collect()
+
+    naive_s, fitted_s = _best_time(naive, 1), _best_time(fitted, 1)
+    print(f"\n🔹 מילוי {len(batches)} מנות חדשות לפי ההיסטוריה:")
+    print(f"   סטטיסטיקה מחדש בכל פעם: {naive_s:.2f} שניות")
+    print(f"   Imputer.transform:       {fitted_s:.2f} שניות (x{naive_s / fitted_s:.0f})")
+
+
+# =============================================================================
+# חלק 2: מילוי ואינטרפולציה לפי ישות (Segment Fill)
+# =============================================================================
+
+_SEGMENT_FILLS = ('forward', 'backward', 'interpolate', 'time')
+
+
+class _Segments:
+    """
+    מקטעי הישויות בחלק רציף של טבלה ממוינת לפי (ישות, זמן)
+
+    לכל שורה: תחילת וסוף המקטע שלה. כל צעדי המילוי עובדים על מערכי
+    אינדקסים: "הערך התקף הקודם" הוא מקסימום מצטבר של האינדקסים התקפים,
+    והמילוי חוקי רק אם הוא בתוך אותו מקטע. אין קיבוץ ואין איסוף מחדש.
+
+    Args:
+        starts: אינדקסי תחילת המקטעים (ממוינים, הראשון 0)
+        n_rows: מספר השורות
+        position: זמן כמספר לכל שורה (לאינטרפולציה משוקללת בזמן), או None
+    """
+
+    def __init__(self, starts: np.ndarray, n_rows: int, position: Optional[np.ndarray]):
+        lengths = np.diff(np.append(starts, n_rows))
+        self.index = np.arange(n_rows)
+        self.start = np.repeat(starts, lengths)
+        self.end = np.repeat(starts + lengths - 1, lengths)
+        self.position = position
+
+    def previous(self, valid: np.ndarray) -> np.ndarray:
+        """אינדקס הערך התקף האחרון עד כל שורה (-1 אם אין)"""
+        return np.maximum.accumulate(np.where(valid, self.index, -1))
+
+    def following(self, valid: np.ndarray) -> np.ndarray:
+        """אינדקס הערך התקף הבא מכל שורה (n אם אין)"""
+        n = len(self.index)
+        return np.minimum.accumulate(np.where(valid, self.index, n)[::-1])[::-1]
+
+
+def _masked(values: pl.Series, keep: np.ndarray) -> pl.Series:
+    """values עם null בכל מקום ש-keep הוא False"""
+    return values.to_frame('v').select(
+        pl.when(pl.lit(pl.Series(keep))).then(pl.col('v'))
+    ).to_series().alias(values.name)
+
+
+def _segment_step(series: pl.Series, kind: str, limit: Optional[int],
+                  segments: _Segments) -> pl.Series:
+    """צעד מילוי אחד בתוך המקטעים - מחזיר Series חדש"""
+    valid = series.is_not_null().to_numpy()
+    index = segments.index
+
+    if kind in ('forward', 'backward'):
+        if kind == 'forward':
+            source = segments.previous(valid)
+            ok = source >= segments.start
+        else:
+            source = segments.following(valid)
+            ok = source <= segments.end
+        if limit is not None:
+            ok &= np.abs(index - source) <= limit
+        ok |= valid
+        return _masked(series.gather(np.where(ok, source, index)), ok)
+
+    # interpolate: לפי מספר השורה, כמו Expr.interpolate()
+    # time: לפי הזמן, כמו Expr.interpolate_by(time)
+    before, after = segments.previous(valid), segments.following(valid)
+    inside = ~valid & (before >= segments.start) & (after <= segments.end)
+    left, right = np.where(inside, before, index), np.where(inside, after, index)
+    values = series.cast(pl.Float64).to_numpy()
+    position = index if kind == 'interpolate' else segments.position
+    with np.errstate(invalid='ignore', divide='ignore'):
+        weight = (position - position[left]) / (position[right] - position[left])
+    weight = np.where(inside, np.nan_to_num(weight, nan=0.0), 0.0)
+    filled = np.where(inside, values[left] + (values[right] - values[left]) * weight, values)
+    dtype = series.dtype if series.dtype.is_float() else pl.Float64
+    return _masked(pl.Series(series.name, filled), valid | inside).cast(dtype)
+
+
+def fill_by_entity(frame: Frame, entity: Union[str, Sequence[str]], time_column: str,
+                   strategies: Dict[str, Union[FillStep, List[FillStep]]],
+                   *,
+                   max_workers: Optional[int] = None,
+                   chunks_per_worker: int = 4,
+                   maintain_order: bool = False) -> pl.DataFrame:
+    """
+    מילוי ואינטרפולציה לכל ישות (חיישן, לקוח...) בטבלה שבה הישויות משולבות
+
+    במקום `.over(entity)` לכל עמודה ולכל פעולה (כל אחד מקבץ ואוסף את
+    השורות מחדש):
+    - הטבלה ממוינת פעם אחת לפי (ישות, זמן), כך שכל ישות היא מקטע רציף
+    - גבולות המקטעים מחושבים פעם אחת, וכל צעד מילוי הוא כמה פעולות
+      NumPy לינאריות על מערכי אינדקסים (ראו _Segments)
+    - הטבלה מחולקת לחלקים שמתחילים בגבול מקטע, והחלקים מחושבים במקביל
+      בתהליכונים (NumPy ו-Polars משחררים את ה-GIL)
+
+    צעדים (אחד או רשימה, לפי הסדר):
+        'forward', 'backward', ('forward', limit), ('backward', limit)
+        'interpolate' - לינארית לפי מיקום, כמו interpolate()
+        'time' - לינארית משוקללת בזמן, כמו interpolate_by(time_column),
+                 לחותמות זמן לא סדירות
+
+    Args:
+        frame: הנתונים
+        entity: עמודת (או עמודות) הישות
+        time_column: עמודת הזמן (תאריך/שעה או מספר)
+        strategies: עמודה -> צעד או רשימת צעדים
+        max_workers: מספר תהליכונים (ברירת מחדל: מספר הליבות)
+        chunks_per_worker: מספר חלקים לכל תהליכון (לאיזון עומסים)
+        maintain_order: להחזיר בסדר השורות המקורי (מיון נוסף)
+
+    Returns:
+        pl.DataFrame: ממוין לפי (ישות, זמן), או בסדר המקורי
+    """
+    entity = [entity] if isinstance(entity, str) else list(entity)
+    steps = {
+        column: [(step, None) if isinstance(step, str) else tuple(step)
+                 for step in (spec if isinstance(spec, list) else [spec])]
+        for column, spec in strategies.items()
+    }
+    for column, column_steps in steps.items():
+        for kind, _ in column_steps:
+            if kind not in _SEGMENT_FILLS:
+                raise ValueError(f"צעד לא נתמך ב-fill_by_entity: {kind!r} ({column})")
+
+    df = frame.lazy().collect() if isinstance(frame, pl.LazyFrame) else frame
+    if maintain_order:
+        df = df.with_row_index('__order')
+    if df[time_column].is_sorted():
+        # נתונים שמגיעים לפי זמן: מיון יציב לפי הישות בלבד מספיק (וזול יותר)
+        df = df.sort(*entity, maintain_order=True)
+    else:
+        df = df.sort(*entity, time_column)
+
+    # גבולות המקטעים - פעם אחת, לכל הטבלה
+    changed = pl.any_horizontal(pl.col(e).ne_missing(pl.col(e).shift(1)) for e in entity)
+    starts = df.select(changed.fill_null(True).arg_true()).to_series().to_numpy()
+    needs_time = any(kind == 'time' for column_steps in steps.values() for kind, _ in column_steps)
+    time_values = df[time_column].to_physical().cast(pl.Float64).to_numpy() if needs_time else None
+
+    workers = max_workers or os.cpu_count() or 1
+    n_chunks = max(1, min(len(starts), workers * chunks_per_worker))
+    # כל נקודת חיתוך היא תחילת המקטע שמכיל את היעד (לא אחריו - כך האינדקס
+    # לא חורג גם כשהמקטע האחרון ארוך מחלק שלם)
+    targets = np.linspace(0, df.height, n_chunks + 1)[:-1]
+    cuts = (np.unique(starts[np.searchsorted(starts, targets, side='right') - 1])
+            if len(starts) else np.zeros(1, dtype=np.int64))
+    bounds = list(zip(cuts, list(cuts[1:]) + [df.height]))
+
+    def run(bound: Tuple[int, int]) -> pl.DataFrame:
+        start, stop = bound
+        part = df.slice(start, stop - start)
+        local_starts = starts[(starts >= start) & (starts < stop)] - start
+        segments = _Segments(local_starts, part.height,
+                             time_values[start:stop] if needs_time else None)
+        filled = []
+        for column, column_steps in steps.items():
+            series = part[column]
+            for kind, param in column_steps:
+                series = _segment_step(series, kind, param, segments)
+            filled.append(series)
+        return part.with_columns(filled)
+
+    if len(bounds) == 1 or workers == 1:
+        parts = [run(bound) for bound in bounds]
+    else:
+        with ThreadPoolExecutor(workers) as pool:
+            parts = list(pool.map(run, bounds))
+    result = pl.concat(parts)
+    if maintain_order:
+        result = result.sort('__order').drop('__order')
+    return result
+
+
+def naive_over_fill(frame: Frame, entity: str, time_column: str) -> pl.DataFrame:
+    """אותו מילוי בדרך הנאיבית: מיון לפי זמן ו-over(entity) לכל עמודה"""
+    return (
+        frame.lazy()
+        .sort(time_column)
+        .with_columns(
+            pl.col('temperature').interpolate_by(time_column).over(entity),
+            pl.col('humidity').forward_fill(3).over(entity).backward_fill().over(entity),
+            pl.col('status').forward_fill().over(entity),
+        )
+        .collect()
+    )
+
+
+def make_irregular_sensors(n_sensors: int = 100_000, readings: int = 20,
+                           null_fraction: float = 0.2, seed: int = 0) -> pl.DataFrame:
+    """
+    נתוני חיישנים בחותמות זמן לא סדירות, משולבים לפי זמן (כמו שהם מגיעים)
+    """
+    frame = make_sensor_frame(n_sensors * readings, n_sensors, null_fraction, seed)
+    rng = np.random.default_rng(seed)
+    seconds = frame['minute'].to_numpy() * 60 + rng.integers(0, 45, frame.height)
+    return frame.with_columns(
+        (pl.datetime(2024, 1, 1) + pl.duration(seconds=pl.Series(seconds))).alias('time')
+    ).sort('time').drop('minute')
+
+
+def demo_segment_fill(n_sensors: int = 100_000, readings: int = 20):
+    """הדגמת מילוי ואינטרפולציה לפי ישות"""
+    print_section("🧵 2. מילוי ואינטרפולציה לפי ישות")
+
+    small = pl.DataFrame({
+        'sensor': ['a', 'b', 'a', 'b', 'a', 'b', 'a', 'b'],
+        'time': [0, 0, 1, 4, 5, 5, 9, 6],
+        'value': [1.0, None, None, 2.0, None, None, 9.0, 4.0],
+    })
+    print("🔹 חותמות זמן לא סדירות - אינטרפולציה לפי שורה מול לפי זמן:")
+    print(fill_by_entity(small, 'sensor', 'time', {'value': 'interpolate'}).with_columns(
+        fill_by_entity(small, 'sensor', 'time', {'value': 'time'})['value'].alias('value_time'),
+    ))
+
+    # ישויות בגדלים שונים: המקטע האחרון ארוך מחלק שלם (נקודות החיתוך לא חורגות)
+    uneven = pl.DataFrame({'e': ['a', 'b', 'b', 'b'], 't': [0, 0, 1, 2],
+                           'v': [1.0, 2.0, None, 3.0]})
+    uneven_ok = all(
+        fill_by_entity(uneven, 'e', 't', {'v': 'interpolate'}, max_workers=w)['v'].to_list()
+        == [1.0, 2.0, 2.5, 3.0]
+        for w in (1, 2, 4, 8)
+    )
+    print(f"✅ ישויות לא שוות (1 ו-3 שורות), 1-8 תהליכונים: {uneven_ok}")
+
+    frame = make_irregular_sensors(n_sensors, readings)
+    print(f"\n🔹 {n_sensors:,} חיישנים משולבים, {frame.height:,} שורות "
+          f"({frame['temperature'].null_count():,} טמפרטורות חסרות)")
+    strategies = {
+        'temperature': 'time',
+        'humidity': [('forward', 3), 'backward'],
+        'status': 'forward',
+    }
+
+    segmented = fill_by_entity(frame, 'sensor', 'time', strategies)
+    naive = naive_over_fill(frame, 'sensor', 'time').sort('sensor', 'time')
+    try:
+        assert_frame_equal(segmented, naive, check_exact=False)
+        same = True
+    except AssertionError:
+        same = False
+    print(f"✅ זהה ל-over() (עד שגיאת עיגול): {same}")
+
+    naive_s = _best_time(lambda: naive_over_fill(frame, 'sensor', 'time'), 3)
+    segment_s = _best_time(lambda: fill_by_entity(frame, 'sensor', 'time', strategies), 3)
+    print(f"   over() לכל עמודה:  {naive_s:.2f} שניות")
+    print(f"   fill_by_entity:     {segment_s:.2f} שניות (x{naive_s / segment_s:.1f}, "
+          f"{os.cpu_count()} ליבות)")
+
+
+# =============================================================================
+# חלק 3: פרופיל ערכים חסרים במעבר אחד (Missingness Profile)
+# =============================================================================
+
+def _gap_runs(mask: np.ndarray) -> Tuple[int, int, int]:
+    """
+    רצפי True בעמודה בוליאנית
+
+    Returns:
+        Tuple: (הרצף הארוך ביותר, רצף בתחילת המערך, רצף בסוף המערך)
+    """
+    edges = np.diff(np.concatenate(([0], mask.view(np.int8), [0])))
+    starts, ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+    if not len(starts):
+        return 0, 0, 0
+    lengths = ends - starts
+    leading = int(lengths[0]) if starts[0] == 0 else 0
+    trailing = int(lengths[-1]) if ends[-1] == len(mask) else 0
+    return int(lengths.max()), leading, trailing
+
+
+class MissingnessProfile:
+    """
+    תוצאת פרופיל ערכים חסרים
+
+    Attributes:
+        rows: מספר השורות
+        summary: שורה לכל עמודה - nulls, nans, missing, fraction,
+            longest_gap (הרצף הארוך ביותר של שורות חסרות ברצף)
+        co_missing: מטריצה - בכמה שורות שתי העמודות חסרות יחד
+            (האלכסון = missing של העמודה)
+    """
+
+    def __init__(self, rows: int, summary: pl.DataFrame, co_missing: pl.DataFrame):
+        self.rows = rows
+        self.summary = summary
+        self.co_missing = co_missing
+
+    def missing_together(self, min_share: float = 0.5) -> pl.DataFrame:
+        """
+        זוגות עמודות שחסרות בדרך כלל יחד
+
+        Args:
+            min_share: חלק מינימלי מהשורות החסרות של העמודה הראשונה
+
+        Returns:
+            pl.DataFrame: column, other, rows, share
+        """
+        missing = dict(zip(self.summary['column'], self.summary['missing']))
+        return (
+            self.co_missing.unpivot(index='column', variable_name='other', value_name='rows')
+            .filter(pl.col('column') != pl.col('other'), pl.col('rows') > 0)
+            .with_columns((pl.col('rows') / pl.col('column').replace_strict(missing)).alias('share'))
+            .filter(pl.col('share') >= min_share)
+            .sort('share', descending=True)
+        )
+
+
+class MissingnessProfiler:
+    """
+    פרופיל ערכים חסרים במעבר אחד, עם מטמון לכל גרסה של הנתונים
+
+    במקום null_count(), is_null().sum(), filter(...).shape[0] ו-is_nan().sum()
+    - כל אחד סריקה נפרדת - המקור נקרא פעם אחת ב-streaming (collect_batches),
+    ורק מסכות null/NaN בוליאניות עוברות מ-Polars ל-NumPy. מכל מנה
+    נצברים: ספירות, רצפי חוסר (כולל רצף שממשיך מהמנה הקודמת) ומטריצת
+    חוסר משותף (מכפלת מטריצות של המסכות).
+
+    התוצאה נשמרת במטמון לפי גרסת המקור, כך שהחלטות מילוי בהמשך לא
+    סורקות שוב:
+    - נתיב לקובץ: הנתיב, זמן השינוי והגודל (csv_cache.source_stat)
+    - DataFrame / LazyFrame: האובייקט עצמו, הגרסה המפורשת (version),
+      מספר השורות והסכמה - בלי מעבר על הנתונים, כך שפגיעה במטמון עולה
+      מיקרו-שניות. מי שמשנה DataFrame במקום (df[i, c] = ...) מעלה את
+      version; פעולות רגילות ב-Polars מחזירות אובייקט חדש ממילא
+    - הרשומה נמחקת כשהאובייקט נמחק
+
+    Args:
+        batch_size: מספר שורות בכל מנה
+    """
+
+    def __init__(self, batch_size: int = 100_000):
+        self.batch_size = batch_size
+        self.hits = 0
+        self.misses = 0
+        self._cache: Dict[Any, MissingnessProfile] = {}
+
+    def _cache_key(self, source: Union[str, Path, Frame], columns: Optional[Sequence[str]],
+                   version: Any) -> Any:
+        """מפתח המטמון: זהות המקור, הגרסה והעמודות"""
+        columns = tuple(columns) if columns is not None else None
+        if isinstance(source, (str, Path)):
+            path = Path(source).resolve()
+            if version is None:
+                version = tuple(source_stat(path).values())
+            return ('path', str(path), version, columns)
+        if isinstance(source, pl.DataFrame):
+            version = (version, source.height, tuple(source.schema.items()))
+        return ('frame', id(source), version, columns)
+
+    def profile(self, source: Union[str, Path, Frame],
+                columns: Optional[Sequence[str]] = None,
+                version: Any = None) -> MissingnessProfile:
+        """
+        פרופיל ערכים חסרים - מהמטמון אם הגרסה לא השתנתה
+
+        Args:
+            source: נתיב, DataFrame או LazyFrame (נקרא ב-streaming)
+            columns: עמודות לבדיקה (ברירת מחדל: כולן)
+            version: גרסה מפורשת של הנתונים - מעלים אותה אחרי שינוי במקום
+
+        Returns:
+            MissingnessProfile: התוצאה
+        """
+        key = self._cache_key(source, columns, version)
+        if key in self._cache:
+            self.hits += 1
+            return self._cache[key]
+        self.misses += 1
+
+        result = self._compute(read_source(Path(source)) if isinstance(source, (str, Path))
+                               else source, columns)
+        self._cache[key] = result
+        if key[0] == 'frame':
+            weakref.finalize(source, self._cache.pop, key, None)
+        return result
+
+    def invalidate(self) -> None:
+        """ריקון המטמון"""
+        self._cache.clear()
+
+    def _compute(self, source: Frame, columns: Optional[Sequence[str]]) -> MissingnessProfile:
+        """המעבר היחיד על הנתונים"""
+        lf = source.lazy()
+        schema = lf.collect_schema()
+        columns = list(columns) if columns is not None else schema.names()
+        floats = [c for c in columns if schema[c].is_float()]
+        masks = [pl.col(c).is_null().alias(f'{c}__null') for c in columns]
+        masks += [pl.col(c).is_nan().fill_null(False).alias(f'{c}__nan') for c in floats]
+
+        k = len(columns)
+        nulls = np.zeros(k, dtype=np.int64)
+        nans = np.zeros(k, dtype=np.int64)
+        co_missing = np.zeros((k, k), dtype=np.int64)
+        longest = np.zeros(k, dtype=np.int64)
+        carry = np.zeros(k, dtype=np.int64)
+        float_index = [columns.index(c) for c in floats]
+        rows = 0
+
+        for batch in lf.select(masks).collect_batches(chunk_size=self.batch_size):
+            null_mask = batch.select(f'{c}__null' for c in columns).to_numpy()
+            missing = null_mask.copy()
+            nulls += null_mask.sum(axis=0)
+            if floats:
+                nan_mask = batch.select(f'{c}__nan' for c in floats).to_numpy()
+                nans[float_index] += nan_mask.sum(axis=0)
+                missing[:, float_index] |= nan_mask
+
+            # חוסר משותף: מכפלת מסכות (float32 מדויק עד 2^24 שורות במנה)
+            as_float = missing.astype(np.float32)
+            co_missing += np.rint(as_float.T @ as_float).astype(np.int64)
+
+            # רצפים: רצף שנפתח במנה קודמת ממשיך לתחילת המנה הזו
+            for i in range(k):
+                run, leading, trailing = _gap_runs(np.ascontiguousarray(missing[:, i]))
+                if leading == batch.height:
+                    carry[i] += leading
+                    longest[i] = max(longest[i], carry[i])
+                else:
+                    longest[i] = max(longest[i], carry[i] + leading, run)
+                    carry[i] = trailing
+            rows += batch.height
+
+        missing_total = nulls + nans
+        summary = pl.DataFrame({
+            'column': columns,
+            'dtype': [str(schema[c]) for c in columns],
+            'nulls': nulls,
+            'nans': nans,
+            'missing': missing_total,
+            'fraction': missing_total / rows if rows else np.zeros(k),
+            'longest_gap': longest,
+        })
+        matrix = pl.DataFrame({'column': columns}).with_columns(
+            pl.Series(c, co_missing[:, i]) for i, c in enumerate(columns)
+        )
+        return MissingnessProfile(rows, summary, matrix)
+
+
+_default_profiler: Optional[MissingnessProfiler] = None
+
+
+def missingness_profile(source: Union[str, Path, Frame],
+                        columns: Optional[Sequence[str]] = None,
+                        version: Any = None) -> MissingnessProfile:
+    """
+    פרופיל ערכים חסרים עם המטמון המשותף (ראו MissingnessProfiler)
+
+    Args:
+        source: נתיב, DataFrame או LazyFrame
+        columns: עמודות לבדיקה (ברירת מחדל: כולן)
+        version: גרסה מפורשת של הנתונים (אופציונלי)
+
+    Returns:
+        MissingnessProfile: התוצאה
+    """
+    global _default_profiler
+    if _default_profiler is None:
+        _default_profiler = MissingnessProfiler()
+    return _default_profiler.profile(source, columns, version)
+
+
+def separate_counts(lf: pl.LazyFrame, column: str) -> Dict[str, int]:
+    """הספירות של חלק 1 בפרק - כל אחת שאילתה (וסריקה) נפרדת"""
+    counts = {
+        'null_count': lf.select(pl.col(column).null_count()).collect().item(),
+        'is_null_sum': lf.select(pl.col(column).is_null().sum()).collect().item(),
+        'filter_len': lf.filter(pl.col(column).is_null()).select(pl.len()).collect().item(),
+        'shape': lf.filter(pl.col(column).is_null()).collect().shape[0],
+    }
+    if lf.collect_schema()[column].is_float():
+        counts['is_nan_sum'] = lf.select(pl.col(column).is_nan().sum()).collect().item()
+    return counts
+
+
+def demo_missingness_profile(source: str = '../data/temperatures.csv',
+                             n_rows: int = 2_000_000):
+    """הדגמת פרופיל ערכים חסרים"""
+    print_section("🔎 3. פרופיל ערכים חסרים במעבר אחד")
+
+    profiler = MissingnessProfiler()
+    profile = profiler.profile(source)
+    print(f"🔹 {source} ({profile.rows} שורות):")
+    print(profile.summary)
+    counts = separate_counts(pl.scan_csv(source), 'avg_temp_celsius')
+    row = profile.summary.row(1, named=True)
+    print(f"✅ זהה לספירות של הפרק: {counts['null_count'] == row['nulls']}, "
+          f"{counts['is_nan_sum'] == row['nans']}")
+
+    # מסודר לפי חיישן, כך שרצף שורות חסרות = רצף דקות חסרות של חיישן
+    frame = make_sensor_frame(n_rows).sort('sensor', 'minute')
+    # תקלת gateway: לחות וסטטוס לא נשלחו במשך 30 דקות; NaN מהחיישן עצמו
+    outage = pl.col('minute').is_between(1_000, 1_029)
+    frame = frame.with_columns(
+        pl.when(~outage).then(pl.col('humidity', 'status')).name.keep(),
+    ).with_columns(
+        pl.when(pl.int_range(pl.len()) % 97 == 0).then(float('nan'))
+        .otherwise(pl.col('temperature')).alias('temperature'),
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'sensors.parquet'
+        frame.write_parquet(path)
+        lf = pl.scan_parquet(path)
+
+        start = time.perf_counter()
+        for column in ('temperature', 'humidity', 'status'):
+            separate_counts(lf, column)
+        separate_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        profile = profiler.profile(path)
+        profile_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        profiler.profile(path)
+        cached_s = time.perf_counter() - start
+
+    print(f"\n🔹 {n_rows:,} שורות חיישנים (Parquet):")
+    print(profile.summary)
+    print("\n🔹 חוסר משותף (מספר שורות):")
+    print(profile.co_missing)
+    print("\n🔹 עמודות שחסרות יחד:")
+    print(profile.missing_together(0.05))
+
+    print(f"\n⏱️ ספירות נפרדות (כמו בפרק) × 3 עמודות: {separate_s:.2f} שניות")
+    print(f"⏱️ פרופיל במעבר אחד: {profile_s:.2f} שניות | "
+          f"מהמטמון: {cached_s * 1000:.2f} ms (hits={profiler.hits})")
+
+    # החלטות מילוי מהפרופיל - בלי סריקה נוספת
+    strategies = {
+        row['column']: 'interpolate' if row['longest_gap'] <= 10 else 'median'
+        for row in profile.summary.iter_rows(named=True)
+        if row['missing'] and row['dtype'].startswith('Float')
+    }
+    print(f"\n💡 אסטרטגיות מילוי לפי הפרופיל: {strategies}")
+
+
+def main():
+    """הרצת כל הדוגמאות"""
+    demo_imputer()
+    demo_segment_fill()
+    demo_missingness_profile()
+
+    print_section("✅ כל הדוגמאות הושלמו בהצלחה!")
+
+
+if __name__ == "__main__":
+    main()
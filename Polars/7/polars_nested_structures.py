@@ -16,9 +16,15 @@
 """
 
 import polars as pl
+import sys
 import warnings
+from pathlib import Path
 warnings.filterwarnings('ignore')
 
+# מטמון Parquet משותף לכל הפרקים (Polars/csv_cache.py)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from csv_cache import cached_read_csv  # noqa: E402
+
 
 def print_section(title):
     """הדפסת כותרת מדור"""
@@ -27,12 +33,13 @@ def print_section(title):
     print(f"{'='*70}\n")
 
 
-def load_data(csv_path='../data/us_videos.csv'):
+def load_data(csv_path='../data/us_videos.csv', use_cache=True):
     """
     טעינת נתוני YouTube
     
     Args:
         csv_path (str): נתיב לקובץ CSV
+        use_cache (bool): קריאה דרך מטמון ה-Parquet (csv_cache)
         
     Returns:
         pl.DataFrame: DataFrame עם הנתונים
@@ -40,7 +47,8 @@ def load_data(csv_path='../data/us_videos.csv'):
     print_section("📊 טעינת הנתונים")
     
     # טעינת הנתונים
-    df = pl.read_csv(csv_path, try_parse_dates=True)
+    read_csv = cached_read_csv if use_cache else pl.read_csv
+    df = read_csv(csv_path, try_parse_dates=True)
     
     # המרת עמודת התאריכים
     df = df.with_columns(
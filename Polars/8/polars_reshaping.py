@@ -13,6 +13,12 @@ Reshaping and Tidying Data with Polars
 
 import polars as pl
 from polars import selectors as cs
+import sys
+from pathlib import Path
+
+# מטמון Parquet משותף לכל הפרקים (Polars/csv_cache.py)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from csv_cache import cached_read_csv  # noqa: E402
 
 
 def print_section(title):
@@ -27,12 +33,13 @@ def print_section(title):
     print("=" * 80 + "\n")
 
 
-def load_and_prepare_data(file_path='../data/academic.csv'):
+def load_and_prepare_data(file_path='../data/academic.csv', use_cache=True):
     """
     טוענת ומכינה את הנתונים לעבודה.
     
     Args:
         file_path (str): נתיב לקובץ CSV
+        use_cache (bool): קריאה דרך מטמון ה-Parquet (csv_cache)
         
     Returns:
         pl.DataFrame: DataFrame מעובד ומוכן
@@ -40,7 +47,7 @@ def load_and_prepare_data(file_path='../data/academic.csv'):
     print_section("טעינה והכנת נתונים")
     
     # טעינת הנתונים
-    df = pl.read_csv(file_path)
+    df = cached_read_csv(file_path) if use_cache else pl.read_csv(file_path)
     print("✓ נתונים נטענו בהצלחה")
     print(f"  גודל: {df.shape[0]} שורות, {df.shape[1]} עמודות")
     
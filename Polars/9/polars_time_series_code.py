@@ -15,7 +15,13 @@
 
 import polars as pl
 from datetime import datetime
+from pathlib import Path
 import statistics
+import sys
+
+# מטמון Parquet משותף לכל הפרקים (Polars/csv_cache.py)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from csv_cache import cached_scan_csv  # noqa: E402
 
 
 def print_section(title):
@@ -25,7 +31,7 @@ def print_section(title):
     print("=" * 80 + "\n")
 
 
-def load_data(file_path='../data/toronto_weather.csv'):
+def load_data(file_path='../data/toronto_weather.csv', use_cache=True):
     """
     טוען את קובץ נתוני מזג האוויר
     
@@ -33,6 +39,8 @@ def load_data(file_path='../data/toronto_weather.csv'):
     -----------
     file_path : str
         נתיב לקובץ CSV
+    use_cache : bool
+        סריקה דרך מטמון ה-Parquet (csv_cache) במקום פענוח ה-CSV מחדש
         
     Returns:
     --------
@@ -42,7 +50,7 @@ def load_data(file_path='../data/toronto_weather.csv'):
     print_section("1. טעינת נתונים")
     
     print("📥 טוען נתוני מזג אוויר מטורונטו...")
-    lf = pl.scan_csv(file_path)
+    lf = cached_scan_csv(file_path) if use_cache else pl.scan_csv(file_path)
     
     print("✅ הנתונים נטענו בהצלחה!")
     print("\n🔍 5 שורות ראשונות:")
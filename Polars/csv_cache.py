@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+מטמון Parquet שקוף לקבצי CSV
+============================
+
+טעינת CSV מפענחת את הטקסט מחדש בכל הרצה. המודול הזה ממיר כל CSV
+פעם אחת לקובץ Parquet (או IPC), ובטעינות הבאות קורא את הקובץ העמודתי.
+
+מפתח המטמון נגזר מ:
+- hash של תוכן הקובץ
+- הנתיב המלא, זמן השינוי (mtime) והגודל
+- אפשרויות הקריאה (למשל try_parse_dates)
+
+כשקובץ המקור משתנה, המפתח משתנה והרשומות הישנות שלו נמחקות.
+גודל המטמון מוגבל בתקציב דיסק, והרשומות שלא נקראו הכי הרבה זמן
+נמחקות קודם (LRU). כמה תהליכים יכולים לעבוד על אותו מטמון במקביל: כל
+עדכון של האינדקס נעשה תחת נעילת קובץ, על האינדקס העדכני מהדיסק.
+
+שימוש:
+    from csv_cache import cached_read_csv, cached_scan_csv
+
+    df = cached_read_csv('../data/academic.csv')
+    lf = cached_scan_csv('../data/toronto_weather.csv')
+
+תיקיית המטמון: ~/.cache/polars_tutorials
+(אפשר לשנות עם משתנה הסביבה POLARS_CSV_CACHE_DIR)
+
+CsvCache הוא גם הבסיס של מאגר ה-IPC (dataset_store.DatasetStore): מחלקות
+יורשות מחליפות רק את קריאת המקור (_read_source) ואת פורמט הכתיבה, ומפתחות,
+כתיבה אטומית, ביטול רשומות ישנות ופינוי LRU נשארים במקום אחד.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Union
+
+import polars as pl
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+DEFAULT_CACHE_DIR = Path(
+    os.environ.get('POLARS_CSV_CACHE_DIR', Path.home() / '.cache' / 'polars_tutorials')
+)
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3  # 2GB
+INDEX_FILE = 'index.json'
+LOCK_FILE = 'index.lock'
+# רשומה שנקראה בשניות האחרונות לא נמחקת בפינוי: תהליך אחר אולי קיבל
+# את הנתיב שלה ועוד לא פתח את הקובץ
+EVICTION_GRACE_S = 60.0
+
+
+def source_stat(path: Union[str, Path]) -> Dict[str, int]:
+    """
+    mtime וגודל של מקור - לתיקייה: המקסימום/הסכום על כל הקבצים שבה
+
+    זו בדיקת השינוי הזולה של המטמון; מודולים אחרים שצריכים "גרסה" של
+    קובץ מקור משתמשים בה במקום לחשב בעצמם.
+
+    Args:
+        path: קובץ או תיקייה
+
+    Returns:
+        Dict: {'mtime_ns': ..., 'size': ...}
+    """
+    path = Path(path)
+    if not path.is_dir():
+        stat = path.stat()
+        return {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+    stats = [p.stat() for p in path.rglob('*') if p.is_file()]
+    return {
+        'mtime_ns': max((s.st_mtime_ns for s in stats), default=0),
+        'size': sum(s.st_size for s in stats),
+    }
+
+
+class CsvCache:
+    """
+    מטמון עמודתי לקבצי CSV עם פינוי LRU לפי תקציב דיסק
+
+    Args:
+        cache_dir: תיקיית המטמון
+        max_bytes: תקציב הדיסק הכולל (בבתים)
+        file_format: 'parquet' או 'ipc'
+        compression: דחיסת הקבצים במטמון (None = ברירת המחדל של הפורמט)
+    """
+
+    def __init__(self, cache_dir: Optional[Union[str, Path]] = None,
+                 max_bytes: int = DEFAULT_MAX_BYTES,
+                 file_format: str = 'parquet',
+                 compression: Optional[str] = None):
+        if file_format not in ('parquet', 'ipc'):
+            raise ValueError(f"פורמט לא נתמך: {file_format}")
+        self.cache_dir = Path(cache_dir or DEFAULT_CACHE_DIR)
+        self.max_bytes = max_bytes
+        self.file_format = file_format
+        self.compression = compression
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    # -------------------------------------------------------------------------
+    # אינדקס
+    # -------------------------------------------------------------------------
+
+    def _load_index(self) -> Dict[str, Any]:
+        """טעינת האינדקס (רשומות המטמון וה-hash של קבצי המקור)"""
+        try:
+            with open(self.cache_dir / INDEX_FILE, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {'entries': {}, 'sources': {}}
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """נעילה בלעדית של האינדקס בין תהליכים (נעילת קובץ)"""
+        with open(self.cache_dir / LOCK_FILE, 'a+b') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            else:
+                lock.seek(0)
+                msvcrt.locking(lock.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+                else:
+                    lock.seek(0)
+                    msvcrt.locking(lock.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _save_index(self, index: Dict[str, Any]) -> None:
+        """שמירה אטומית של האינדקס"""
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix='.json')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(index, f)
+        os.replace(tmp, self.cache_dir / INDEX_FILE)
+
+    # -------------------------------------------------------------------------
+    # מפתחות
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def _content_hash(path: Path) -> str:
+        """hash של תוכן הקובץ (לתיקייה: כל הקבצים ונתיביהם), בבלוקים של 1MB"""
+        digest = hashlib.blake2b(digest_size=16)
+        files = sorted(p for p in path.rglob('*') if p.is_file()) if path.is_dir() else [path]
+        for file in files:
+            if path.is_dir():
+                digest.update(file.relative_to(path).as_posix().encode('utf-8'))
+            with open(file, 'rb') as f:
+                for block in iter(lambda: f.read(1024 * 1024), b''):
+                    digest.update(block)
+        return digest.hexdigest()
+
+    def _source_hash(self, path: Path, index: Dict[str, Any]) -> str:
+        """
+        hash התוכן של קובץ המקור
+
+        אם הנתיב, ה-mtime והגודל לא השתנו מאז הפעם הקודמת,
+        משתמשים ב-hash השמור ולא קוראים את הקובץ שוב.
+        """
+        stat = source_stat(path)
+        source = index['sources'].get(str(path))
+        if source and source['mtime_ns'] == stat['mtime_ns'] and source['size'] == stat['size']:
+            return source['hash']
+
+        if source:
+            # קובץ המקור השתנה - הרשומות הישנות שלו כבר לא תקפות
+            self._drop_source(str(path), index)
+        content_hash = self._content_hash(path)
+        index['sources'][str(path)] = {**stat, 'hash': content_hash}
+        return content_hash
+
+    def _key(self, path: Path, index: Dict[str, Any], options: Dict[str, Any]) -> str:
+        """מפתח המטמון: תוכן, נתיב, mtime ואפשרויות הקריאה"""
+        payload = json.dumps({
+            'hash': self._source_hash(path, index),
+            'path': str(path),
+            'mtime_ns': source_stat(path)['mtime_ns'],
+            'options': options,
+            'format': self.file_format,
+            'compression': self.compression,
+        }, sort_keys=True, default=repr)
+        return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+    # -------------------------------------------------------------------------
+    # ניהול רשומות
+    # -------------------------------------------------------------------------
+
+    def _drop_entry(self, key: str, index: Dict[str, Any]) -> None:
+        """מחיקת רשומה מהמטמון ומהדיסק"""
+        entry = index['entries'].pop(key, None)
+        if entry:
+            (self.cache_dir / entry['file']).unlink(missing_ok=True)
+
+    def _drop_source(self, source: str, index: Dict[str, Any]) -> None:
+        """מחיקת כל הרשומות של קובץ מקור"""
+        for key in [k for k, e in index['entries'].items() if e['source'] == source]:
+            self._drop_entry(key, index)
+
+    def _evict(self, index: Dict[str, Any], keep: str) -> None:
+        """
+        פינוי הרשומות הישנות ביותר (LRU) עד שהמטמון בתוך התקציב
+
+        רשומות שנקראו ב-EVICTION_GRACE_S השניות האחרונות לא נמחקות, גם אם
+        המטמון חורג זמנית מהתקציב.
+        """
+        entries = index['entries']
+        total = sum(e['bytes'] for e in entries.values())
+        recent = time.time() - EVICTION_GRACE_S
+        for key in sorted(entries, key=lambda k: entries[k]['last_access']):
+            if total <= self.max_bytes or entries[key]['last_access'] >= recent:
+                break
+            if key == keep:
+                continue
+            total -= entries[key]['bytes']
+            self._drop_entry(key, index)
+
+    # -------------------------------------------------------------------------
+    # קריאה וכתיבה - נקודות ההרחבה של מחלקות יורשות
+    # -------------------------------------------------------------------------
+
+    def _read_source(self, path: Path, **read_options) -> Union[pl.DataFrame, pl.LazyFrame]:
+        """קריאת קובץ המקור (כאן: scan_csv)"""
+        return pl.scan_csv(path, **read_options)
+
+    def _write(self, frame: Union[pl.DataFrame, pl.LazyFrame], target: Path) -> None:
+        """
+        כתיבה אטומית של קובץ המטמון: קובץ זמני משלו לכל תהליך, ואז os.replace
+        (תהליכים שכותבים את אותה רשומה במקביל לא דורסים זה את זה)
+        """
+        tmp = target.with_name(f'{target.name}.{os.getpid()}.tmp')
+        options = {'compression': self.compression} if self.compression else {}
+        if isinstance(frame, pl.LazyFrame):
+            sink = frame.sink_parquet if self.file_format == 'parquet' else frame.sink_ipc
+        else:
+            sink = frame.write_parquet if self.file_format == 'parquet' else frame.write_ipc
+        try:
+            sink(tmp, **options)
+            os.replace(tmp, target)
+        finally:
+            tmp.unlink(missing_ok=True)
+
+    def path_for(self, source: Union[str, Path], **read_options) -> Path:
+        """
+        נתיב הקובץ העמודתי של מקור - נוצר אם אינו קיים או אינו עדכני
+
+        Args:
+            source: נתיב לקובץ המקור
+            **read_options: אפשרויות קריאה (ל-pl.scan_csv, או ל-_read_source)
+
+        Returns:
+            Path: נתיב לקובץ ה-Parquet/IPC במטמון
+        """
+        path = Path(source).resolve()
+        while True:
+            with self._locked():
+                index = self._load_index()
+                key = self._key(path, index, read_options)
+                entry = index['entries'].get(key)
+                if entry is not None and (self.cache_dir / entry['file']).exists():
+                    entry['last_access'] = time.time()
+                    self._save_index(index)
+                    return self.cache_dir / entry['file']
+                self._save_index(index)
+
+            # ההמרה עצמה - מחוץ לנעילה, כדי לא לעכב תהליכים אחרים
+            file_name = f'{key}.{self.file_format}'
+            self._write(self._read_source(path, **read_options), self.cache_dir / file_name)
+
+            # רישום על האינדקס העדכני מהדיסק (תהליכים אחרים אולי עדכנו אותו בינתיים)
+            with self._locked():
+                index = self._load_index()
+                if self._key(path, index, read_options) != key:
+                    # המקור השתנה בזמן ההמרה - הקובץ כבר לא תקף, מנסים שוב
+                    (self.cache_dir / file_name).unlink(missing_ok=True)
+                    self._save_index(index)
+                    continue
+                index['entries'][key] = {
+                    'file': file_name,
+                    'source': str(path),
+                    'bytes': (self.cache_dir / file_name).stat().st_size,
+                    'last_access': time.time(),
+                }
+                self._evict(index, keep=key)
+                self._save_index(index)
+                return self.cache_dir / file_name
+
+    def scan_csv(self, source: str, **read_options) -> pl.LazyFrame:
+        """scan_csv דרך המטמון - מחזיר LazyFrame מעל הקובץ העמודתי"""
+        cached = self.path_for(source, **read_options)
+        if self.file_format == 'parquet':
+            return pl.scan_parquet(cached)
+        return pl.scan_ipc(cached)
+
+    def read_csv(self, source: str, **read_options) -> pl.DataFrame:
+        """read_csv דרך המטמון - מחזיר DataFrame"""
+        return self.scan_csv(source, **read_options).collect()
+
+    def clear(self) -> None:
+        """מחיקת כל המטמון"""
+        with self._locked():
+            index = self._load_index()
+            for key in list(index['entries']):
+                self._drop_entry(key, index)
+            index['sources'] = {}
+            self._save_index(index)
+
+
+_default_cache: Optional[CsvCache] = None
+
+
+def _get_default_cache() -> CsvCache:
+    """המטמון המשותף של כל הפרקים (נוצר בשימוש הראשון)"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = CsvCache()
+    return _default_cache
+
+
+def cached_read_csv(source: str, **read_options) -> pl.DataFrame:
+    """
+    תחליף ל-pl.read_csv שקורא דרך המטמון
+
+    Args:
+        source: נתיב לקובץ CSV
+        **read_options: אפשרויות קריאה (כמו ב-pl.scan_csv)
+
+    Returns:
+        pl.DataFrame: הנתונים
+    """
+    return _get_default_cache().read_csv(source, **read_options)
+
+
+def cached_scan_csv(source: str, **read_options) -> pl.LazyFrame:
+    """
+    תחליף ל-pl.scan_csv שסורק את הקובץ העמודתי מהמטמון
+
+    Args:
+        source: נתיב לקובץ CSV
+        **read_options: אפשרויות קריאה (כמו ב-pl.scan_csv)
+
+    Returns:
+        pl.LazyFrame: הנתונים
+    """
+    return _get_default_cache().scan_csv(source, **read_options)
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+מאגר datasets בפורמט Arrow IPC - שיתוף זיכרון בין תהליכים
+========================================================
+
+כל סקריפט שטוען dataset (CSV, JSON, Parquet, Avro, Delta...) מפענח אותו
+מחדש לזיכרון פרטי משלו. כשכמה תהליכים עובדים על אותם נתונים, כל אחד
+מחזיק עותק מלא.
+
+המודול ממיר כל dataset פעם אחת לקובץ Arrow IPC לא דחוס, ופותח אותו
+ב-memory-map ללא העתקה (zero-copy): העמודות של ה-DataFrame מצביעות
+ישירות לדפי הקובץ. הדפים נטענים רק כשניגשים אליהם, ומערכת ההפעלה
+משתפת אותם בין כל התהליכים שפתחו את אותו קובץ.
+
+המאגר בנוי על csv_cache.CsvCache: מפתח המאגר נגזר מ-hash התוכן, הנתיב,
+זמן השינוי (mtime) ואפשרויות הקריאה, וכשהמקור משתנה נוצר קובץ חדש
+והישן נמחק - באותו קוד שמנהל את מטמון ה-CSV.
+
+שימוש:
+    from dataset_store import load_dataset, scan_dataset
+
+    df = load_dataset('../data/contoso_sales.csv', try_parse_dates=True)
+    lf = scan_dataset('../data/venture_funding_deals_delta')
+
+תיקיית המאגר: ~/.cache/polars_tutorials/ipc_store
+(אפשר לשנות עם משתנה הסביבה POLARS_DATASET_STORE_DIR)
+
+הערה: טעינה ללא העתקה דורשת pyarrow. בלעדיו הקובץ נקרא עם pl.read_ipc
+(עדיין מהיר מפענוח המקור, אבל לזיכרון פרטי).
+"""
+
+import importlib.util
+import os
+import sys
+from pathlib import Path
+from typing import Any, Optional, Union
+
+import polars as pl
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from csv_cache import DEFAULT_MAX_BYTES, CsvCache  # noqa: E402
+
+
+DEFAULT_STORE_DIR = Path(
+    os.environ.get('POLARS_DATASET_STORE_DIR',
+                   Path.home() / '.cache' / 'polars_tutorials' / 'ipc_store')
+)
+
+Frame = Union[pl.DataFrame, pl.LazyFrame]
+
+
+def read_source(path: Path, **read_options) -> Frame:
+    """
+    קריאת dataset לפי סוג הקובץ
+
+    Args:
+        path: קובץ או תיקייה (Delta / Parquet מחולק)
+        **read_options: אפשרויות לפונקציית הקריאה המתאימה
+
+    Returns:
+        pl.LazyFrame או pl.DataFrame (לפורמטים שאין להם scan)
+    """
+    if path.is_dir():
+        if (path / '_delta_log').is_dir():
+            return pl.scan_delta(str(path), **read_options)
+        return pl.scan_parquet(path / '**' / '*.parquet', hive_partitioning=True, **read_options)
+
+    suffix = path.suffix.lower()
+    if suffix == '.csv':
+        return pl.scan_csv(path, **read_options)
+    if suffix == '.parquet':
+        return pl.scan_parquet(path, **read_options)
+    if suffix in ('.jsonl', '.ndjson'):
+        return pl.scan_ndjson(path, **read_options)
+    if suffix == '.json':
+        return pl.read_json(path, **read_options)
+    if suffix == '.avro':
+        return pl.read_avro(path, **read_options)
+    if suffix in ('.arrow', '.ipc', '.feather'):
+        return pl.scan_ipc(path, **read_options)
+    raise ValueError(f"סוג קובץ לא נתמך: {path}")
+
+
+class DatasetStore(CsvCache):
+    """
+    מאגר קבצי Arrow IPC לא דחוסים, לטעינה ב-memory-map
+
+    מבוסס על CsvCache: המפתחות, הכתיבה האטומית, ביטול גרסאות ישנות של מקור
+    ופינוי LRU הם של המטמון; כאן מוחלפים רק קריאת המקור (read_source) והפורמט.
+
+    Args:
+        store_dir: תיקיית המאגר
+        max_bytes: תקציב הדיסק הכולל (בבתים)
+    """
+
+    def __init__(self, store_dir: Optional[Union[str, Path]] = None,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        super().__init__(store_dir or DEFAULT_STORE_DIR, max_bytes,
+                         file_format='ipc', compression='uncompressed')
+
+    @property
+    def store_dir(self) -> Path:
+        """תיקיית המאגר (שם נוסף ל-cache_dir)"""
+        return self.cache_dir
+
+    def _read_source(self, path: Path, **read_options) -> Frame:
+        """קריאת המקור לפי סוג הקובץ (ראו read_source)"""
+        return read_source(path, **read_options)
+
+    def load(self, source: Union[str, Path], **read_options) -> pl.DataFrame:
+        """
+        טעינת dataset ב-memory-map, ללא העתקה
+
+        ה-DataFrame מצביע לדפי הקובץ: הטעינה כמעט מיידית, דפים נקראים רק
+        בגישה, וכל התהליכים שטוענים את אותו dataset חולקים אותם.
+
+        Args:
+            source: נתיב לקובץ או לתיקייה
+            **read_options: אפשרויות קריאה (ראו read_source)
+
+        Returns:
+            pl.DataFrame: הנתונים
+        """
+        ipc_path = self.path_for(source, **read_options)
+        if importlib.util.find_spec('pyarrow') is None:
+            return pl.read_ipc(ipc_path)
+
+        import pyarrow as pa
+
+        with pa.memory_map(str(ipc_path)) as mapped:
+            table = pa.ipc.open_file(mapped).read_all()
+        return pl.from_arrow(table, rechunk=False)
+
+    def scan(self, source: Union[str, Path], **read_options) -> pl.LazyFrame:
+        """scan_ipc על קובץ המאגר - לשאילתות lazy"""
+        return pl.scan_ipc(self.path_for(source, **read_options))
+
+
+_default_store: Optional[DatasetStore] = None
+
+
+def _get_default_store() -> DatasetStore:
+    """המאגר המשותף של כל הפרקים (נוצר בשימוש הראשון)"""
+    global _default_store
+    if _default_store is None:
+        _default_store = DatasetStore()
+    return _default_store
+
+
+def load_dataset(source: Union[str, Path], **read_options: Any) -> pl.DataFrame:
+    """
+    טעינת dataset מהמאגר המשותף (memory-map, ללא העתקה)
+
+    Args:
+        source: נתיב לקובץ או לתיקייה
+        **read_options: אפשרויות קריאה
+
+    Returns:
+        pl.DataFrame: הנתונים
+    """
+    return _get_default_store().load(source, **read_options)
+
+
+def scan_dataset(source: Union[str, Path], **read_options: Any) -> pl.LazyFrame:
+    """
+    סריקה lazy של dataset מהמאגר המשותף
+
+    Args:
+        source: נתיב לקובץ או לתיקייה
+        **read_options: אפשרויות קריאה
+
+    Returns:
+        pl.LazyFrame: הנתונים
+    """
+    return _get_default_store().scan(source, **read_options)
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+סטטיסטיקה תיאורית במעבר אחד - מצבים שאפשר למזג
+==============================================
+
+במקום לחשב כל סטטיסטיקה (ממוצע, חציון, סטיית תקן, מינימום...) במעבר
+נפרד על הנתונים, המודול מחשב את כולן יחד, מנה אחר מנה:
+
+- Moments: ספירה, ממוצע ו-M2 בשיטת Welford. שני מצבים מתמזגים בנוסחה
+  של Chan, כך שאפשר לחשב כל מנה (או כל קובץ/מחיצה) בנפרד ולמזג בסוף.
+- QuantileSketch: סקיצה לאחוזונים בזיכרון חסום (בסגנון KLL). כל עוד
+  הנתונים נכנסים בקיבולת הסקיצה התוצאה מדויקת; מעבר לכך השגיאה קטנה
+  ויורדת ככל שהקיבולת גדלה.
+- ColumnStats: שניהם יחד + ספירת null, מינימום ומקסימום לעמודה אחת.
+
+את מצב הסקיצה אפשר לשמור כבתים (to_bytes / from_bytes) - למשל בעמודת
+Binary - ולמזג מאוחר יותר בלי לקרוא שוב את הנתונים.
+
+שימוש:
+    from streaming_stats import fused_stats
+
+    fused_stats(df['Age'])                          # Series
+    fused_stats(df)                                 # כל העמודות המספריות
+    fused_stats(pl.scan_csv('big.csv'), ['Age'])    # LazyFrame ב-streaming
+"""
+
+import json
+import struct
+import zlib
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import polars as pl
+
+
+DEFAULT_QUANTILES = (0.25, 0.5, 0.75)
+
+
+def pack_state(meta: Dict[str, Any], arrays: Sequence[np.ndarray]) -> bytes:
+    """
+    סריאליזציה של מצב: מטא-דאטה (JSON) ומערכי NumPy, דחוסים ב-zlib
+
+    Args:
+        meta: ערכים פשוטים (מספרים, מחרוזות, רשימות)
+        arrays: מערכי NumPy
+
+    Returns:
+        bytes: המצב הארוז
+    """
+    header = json.dumps({
+        'meta': meta,
+        'arrays': [[array.dtype.str, list(array.shape)] for array in arrays],
+    }).encode('utf-8')
+    body = b''.join(np.ascontiguousarray(array).tobytes() for array in arrays)
+    return zlib.compress(struct.pack('<I', len(header)) + header + body, 1)
+
+
+def unpack_state(payload: bytes) -> Tuple[Dict[str, Any], List[np.ndarray]]:
+    """הפעולה ההפוכה ל-pack_state: (meta, arrays)"""
+    raw = zlib.decompress(payload)
+    (size,) = struct.unpack_from('<I', raw)
+    header = json.loads(raw[4:4 + size])
+    offset, arrays = 4 + size, []
+    for dtype, shape in header['arrays']:
+        count = int(np.prod(shape, dtype=np.int64))
+        array = np.frombuffer(raw, dtype=dtype, count=count, offset=offset).reshape(shape)
+        arrays.append(array.copy())
+        offset += array.nbytes
+    return header['meta'], arrays
+
+
+class Moments:
+    """
+    ספירה, ממוצע וסכום ריבועי הסטיות (M2) - מצב Welford שאפשר למזג
+    """
+
+    def __init__(self, count: int = 0, mean: float = 0.0, m2: float = 0.0):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+
+    def merge(self, other: 'Moments') -> 'Moments':
+        """מיזוג שני מצבים (Chan et al.) - מחזיר את self"""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        return self
+
+    @property
+    def variance(self) -> Optional[float]:
+        """שונות מדגמית (ddof=1), כמו ב-Polars"""
+        return self.m2 / (self.count - 1) if self.count > 1 else None
+
+    @property
+    def std(self) -> Optional[float]:
+        """סטיית תקן מדגמית (ddof=1)"""
+        variance = self.variance
+        return variance ** 0.5 if variance is not None else None
+
+
+class QuantileSketch:
+    """
+    סקיצת אחוזונים בזיכרון חסום שאפשר למזג
+
+    הערכים נשמרים ב"רמות": ברמה h כל ערך מייצג 2^h ערכים מקוריים.
+    כשרמה מתמלאת מעבר ל-capacity היא ממוינת, ורק כל ערך שני עולה לרמה
+    הבאה (עם משקל כפול). הזיכרון הוא O(capacity * log(n / capacity)).
+
+    Args:
+        capacity: מספר ערכים מקסימלי בכל רמה
+    """
+
+    def __init__(self, capacity: int = 4096):
+        self.capacity = capacity
+        self.levels: List[np.ndarray] = [np.empty(0)]
+        self._offset = 0
+
+    def update(self, values: np.ndarray) -> 'QuantileSketch':
+        """הוספת ערכים (ללא null) לסקיצה"""
+        self.levels[0] = np.concatenate([self.levels[0], np.asarray(values, dtype=float)])
+        self._compact()
+        return self
+
+    def merge(self, other: 'QuantileSketch') -> 'QuantileSketch':
+        """מיזוג סקיצה אחרת לתוך זו - מחזיר את self"""
+        for level, values in enumerate(other.levels):
+            if level == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[level] = np.concatenate([self.levels[level], values])
+        self._compact()
+        return self
+
+    def _compact(self) -> None:
+        """דחיסת רמות שעברו את הקיבולת"""
+        level = 0
+        while level < len(self.levels):
+            values = self.levels[level]
+            if len(values) > self.capacity:
+                values = np.sort(values)
+                # היסט מתחלף כדי שהדחיסות לא יטו תמיד לאותו כיוון
+                self._offset ^= 1
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                keep = len(values) - len(values) % 2
+                self.levels[level + 1] = np.concatenate(
+                    [self.levels[level + 1], values[self._offset:keep:2]]
+                )
+                self.levels[level] = values[keep:]
+            level += 1
+
+    def to_bytes(self) -> bytes:
+        """סריאליזציה של הסקיצה (ראו pack_state)"""
+        return pack_state({'capacity': self.capacity, 'offset': self._offset}, self.levels)
+
+    @classmethod
+    def from_bytes(cls, payload: bytes) -> 'QuantileSketch':
+        """שחזור סקיצה מ-to_bytes"""
+        meta, levels = unpack_state(payload)
+        sketch = cls(meta['capacity'])
+        sketch.levels = levels or [np.empty(0)]
+        sketch._offset = meta['offset']
+        return sketch
+
+    @property
+    def is_exact(self) -> bool:
+        """האם לא בוצעה דחיסה (כלומר האחוזונים מדויקים)"""
+        return all(len(values) == 0 for values in self.levels[1:])
+
+    def quantile(self, q: float, method: str = 'linear') -> Optional[float]:
+        """
+        אחוזון q (בין 0 ל-1)
+
+        כשהסקיצה מדויקת - כמו Series.quantile(q, method), עבור 'linear'
+        (אינטרפולציה לינארית) או 'nearest' (ברירת המחדל של describe).
+        """
+        if self.is_exact:
+            values = self.levels[0]
+            if not len(values):
+                return None
+            if method == 'nearest':
+                # כמו Polars: עיגול חצי כלפי מעלה (numpy מעגל לזוגי)
+                index = int(np.floor(q * (len(values) - 1) + 0.5))
+                return float(np.partition(values, index)[index])
+            return float(np.quantile(values, q, method=method))
+
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([
+            np.full(len(level_values), 2 ** level, dtype=float)
+            for level, level_values in enumerate(self.levels)
+        ])
+        order = np.argsort(values, kind='stable')
+        cumulative = np.cumsum(weights[order])
+        rank = q * (cumulative[-1] - 1)
+        return float(values[order][np.searchsorted(cumulative, rank, side='right')])
+
+
+class ColumnStats:
+    """
+    כל הסטטיסטיקות של עמודה מספרית אחת, במצב שאפשר לעדכן ולמזג
+
+    Args:
+        capacity: קיבולת סקיצת האחוזונים
+    """
+
+    def __init__(self, capacity: int = 4096):
+        self.moments = Moments()
+        self.sketch = QuantileSketch(capacity)
+        self.null_count = 0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    @staticmethod
+    def batch_exprs(column: str) -> List[pl.Expr]:
+        """ביטויי הצבירה של מנה אחת - כולם מחושבים ב-select יחיד"""
+        col = pl.col(column)
+        return [
+            col.count().alias(f'{column}__count'),
+            col.null_count().alias(f'{column}__null_count'),
+            col.mean().alias(f'{column}__mean'),
+            (col.var(ddof=0) * col.count()).alias(f'{column}__m2'),
+            col.min().alias(f'{column}__min'),
+            col.max().alias(f'{column}__max'),
+        ]
+
+    def update(self, column: str, aggregates: Dict[str, float], values: pl.Series) -> 'ColumnStats':
+        """עדכון מתוצאת batch_exprs ומערכי המנה"""
+        count = aggregates[f'{column}__count']
+        self.null_count += aggregates[f'{column}__null_count']
+        if count:
+            self.moments.merge(Moments(count, aggregates[f'{column}__mean'],
+                                       aggregates[f'{column}__m2']))
+            low, high = aggregates[f'{column}__min'], aggregates[f'{column}__max']
+            self.min = low if self.min is None else min(self.min, low)
+            self.max = high if self.max is None else max(self.max, high)
+            self.sketch.update(values.drop_nulls().cast(pl.Float64).to_numpy())
+        return self
+
+    def merge(self, other: 'ColumnStats') -> 'ColumnStats':
+        """מיזוג מצב של עמודה זהה ממנה/מחיצה אחרת"""
+        self.moments.merge(other.moments)
+        self.sketch.merge(other.sketch)
+        self.null_count += other.null_count
+        for attr, pick in (('min', min), ('max', max)):
+            mine, theirs = getattr(self, attr), getattr(other, attr)
+            setattr(self, attr, theirs if mine is None else mine if theirs is None
+                    else pick(mine, theirs))
+        return self
+
+    def result(self, quantiles: Sequence[float] = DEFAULT_QUANTILES) -> Dict[str, Optional[float]]:
+        """התוצאה הסופית כמילון"""
+        row = {
+            'count': self.moments.count,
+            'null_count': self.null_count,
+            'mean': self.moments.mean if self.moments.count else None,
+            'std': self.moments.std,
+            'min': self.min,
+            'max': self.max,
+        }
+        for q in quantiles:
+            row[_quantile_name(q)] = self.sketch.quantile(q)
+        return row
+
+
+def _quantile_name(q: float) -> str:
+    """שם שדה לאחוזון: 0.5 -> median, 0.25 -> 25%"""
+    return 'median' if q == 0.5 else f'{q:.0%}'
+
+
+def _batches(source: Union[pl.Series, pl.DataFrame, pl.LazyFrame],
+             columns: List[str], batch_size: int) -> Iterator[pl.DataFrame]:
+    """מנות של העמודות המבוקשות מכל סוג מקור"""
+    if isinstance(source, pl.LazyFrame):
+        yield from source.select(columns).collect_batches(chunk_size=batch_size)
+    else:
+        frame = source.select(columns)
+        for offset in range(0, max(frame.height, 1), batch_size):
+            yield frame.slice(offset, batch_size)
+
+
+def accumulate_stats(source: Union[pl.Series, pl.DataFrame, pl.LazyFrame],
+                     columns: Optional[Iterable[str]] = None,
+                     batch_size: int = 100_000,
+                     capacity: int = 4096) -> Dict[str, ColumnStats]:
+    """
+    מצבי הסטטיסטיקה (לפני סיכום) של כל עמודה - למיזוג עם מצבים ממקורות אחרים
+
+    Args:
+        source: Series, DataFrame או LazyFrame
+        columns: עמודות לחישוב (ברירת מחדל: כל העמודות המספריות)
+        batch_size: מספר שורות בכל מנה
+        capacity: קיבולת סקיצת האחוזונים
+
+    Returns:
+        Dict[str, ColumnStats]: עמודה -> מצב
+    """
+    if isinstance(source, pl.Series):
+        source = source.to_frame()
+    schema = source.collect_schema()
+    if columns is None:
+        columns = [name for name, dtype in schema.items() if dtype.is_numeric()]
+    columns = list(columns)
+
+    states = {c: ColumnStats(capacity) for c in columns}
+    exprs = [expr for c in columns for expr in ColumnStats.batch_exprs(c)]
+    for batch in _batches(source, columns, batch_size):
+        aggregates = batch.select(exprs).row(0, named=True)
+        for c in columns:
+            states[c].update(c, aggregates, batch[c])
+    return states
+
+
+def summarize(states: Dict[str, ColumnStats],
+              quantiles: Sequence[float] = DEFAULT_QUANTILES) -> pl.DataFrame:
+    """
+    סיכום מצבים לטבלה: שורה לכל עמודה
+
+    Args:
+        states: עמודה -> מצב (מ-accumulate_stats, אחרי מיזוגים)
+        quantiles: האחוזונים לחישוב
+
+    Returns:
+        pl.DataFrame: column, count, null_count, mean, std, min, max ואחוזונים
+    """
+    return pl.DataFrame(
+        [{'column': c, **state.result(quantiles)} for c, state in states.items()],
+        schema_overrides={'count': pl.Int64, 'null_count': pl.Int64},
+    )
+
+
+def fused_stats(source: Union[pl.Series, pl.DataFrame, pl.LazyFrame],
+                columns: Optional[Iterable[str]] = None,
+                quantiles: Sequence[float] = DEFAULT_QUANTILES,
+                batch_size: int = 100_000,
+                capacity: int = 4096) -> pl.DataFrame:
+    """
+    כל הסטטיסטיקות התיאוריות במעבר אחד על הנתונים
+
+    Args:
+        source: Series, DataFrame או LazyFrame (נקרא במנות ב-streaming)
+        columns: עמודות לחישוב (ברירת מחדל: כל העמודות המספריות)
+        quantiles: האחוזונים לחישוב
+        batch_size: מספר שורות בכל מנה
+        capacity: קיבולת סקיצת האחוזונים
+
+    Returns:
+        pl.DataFrame: שורה לכל עמודה
+    """
+    states = accumulate_stats(source, columns, batch_size, capacity)
+    return summarize(states, quantiles)